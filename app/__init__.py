@@ -1,12 +1,39 @@
 from flask import Flask, session
 from flask_sqlalchemy import SQLAlchemy
-from .config import load_config
+from .config import get_config, get_database_settings, start_config_watcher
 import os
 import secrets
 
 db = SQLAlchemy()
 
 
+def _load_or_create_secret(path: str) -> str:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            secret = f.read().strip()
+        if secret:
+            return secret
+    except FileNotFoundError:
+        pass
+    # Write to a temp file and link it into place: exactly one worker wins the race
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(secrets.token_hex(32))
+    os.chmod(tmp, 0o600)
+    try:
+        os.link(tmp, path)
+    except FileExistsError:
+        pass
+    except OSError:
+        # Filesystems without hard links: last writer wins, still a valid key
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().strip()
+
+
 def create_app(test_config: dict | None = None):
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     templates_dir = os.path.join(base_dir, 'templates')
@@ -32,144 +59,70 @@ def create_app(test_config: dict | None = None):
     db_path = os.path.join(base_dir, 'data', 'app.db')
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + db_path
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    # Generate a strong SECRET_KEY if not provided via env
+    # Generate a strong SECRET_KEY if not provided via env; persisted under data/
+    # so every gunicorn worker (and restarts) sign sessions with the same key
     secret = os.environ.get('SECRET_KEY')
     if not secret:
-        import secrets as _secrets
-        secret = _secrets.token_hex(32)
+        secret = _load_or_create_secret(os.path.join(data_dir, 'secret_key'))
     app.config['SECRET_KEY'] = secret
     # Explicitly disable CSRF (forms are simple and app runs on home network)
     app.config['WTF_CSRF_ENABLED'] = False
 
-    # Load config.yml
-    app.config['HOMEHUB_CONFIG'] = load_config()
+    # Load config.yml (cached per file version; see app.config.get_config)
+    app.config['HOMEHUB_CONFIG'] = get_config()
 
     # Allow tests to override configuration (database, testing flag, etc.)
     if test_config:
         app.config.update(test_config)
 
+    # Connection pool sizing from config.yml `database:` (file-backed SQLite only)
+    from .database import engine_options, init_database
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+            get_database_settings(app.config['HOMEHUB_CONFIG']),
+            app.config['SQLALCHEMY_DATABASE_URI'],
+        )
+
     db.init_app(app)
+    # WAL, busy_timeout, cache/mmap pragmas on every pooled connection
+    init_database(app, db)
+
+    # Per-endpoint latency/SQL/render histograms, /api/_metrics and Server-Timing
+    if os.environ.get('HOMEHUB_METRICS', '1').lower() not in ('0', 'false', 'no', 'off'):
+        from .metrics import init_metrics
+        init_metrics(app, db)
+
+    # Optional watcher thread refreshes the config cache on change so requests skip the stat() call
+    if not app.config.get('TESTING') and os.environ.get('HOMEHUB_CONFIG_WATCH', '').lower() in ('1', 'true', 'yes', 'on'):
+        start_config_watcher()
 
     # Ensure models are imported before creating tables
     with app.app_context():
         from . import models  # noqa: F401 ensures model metadata is registered
-        db.create_all()
-        # Perform tiny auto-migrations for SQLite to add missing columns if upgrading
-        # Skip this block in testing to avoid touching the real DB path
-        if not app.config.get('TESTING'):
-            try:
-                import sqlite3
-                conn = sqlite3.connect(db_path)
-                cur = conn.cursor()
-                # Import models to get actual table names
-                from .models import RecurringExpense as _RecurringExpense, QRCode as _QRCode, Reminder as _Reminder  # noqa: F401
-                # Helper to check column existence
-                def has_column(table, column):
-                    cur.execute(f"PRAGMA table_info({table})")
-                    return any(row[1] == column for row in cur.fetchall())
-                # Add 'done' to chore
-                if not has_column('chore', 'done'):
-                    cur.execute("ALTER TABLE chore ADD COLUMN done INTEGER DEFAULT 0")
-                if not has_column('chore', 'due_date'):
-                    cur.execute("ALTER TABLE chore ADD COLUMN due_date DATE")
-                if not has_column('chore', 'recurring_id'):
-                    cur.execute("ALTER TABLE chore ADD COLUMN recurring_id INTEGER")
-                # Add 'tags' to shoppingitem and chore for multi-tag feature
-                if not has_column('shopping_item', 'tags'):
-                    cur.execute("ALTER TABLE shopping_item ADD COLUMN tags TEXT DEFAULT '[]'")
-                if not has_column('chore', 'tags'):
-                    cur.execute("ALTER TABLE chore ADD COLUMN tags TEXT DEFAULT '[]'")
-                # Add 'status' to media
-                if not has_column('media', 'status'):
-                    cur.execute("ALTER TABLE media ADD COLUMN status TEXT DEFAULT 'done'")
-                # Add 'progress' to media
-                if not has_column('media', 'progress'):
-                    cur.execute("ALTER TABLE media ADD COLUMN progress TEXT")
-                # Reminder new columns (category, color, updated_at)
-                if not has_column('reminder', 'category'):
-                    cur.execute("ALTER TABLE reminder ADD COLUMN category TEXT")
-                if not has_column('reminder', 'color'):
-                    cur.execute("ALTER TABLE reminder ADD COLUMN color TEXT")
-                if not has_column('reminder', 'updated_at'):
-                    cur.execute("ALTER TABLE reminder ADD COLUMN updated_at TIMESTAMP")
-                if not has_column('reminder', 'time'):
-                    cur.execute("ALTER TABLE reminder ADD COLUMN time TEXT")
-                # Ensure memberstatus table exists
-                cur.execute("CREATE TABLE IF NOT EXISTS member_status (id INTEGER PRIMARY KEY, name TEXT, text TEXT, updated_at TIMESTAMP)")
-                # Ensure new tables for groceries and expenses exist
-                cur.execute("CREATE TABLE IF NOT EXISTS grocery_history (id INTEGER PRIMARY KEY, item TEXT, creator TEXT, timestamp TIMESTAMP)")
-                cur.execute("CREATE TABLE IF NOT EXISTS recurring_expense (id INTEGER PRIMARY KEY, title TEXT, unit_price REAL, default_quantity REAL, frequency TEXT, start_date DATE, end_date DATE, last_generated_date DATE, creator TEXT, timestamp TIMESTAMP)")
-                cur.execute("CREATE TABLE IF NOT EXISTS expense_entry (id INTEGER PRIMARY KEY, date DATE, title TEXT, category TEXT, unit_price REAL, quantity REAL, amount REAL, payer TEXT, recurring_id INTEGER, timestamp TIMESTAMP)")
-                # Add monthly_mode to recurring_expense if missing
-                def ensure_column(table, col, type_spec, default=None):
-                    cur.execute(f"PRAGMA table_info({table})")
-                    cols = [row[1] for row in cur.fetchall()]
-                    if col not in cols:
-                        cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} {type_spec}")
-                        if default is not None:
-                            cur.execute(f"UPDATE {table} SET {col}=? WHERE {col} IS NULL", (default,))
-                ensure_column(_RecurringExpense.__tablename__, 'monthly_mode', 'TEXT', 'day_of_month')
-                ensure_column(_RecurringExpense.__tablename__, 'category', 'TEXT', None)
-                ensure_column(_RecurringExpense.__tablename__, 'effective_from', 'DATE', None)
-                # Basic settings table (key/value) for currency and categories
-                cur.execute("CREATE TABLE IF NOT EXISTS app_setting (key TEXT PRIMARY KEY, value TEXT)")
-                # New columns for QRCode and Reminder
-                ensure_column(_QRCode.__tablename__, 'original_input', 'TEXT', None)
-                ensure_column(_Reminder.__tablename__, 'recurring_id', 'INTEGER', None)
-                # Add 'tags' to recipe for multi-tag feature
-                if not has_column('recipe', 'tags'):
-                    cur.execute("ALTER TABLE recipe ADD COLUMN tags TEXT DEFAULT '[]'")
-                # Ensure recurring_reminder table exists (if not created by SQLAlchemy create_all)
-                cur.execute("""
-                CREATE TABLE IF NOT EXISTS recurring_reminder (
-                    id INTEGER PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    creator TEXT,
-                    frequency TEXT,
-                    monthly_mode TEXT,
-                    interval INTEGER,
-                    unit TEXT,
-                    time TEXT,
-                    category TEXT,
-                    color TEXT,
-                    start_date DATE,
-                    end_date DATE,
-                    last_generated_date DATE,
-                    effective_from DATE,
-                    timestamp TIMESTAMP
-                )
-                """)
-                # Ensure recurring_chore table exists
-                cur.execute("""
-                CREATE TABLE IF NOT EXISTS recurring_chore (
-                    id INTEGER PRIMARY KEY,
-                    description TEXT NOT NULL,
-                    creator TEXT,
-                    tags TEXT,
-                    interval INTEGER,
-                    unit TEXT,
-                    start_date DATE,
-                    end_date DATE,
-                    last_generated_date DATE,
-                    timestamp TIMESTAMP
-                )
-                """)
-                # Add new interval/unit columns if missing and backfill defaults
-                ensure_column('recurring_reminder', 'interval', 'INTEGER', 1)
-                ensure_column('recurring_reminder', 'unit', 'TEXT', 'day')
-                # Backfill unit from legacy frequency when null
-                try:
-                    cur.execute("UPDATE recurring_reminder SET unit='day' WHERE (unit IS NULL OR unit='') AND frequency='daily'")
-                    cur.execute("UPDATE recurring_reminder SET unit='week' WHERE (unit IS NULL OR unit='') AND frequency='weekly'")
-                    cur.execute("UPDATE recurring_reminder SET unit='month' WHERE (unit IS NULL OR unit='') AND frequency='monthly'")
-                except Exception:
-                    pass
-                conn.commit()
-                conn.close()
-            except Exception:
-                # Best-effort; ignore if anything goes wrong
-                pass
+        from . import tags  # noqa: F401 registers item_tag sync listeners
+        from . import scheduler  # noqa: F401 registers watermark invalidation listeners
+        from . import presence  # noqa: F401 registers the heartbeat expiry sweep
+        from . import versions  # noqa: F401 registers data_version counters
+        from . import changes  # noqa: F401 registers deletion tombstones
+        from . import events  # noqa: F401 registers live event publishing (after versions)
+        from . import reminder_rules
+        from . import retention  # noqa: F401 registers the daily archive job
+        from . import dispatcher
+        from .migrations import run_migrations, register_cli, pending_migrations
+        # Schema changes are versioned; when current this is a single query.
+        # Set HOMEHUB_AUTO_MIGRATE=0 to only check, after running `flask migrate` ahead of deploy.
+        if os.environ.get('HOMEHUB_AUTO_MIGRATE', '1').lower() in ('0', 'false', 'no', 'off'):
+            with db.engine.connect() as conn:
+                pending = pending_migrations(conn)
+            if pending:
+                app.logger.warning('Database schema is behind by %d migration(s); run `flask migrate`.', len(pending))
+        else:
+            run_migrations()
+        # In-memory snapshots belong to this database: rebuild them on first read
+        presence.invalidate()
+        reminder_rules.invalidate()
+        dispatcher.reset()
+    register_cli(app)
 
     from .blueprints import main_bp
     # Register modular route modules to attach endpoints to main_bp
@@ -186,8 +139,20 @@ def create_app(test_config: dict | None = None):
     from .blueprints import chores  # noqa: F401
     from .blueprints import qr  # noqa: F401
     from .blueprints import weather  # noqa: F401
+    from .blueprints import tags as tags_routes  # noqa: F401
+    from .blueprints import metrics as metrics_routes  # noqa: F401
+    from .blueprints import calendar_feed  # noqa: F401
+    from .blueprints import events as events_routes  # noqa: F401
     app.register_blueprint(main_bp)
 
+    # Background jobs (media downloads, PDF compression; handlers are registered by the
+    # blueprint imports above) run in whichever process holds the job lease.
+    # HOMEHUB_JOBS=0 (or app config HOMEHUB_JOBS=False) keeps this process from running them.
+    jobs_enabled = app.config.get('HOMEHUB_JOBS', os.environ.get('HOMEHUB_JOBS', '1').lower() not in ('0', 'false', 'no', 'off'))
+    if jobs_enabled and not app.config.get('TESTING'):
+        from .jobs import start_job_runner
+        start_job_runner(app)
+
     @app.context_processor
     def inject_auth_state():
         return {
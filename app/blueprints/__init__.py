@@ -84,6 +84,9 @@ def service_worker():
           // Only handle GET
           if (req.method !== 'GET') return;
 
+          // Live event stream: leave it to the browser (a worker-proxied stream dies with the worker)
+          if (url.pathname === '/api/events') return;
+
           // Bypass caching for dynamic API endpoints to avoid stale data
           if (url.pathname.startsWith('/api/')) {
             event.respondWith(fetch(req));
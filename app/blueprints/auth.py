@@ -1,19 +1,35 @@
 from flask import current_app, request, session, redirect, url_for, render_template, flash
 from ..blueprints import main_bp
-from ..config import load_config
+from ..config import get_config
+from ..security import bearer_token, token_matches
 import hashlib
 import bleach
 
 
+def _bearer() -> str:
+    return bearer_token(request.headers.get('Authorization', ''))
+
+
 @main_bp.before_app_request
 def reload_config_and_auth():
     try:
-        current_app.config['HOMEHUB_CONFIG'] = load_config()
+        # Cached: only re-parsed when config.yml changes on disk
+        current_app.config['HOMEHUB_CONFIG'] = get_config()
     except Exception:
         pass
     cfg = current_app.config.get('HOMEHUB_CONFIG', {})
     endpoint = request.endpoint or ''
     if cfg.get('password_hash'):
+        # Metrics scrapers authenticate with a bearer token instead of a session
+        if endpoint == 'main.api_metrics' and token_matches(cfg.get('metrics_token'), _bearer()):
+            return None
+        # Phones report presence with a bearer token
+        if endpoint == 'main.api_presence_heartbeat' and token_matches(cfg.get('presence_token'), _bearer()):
+            return None
+        # Calendar apps subscribe with ?token=<calendar_feed_token>
+        feed_token = cfg.get('calendar_feed_token')
+        if endpoint == 'main.calendar_feed' and token_matches(feed_token, request.args.get('token')):
+            return None
         if not session.get('authed') and not endpoint.startswith('static') and endpoint not in ('main.login',):
             return redirect(url_for('main.login'))
     else:
@@ -0,0 +1,70 @@
+from flask import Response, current_app, request, stream_with_context
+from datetime import date, timedelta
+from ..models import Reminder, RecurringReminder
+from ..blueprints import main_bp
+from ..etag import conditional
+from ..ics import CALENDAR_FOOTER, calendar_header, rrule_for, vevent
+from ..recurrence import compile_rule
+from ..security import sanitize_text
+
+# One-off reminders (and expanded rule instances) older/newer than this are left out
+FEED_PAST_DAYS = 90
+FEED_FUTURE_DAYS = 365
+
+
+@main_bp.route('/calendar.ics')
+@conditional('reminder', 'recurring_reminder')
+def calendar_feed():
+    """Reminders as an iCalendar feed; ``?creator=`` and ``?category=`` filter it."""
+    config = current_app.config['HOMEHUB_CONFIG']
+    creator = sanitize_text(request.args.get('creator', '')) or None
+    category = sanitize_text(request.args.get('category', '')) or None
+    today = date.today()
+    window_start = today - timedelta(days=FEED_PAST_DAYS)
+    window_end = today + timedelta(days=FEED_FUTURE_DAYS)
+
+    rule_q = RecurringReminder.query.filter(
+        (RecurringReminder.end_date.is_(None)) | (RecurringReminder.end_date >= window_start),
+        (RecurringReminder.start_date.is_(None)) | (RecurringReminder.start_date <= window_end),
+    )
+    reminder_q = Reminder.query.filter(Reminder.date >= window_start, Reminder.date <= window_end)
+    if creator:
+        rule_q = rule_q.filter(RecurringReminder.creator == creator)
+        reminder_q = reminder_q.filter(Reminder.creator == creator)
+    if category:
+        rule_q = rule_q.filter(RecurringReminder.category == category)
+        reminder_q = reminder_q.filter(Reminder.category == category)
+    rules = {}
+    for rr in rule_q.all():
+        recurrence = compile_rule(rr, window_start)
+        rules[rr.id] = (rr, recurrence, rrule_for(recurrence, rr.time))
+
+    def generate():
+        yield calendar_header(config.get('instance_name') or 'HomeHub')
+        stored = set()
+        for r in reminder_q.order_by(Reminder.date.asc(), Reminder.id.asc()).yield_per(500):
+            stamp = r.updated_at or r.timestamp
+            rule = rules.get(r.recurring_id) if r.recurring_id else None
+            if rule and rule[2] and rule[1].first_on_or_after(r.date) == r.date:
+                # Stored copy of one occurrence overrides that instance of the RRULE
+                rr = rule[0]
+                yield vevent(f'rule-{rr.id}@homehub', r.date, r.time, r.title, r.description, r.category,
+                             stamp, recurrence_id=r.date, recurrence_time=rr.time)
+            else:
+                yield vevent(f'reminder-{r.id}@homehub', r.date, r.time, r.title, r.description, r.category, stamp)
+            if r.recurring_id:
+                stored.add((r.recurring_id, r.date))
+        for rr, recurrence, rrule in rules.values():
+            stamp = rr.timestamp
+            if rrule:
+                yield vevent(f'rule-{rr.id}@homehub', recurrence.start, rr.time, rr.title, rr.description,
+                             rr.category, stamp, rrule=rrule)
+                continue
+            for d in recurrence.between(window_start, window_end):
+                if (rr.id, d) not in stored:
+                    yield vevent(f'rule-{rr.id}-{d:%Y%m%d}@homehub', d, rr.time, rr.title, rr.description,
+                                 rr.category, stamp)
+        yield CALENDAR_FOOTER
+
+    return Response(stream_with_context(generate()), mimetype='text/calendar',
+                    headers={'Content-Disposition': 'inline; filename="homehub.ics"'})
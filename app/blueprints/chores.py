@@ -2,7 +2,14 @@ from flask import render_template, request, redirect, url_for, current_app, json
 from datetime import datetime, date, timedelta
 from ..models import db, Chore, RecurringChore
 from ..blueprints import main_bp
+from ..config import get_admin_aliases
+from ..etag import conditional
+from ..recurrence import compile_rule
 from ..security import sanitize_text
+from ..scheduler import ensure_current, materialize_task
+from ..settings import get_bool_setting, set_setting
+from ..tags import filter_by_tags, matches_tag_filter
+from .. import retention
 import json
 
 
@@ -15,53 +22,15 @@ def _parse_date(value):
         return None
 
 
-def _add_months(dt: date, months: int) -> date:
-    y = dt.year + (dt.month - 1 + months) // 12
-    m = (dt.month - 1 + months) % 12 + 1
-    last = (date(y + (1 if m == 12 else 0), 1 if m == 12 else m + 1, 1) - timedelta(days=1)).day
-    d = min(dt.day, last)
-    return date(y, m, d)
-
-
-def _add_years(dt: date, years: int) -> date:
-    try:
-        return date(dt.year + years, dt.month, dt.day)
-    except Exception:
-        if dt.month == 2 and dt.day == 29:
-            return date(dt.year + years, 2, 28)
-        return _add_months(dt, years * 12)
-
-
 def _next_occurrence(rule: RecurringChore, d: date) -> date:
-    interval = max(1, int(getattr(rule, 'interval', 1) or 1))
-    unit = (getattr(rule, 'unit', 'day') or 'day').lower()
-    if unit == 'day':
-        return d + timedelta(days=interval)
-    if unit == 'week':
-        return d + timedelta(weeks=interval)
-    if unit == 'month':
-        return _add_months(d, interval)
-    if unit == 'year':
-        return _add_years(d, interval)
-    return d + timedelta(days=interval)
+    return compile_rule(rule, d).next_after(d)
 
 
 def _next_due_on_or_after(rule: RecurringChore, target: date) -> date | None:
-    d = rule.start_date or target
-    if rule.end_date and d > rule.end_date:
-        return None
-    if d >= target:
-        return d
-    while d < target:
-        nd = _next_occurrence(rule, d)
-        if nd == d:
-            break
-        d = nd
-        if rule.end_date and d > rule.end_date:
-            return None
-    return d if (not rule.end_date or d <= rule.end_date) else None
+    return compile_rule(rule, target).first_on_or_after(target)
 
 
+@materialize_task('chores')
 def _ensure_current_recurring_chores(today: date | None = None):
     today = today or date.today()
     rules = RecurringChore.query.all()
@@ -119,58 +88,27 @@ def _ensure_current_recurring_chores(today: date | None = None):
         db.session.commit()
 
 
-def _admin_aliases() -> set[str]:
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    return {admin_name, 'Administrator', 'admin'}
+def _admin_aliases() -> frozenset[str]:
+    return get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
 
 
 def _request_user() -> str:
     return sanitize_text(request.form.get('user', ''))
 
 
-def _ensure_app_setting_table():
-    db.session.execute(db.text("CREATE TABLE IF NOT EXISTS app_setting (key TEXT PRIMARY KEY, value TEXT)"))
-    db.session.commit()
-
-
 def _get_show_chores_on_homepage() -> bool:
-    try:
-        _ensure_app_setting_table()
-        row = db.session.execute(db.text("SELECT value FROM app_setting WHERE key='show_chores_on_homepage'"))
-        value = row.scalar()
-        if value is None:
-            return bool((current_app.config.get('HOMEHUB_CONFIG', {}).get('feature_toggles') or {}).get('show_chores_on_homepage', False))
-        return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
-    except Exception:
-        return False
+    default = bool((current_app.config.get('HOMEHUB_CONFIG', {}).get('feature_toggles') or {}).get('show_chores_on_homepage', False))
+    return get_bool_setting('show_chores_on_homepage', default)
 
 
 def _set_show_chores_on_homepage(enabled: bool):
-    _ensure_app_setting_table()
-    db.session.execute(
-        db.text("INSERT INTO app_setting(key,value) VALUES('show_chores_on_homepage', :v) ON CONFLICT(key) DO UPDATE SET value=excluded.value"),
-        {'v': '1' if enabled else '0'}
-    )
-    db.session.commit()
+    set_setting('show_chores_on_homepage', '1' if enabled else '0')
 
 
 def _render_chores_page(**form_state):
-    _ensure_current_recurring_chores(date.today())
-    filter_tags = request.args.get('tags')
-    chores = Chore.query.order_by(Chore.done.asc(), Chore.due_date.asc(), Chore.timestamp.desc()).all()
-    if filter_tags:
-        try:
-            selected = json.loads(filter_tags)
-            if isinstance(selected, list) and selected:
-                def match(item_tags):
-                    try:
-                        arr = json.loads(item_tags or '[]')
-                    except Exception:
-                        arr = []
-                    return any(t in arr for t in selected)
-                chores = [i for i in chores if match(i.tags)]
-        except Exception:
-            pass
+    ensure_current('chores')
+    q = filter_by_tags(Chore.query, Chore, request.args.get('tags'))
+    chores = q.order_by(Chore.done.asc(), Chore.due_date.asc(), Chore.timestamp.desc()).all()
     show_chores_on_homepage = _get_show_chores_on_homepage()
     config = current_app.config['HOMEHUB_CONFIG']
     return render_template(
@@ -272,7 +210,8 @@ def chores():
                     end_date=end_date,
                 )
                 db.session.add(rule)
-                db.session.commit()
+                # Rule and its first chore commit together, so the materialize job never sees one without the other
+                db.session.flush()
                 next_due = _next_due_on_or_after(rule, date.today())
                 if next_due is not None:
                     db.session.add(Chore(
@@ -284,7 +223,7 @@ def chores():
                         done=False,
                     ))
                     rule.last_generated_date = next_due
-                    db.session.commit()
+                db.session.commit()
                 flash('Recurring chore added.', 'success')
         else:
             if recurring_rule_id:
@@ -403,8 +342,7 @@ def toggle_chore(chore_id):
 def delete_chore(chore_id):
     chore = Chore.query.get_or_404(chore_id)
     user = sanitize_text(request.form.get('user', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if getattr(chore, 'recurring_id', None):
         rule = RecurringChore.query.get(getattr(chore, 'recurring_id', None))
         rule_creator = (rule.creator if rule else chore.creator) or ''
@@ -452,28 +390,24 @@ def update_chore_tags(chore_id):
 
 
 @main_bp.route('/api/chores', methods=['GET'])
+@conditional('chore', 'recurring_chore')
 def api_get_chores():
-    _ensure_current_recurring_chores(date.today())
-    tags = request.args.get('tags')
-    items = Chore.query.order_by(Chore.done.asc(), Chore.due_date.desc(), Chore.timestamp.desc()).all()
-    if tags:
-        try:
-            sel = json.loads(tags)
-            if isinstance(sel, list) and sel:
-                def match(item_tags):
-                    try:
-                        arr = json.loads(item_tags or '[]')
-                    except Exception:
-                        arr = []
-                    return any(t in arr for t in sel)
-                items = [i for i in items if match(i.tags)]
-        except Exception:
-            pass
+    ensure_current('chores')
+    q = filter_by_tags(Chore.query, Chore, request.args.get('tags'))
+    items = q.order_by(Chore.done.asc(), Chore.due_date.desc(), Chore.timestamp.desc()).all()
+    if retention.include_archived():
+        # Archived chores are all done and older than the live ones, so they go last
+        archived = retention.archive_for(Chore).c
+        items += [
+            i for i in retention.load_archived(Chore, order_by=(archived.due_date.desc(), archived.timestamp.desc()))
+            if matches_tag_filter(i.tags, request.args.get('tags'))
+        ]
     def to_dict(i):
         try:
             tg = json.loads(i.tags or '[]')
         except Exception:
             tg = []
+        extra = {"archived": True} if getattr(i, 'archived', False) else {}
         return {
             "id": i.id,
             "description": i.description,
@@ -483,6 +417,7 @@ def api_get_chores():
             "due_date": i.due_date.strftime('%Y-%m-%d') if i.due_date else None,
             "recurring_id": i.recurring_id,
             "tags": tg,
+            **extra,
         }
     return jsonify([to_dict(i) for i in items])
 
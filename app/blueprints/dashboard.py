@@ -1,9 +1,19 @@
 from flask import render_template, request, redirect, url_for, flash, jsonify, current_app
 from datetime import datetime, date, timedelta
-from ..models import db, HomeStatus, MemberStatus, Notice, Reminder, RecurringReminder, Chore
+from ..models import db, DeletedRecord, Notice, Reminder, RecurringReminder, Chore
 from ..blueprints import main_bp
+from ..cache import cache_get_latest, cache_get_many, cache_set_many
+from .. import dispatcher, presence, reminder_rules, retention
+from ..changes import (
+    MAX_PAGE_SIZE, PAGE_SIZE, new_cursor, page_cursor, parse_position, record_deletions, tombstone_horizon,
+)
+from ..config import get_admin_aliases, get_family_set, get_reminder_categories
+from ..etag import conditional
+from ..recurrence import compile_rule
 from ..security import sanitize_html, sanitize_text
-import json
+from ..settings import get_bool_setting
+from ..versions import get_versions
+from .weather import weather_cache_prefix
 
 
 def _parse_date_param(value, default=None):
@@ -16,23 +26,33 @@ def _parse_date_param(value, default=None):
 
 
 def _show_chores_on_homepage() -> bool:
-    try:
-        row = db.session.execute(db.text("SELECT value FROM app_setting WHERE key='show_chores_on_homepage'"))
-        val = row.scalar()
-        if val is None:
-            cfg = current_app.config.get('HOMEHUB_CONFIG', {})
-            return bool((cfg.get('feature_toggles') or {}).get('show_chores_on_homepage', False))
-        return str(val).strip().lower() in ('1', 'true', 'yes', 'on')
-    except Exception:
-        return False
+    cfg = current_app.config.get('HOMEHUB_CONFIG', {})
+    return get_bool_setting('show_chores_on_homepage', bool((cfg.get('feature_toggles') or {}).get('show_chores_on_homepage', False)))
+
+
+def _embedded_months(today: date, neighbors: int = 0) -> tuple[date, date]:
+    """First and last day of the month of ``today`` widened by ``neighbors`` months each side."""
+    index = today.year * 12 + today.month - 1
+    first, last = index - neighbors, index + neighbors + 1
+    start = date(first // 12, first % 12 + 1, 1)
+    end = date(last // 12, last % 12 + 1, 1) - timedelta(days=1)
+    return start, end
 
 
 @main_bp.route('/')
 def index():
     config = current_app.config['HOMEHUB_CONFIG']
+    # Taken before any reminder query, so the page's data is at least this fresh
+    changes_cursor = new_cursor()
     notice = Notice.query.order_by(Notice.updated_at.desc()).first()
     show_chores_on_homepage = _show_chores_on_homepage()
-    # Calendar: gather reminders grouped by date
+    # Calendar: embed only the visible month (and optional neighbours) grouped by
+    # date; the page fetches other months from /api/reminders?scope=month
+    try:
+        neighbors = max(0, int((config.get('reminders') or {}).get('embed_neighbor_months') or 0))
+    except (TypeError, ValueError):
+        neighbors = 0
+    window_start, window_end = _embedded_months(date.today(), neighbors)
     try:
         rows = Reminder.query.with_entities(
             Reminder.id,
@@ -42,7 +62,7 @@ def index():
             Reminder.date,
             Reminder.time,
             Reminder.category,
-        ).all()
+        ).filter(Reminder.date >= window_start, Reminder.date <= window_end).all()
     except Exception:
         rows = []
     by_date = {}
@@ -60,32 +80,10 @@ def index():
             'category': rcat or None,
         })
     # Who is Home summary
-    family = list(dict.fromkeys(config.get('family_members', [])))
-    who_statuses = {s.name: s.status for s in HomeStatus.query.all() if s.name in family}
-    member_statuses = {ms.name: ms.text for ms in MemberStatus.query.all() if ms.name in family and (ms.text or '').strip()}
+    family = get_family_set(config)
+    who_statuses, member_statuses = presence.statuses(family)
     # Extract reminder categories
-    reminder_categories = []
-    try:
-        rcfg = (config.get('reminders') or {}).get('categories') or []
-        if isinstance(rcfg, list):
-            for entry in rcfg:
-                if not isinstance(entry, dict):
-                    continue
-                key = entry.get('key')
-                if not key:
-                    continue
-                reminder_categories.append({
-                    'key': key,
-                    'label': entry.get('label') or key,
-                    'color': entry.get('color') or None,
-                })
-    except Exception:
-        reminder_categories = []
-    # Backward compatibility: provide both Python object and pre-serialized JSON
-    try:
-        reminders_json = json.dumps(by_date)
-    except Exception:
-        reminders_json = '{}'
+    reminder_categories = get_reminder_categories(config)
     home_chores = []
     if show_chores_on_homepage and config.get('feature_toggles', {}).get('chores', True):
         try:
@@ -104,7 +102,7 @@ def index():
         config=config,
         notice=notice,
         reminders_data=by_date,
-        reminders_json=reminders_json,
+        changes_cursor=changes_cursor,
         who_statuses=who_statuses,
         member_statuses=member_statuses,
         reminder_categories=reminder_categories,
@@ -151,9 +149,15 @@ def _serialize_recurring_rule(rr: RecurringReminder):
 
 
 @main_bp.route('/api/reminders')
+@conditional('reminder', 'recurring_reminder')
 def api_reminders_list():
     scope = (request.args.get('scope', 'day') or 'day').lower()
     base_date = _parse_date_param(request.args.get('date'), date.today())
+    return jsonify({'ok': True, **_reminders_payload(scope, base_date, retention.include_archived())})
+
+
+def _reminders_payload(scope: str, base_date: date, include_archived: bool = False) -> dict:
+    """Stored and recurring reminders for the day/week/month around ``base_date``."""
     q = Reminder.query
     if scope == 'month':
         start = base_date.replace(day=1)
@@ -180,12 +184,6 @@ def api_reminders_list():
     except Exception:
         rows = q.order_by(Reminder.date.asc(), Reminder.id.asc()).all()
     # Generate from recurring rules within scope window (without altering past)
-    try:
-        rules = RecurringReminder.query.all()
-    except Exception:
-        rules = []
-    gen_rows = []
-    rule_dates = {}  # rr.id -> list of dates within window
     if scope == 'month':
         window_start = start
         window_end = end
@@ -195,123 +193,285 @@ def api_reminders_list():
     else:
         window_start = base_date
         window_end = base_date
-    def add_months(dt: date, months: int) -> date:
-        y = dt.year + (dt.month - 1 + months) // 12
-        m = (dt.month - 1 + months) % 12 + 1
-        # clamp to last day of target month
-        last = (date(y + (1 if m == 12 else 0), 1 if m == 12 else m + 1, 1) - timedelta(days=1)).day
-        d = min(dt.day, last)
-        return date(y, m, d)
-    def add_years(dt: date, years: int) -> date:
-        try:
-            return date(dt.year + years, dt.month, dt.day)
-        except ValueError:
-            # Feb 29 -> Feb 28 fallback
-            if dt.month == 2 and dt.day == 29:
-                return date(dt.year + years, 2, 28)
-            # else clamp to last valid day of month
-            return add_months(dt, years * 12)
-    def next_date_rule(rr, d):
-        # Prefer new interval/unit if present
-        interval = getattr(rr, 'interval', None) or 1
-        unit = (getattr(rr, 'unit', None) or '').lower() or None
-        if not unit:
-            # legacy mapping
-            if rr.frequency == 'daily':
-                unit = 'day'; interval = 1
-            elif rr.frequency == 'weekly':
-                unit = 'week'; interval = 1
-            else:
-                unit = 'month'; interval = 1
-        if unit == 'day':
-            return d + timedelta(days=interval)
-        if unit == 'week':
-            return d + timedelta(weeks=interval)
-        if unit == 'month':
-            return add_months(d, interval)
-        if unit == 'year':
-            return add_years(d, interval)
-        # default safety
-        return d + timedelta(days=interval)
-    for rr in rules:
-        rs = rr.start_date or window_start
-        d = rs
-        # advance d to window_start if needed
-        while d < window_start:
-            nd = next_date_rule(rr, d)
-            if nd == d:
-                break
-            d = nd
-        while d <= window_end and (not rr.end_date or d <= rr.end_date):
-            # ensure not already present in DB rows for that date/title
-            if not any((r.date == d and r.title == rr.title and r.recurring_id == rr.id) for r in rows):
-                temp = Reminder(date=d, title=rr.title, description=rr.description or '', creator=rr.creator or '', time=rr.time, category=rr.category, color=rr.color)
+    if include_archived:
+        archived = retention.archive_for(Reminder).c
+        rows += retention.load_archived(Reminder, archived.date >= window_start, archived.date <= window_end)
+    try:
+        rules = reminder_rules.rules_in_window(window_start, window_end)
+    except Exception:
+        rules = []
+    gen_rows = []
+    # Occurrences already stored for a rule (materialized or edited) replace the virtual one
+    stored = {(r.recurring_id, r.date) for r in rows if r.recurring_id is not None}
+    for rr, dates in rules:
+        for d in dates:
+            if (rr.id, d) not in stored:
+                temp = Reminder(date=d, title=rr.title, description=rr.description, creator=rr.creator, time=rr.time, category=rr.category, color=rr.color)
                 temp.id = -(1000000 + rr.id)  # ephemeral negative ID
                 temp.recurring_id = rr.id
                 gen_rows.append(temp)
-            rule_dates.setdefault(rr.id, []).append(d)
-            d = next_date_rule(rr, d)
     combined = rows + gen_rows
     # Sort combined
     try:
         combined.sort(key=lambda r: (r.date, (r.time is None or r.time == ''), r.time or '', r.id))
     except Exception:
         pass
-    data = [_serialize_reminder(r) for r in combined]
+    data = []
     counts = {}
     categories_counts = {}
-    if scope == 'month':
-        # Include stored and synthesized rows in counts for calendar dots
-        for r in (rows + gen_rows):
+    for r in combined:
+        data.append(_serialize_reminder(r))
+        if getattr(r, 'archived', False):
+            data[-1]['archived'] = True
+        if scope == 'month':
+            # Include stored and synthesized rows in counts for calendar dots
             k = r.date.strftime('%Y-%m-%d')
             counts[k] = counts.get(k, 0) + 1
             cat = getattr(r, 'category', None) or '_uncategorized'
-            if k not in categories_counts:
-                categories_counts[k] = {}
-            categories_counts[k][cat] = categories_counts[k].get(cat, 0) + 1
-
-    # Build recurring rules summary for UI compression
-    recurring_rules = []
-    for rr in rules:
-        # Determine interval/unit from new fields or legacy frequency
-        interval = getattr(rr, 'interval', None) or 1
-        unit = (getattr(rr, 'unit', None) or '').lower()
-        if not unit:
-            if rr.frequency == 'daily': unit = 'day'
-            elif rr.frequency == 'weekly': unit = 'week'
-            else: unit = 'month'
-        recurring_rules.append({
-            'id': rr.id,
-            'title': rr.title,
-            'description': rr.description or '',
-            'creator': rr.creator or '',
-            'interval': int(interval),
-            'unit': unit,
-            'time': rr.time,
-            'category': rr.category,
-            'color': rr.color,
-            'end_date': rr.end_date.strftime('%Y-%m-%d') if rr.end_date else None,
-            'dates': [d.strftime('%Y-%m-%d') for d in rule_dates.get(rr.id, [])],
-        })
-    return jsonify({
-        'ok': True,
+            day_cats = categories_counts.setdefault(k, {})
+            day_cats[cat] = day_cats.get(cat, 0) + 1
+
+    # Summary of the rules occurring in this window, for UI compression
+    recurring_rules = [
+        {**rr.summary, 'dates': [d.strftime('%Y-%m-%d') for d in dates]}
+        for rr, dates in rules
+    ]
+    return {
         'scope': scope,
         'date': base_date.strftime('%Y-%m-%d'),
         'reminders': data,
         'counts': counts,
         'categories_counts': categories_counts,
         'recurring_rules': recurring_rules,
+    }
+
+
+BOOTSTRAP_CACHE_TTL = 86400
+
+# Section -> tables whose data versions key its cache entry
+BOOTSTRAP_SECTIONS = {
+    'notice': ('notice',),
+    'chores': ('chore', 'app_setting'),
+    'reminders': ('reminder', 'recurring_reminder'),
+}
+
+
+def _bootstrap_section(name: str, config: dict, month: date):
+    if name == 'notice':
+        notice = Notice.query.order_by(Notice.updated_at.desc()).first()
+        if not notice or not notice.content:
+            return None
+        return {
+            'content': notice.content,
+            'updated_by': notice.updated_by,
+            'updated_at': notice.updated_at.isoformat() if notice.updated_at else None,
+        }
+    if name == 'chores':
+        if not (_show_chores_on_homepage() and config.get('feature_toggles', {}).get('chores', True)):
+            return []
+        rows = (
+            Chore.query
+            .filter(Chore.done == False)  # noqa: E712
+            .order_by(Chore.due_date.asc(), Chore.timestamp.desc())
+            .limit(8)
+        )
+        return [{
+            'id': c.id,
+            'description': c.description,
+            'creator': c.creator,
+            'due_date': c.due_date.strftime('%Y-%m-%d') if c.due_date else None,
+            'recurring_id': c.recurring_id,
+        } for c in rows]
+    return _reminders_payload('month', month)
+
+
+@main_bp.route('/api/dashboard/bootstrap')
+def api_dashboard_bootstrap():
+    """Everything the home page shows, in one round trip.
+
+    Each section is cached in the shared cache under a key that embeds the
+    data versions of the tables it reads, so a write rebuilds only the
+    sections it touched; a warm call is a handful of indexed lookups. Weather comes
+    from the weather proxy's cache only and is null when nothing is cached.
+    """
+    config = current_app.config['HOMEHUB_CONFIG']
+    month = _parse_date_param(request.args.get('date'), date.today()).replace(day=1)
+    toggles = config.get('feature_toggles') or {}
+    # Inputs other than table data that change a section
+    params = {
+        'chores': f"{toggles.get('chores', True)}|{toggles.get('show_chores_on_homepage', False)}",
+        'reminders': month.isoformat(),
+    }
+    versions = get_versions({t for tables in BOOTSTRAP_SECTIONS.values() for t in tables})
+    keys = {
+        name: f"bootstrap:{name}:{params.get(name, '')}:{'.'.join(str(versions[t]) for t in tables)}"
+        for name, tables in BOOTSTRAP_SECTIONS.items()
+    }
+    cached = cache_get_many(keys.values())
+    result, fresh = {'ok': True, 'date': month.strftime('%Y-%m-%d')}, {}
+    for name, key in keys.items():
+        if key in cached:
+            result[name] = cached[key]
+        else:
+            result[name] = fresh[key] = _bootstrap_section(name, config, month)
+    cache_set_many(fresh, BOOTSTRAP_CACHE_TTL)
+    # Presence is already held in memory (app/presence.py)
+    result['who_statuses'], result['member_statuses'] = presence.statuses(get_family_set(config))
+    weather = config.get('weather') or {}
+    result['weather'] = None
+    if weather.get('enabled'):
+        try:
+            prefix = weather_cache_prefix(float(weather.get('latitude')), float(weather.get('longitude')))
+        except (TypeError, ValueError):
+            prefix = None
+        if prefix:
+            result['weather'] = cache_get_latest(prefix)
+    return jsonify(result)
+
+
+COUNTS_MAX_DAYS = 366
+
+
+@main_bp.route('/api/reminders/counts')
+def api_reminders_counts():
+    """Per-day reminder counts (total and by category) for calendar dots and heatmaps."""
+    range_start = _parse_date_param(request.args.get('from'))
+    range_end = _parse_date_param(request.args.get('to'))
+    if not range_start or not range_end or range_end < range_start:
+        return jsonify({'ok': False, 'error': 'Invalid date range'}), 400
+    if (range_end - range_start).days >= COUNTS_MAX_DAYS:
+        return jsonify({'ok': False, 'error': f'Range is limited to {COUNTS_MAX_DAYS} days'}), 400
+    counts = {}
+    categories_counts = {}
+
+    def add(day: str, cat, n: int):
+        counts[day] = counts.get(day, 0) + n
+        day_cats = categories_counts.setdefault(day, {})
+        cat = cat or '_uncategorized'
+        day_cats[cat] = day_cats.get(cat, 0) + n
+
+    in_range = (Reminder.date >= range_start, Reminder.date <= range_end)
+    grouped = (
+        db.session.query(Reminder.date, Reminder.category, db.func.count(Reminder.id))
+        .filter(*in_range)
+        .group_by(Reminder.date, Reminder.category)
+    )
+    for rdate, cat, n in grouped:
+        add(rdate.strftime('%Y-%m-%d'), cat, n)
+    # Stored occurrences of a rule replace the virtual one (same as the month view)
+    stored = set(
+        db.session.query(Reminder.recurring_id, Reminder.date)
+        .filter(Reminder.recurring_id.isnot(None), *in_range)
+    )
+    rules = (
+        db.session.query(
+            RecurringReminder.id, RecurringReminder.start_date, RecurringReminder.end_date,
+            RecurringReminder.interval, RecurringReminder.unit, RecurringReminder.frequency,
+            RecurringReminder.category,
+        )
+        .filter(db.or_(RecurringReminder.start_date.is_(None), RecurringReminder.start_date <= range_end))
+        .filter(db.or_(RecurringReminder.end_date.is_(None), RecurringReminder.end_date >= range_start))
+    )
+    for rr in rules:
+        for d in compile_rule(rr, range_start).between(range_start, range_end):
+            if (rr.id, d) not in stored:
+                add(d.strftime('%Y-%m-%d'), rr.category, 1)
+    return jsonify({
+        'ok': True,
+        'from': range_start.strftime('%Y-%m-%d'),
+        'to': range_end.strftime('%Y-%m-%d'),
+        'counts': counts,
+        'categories_counts': categories_counts,
     })
 
 
+@main_bp.route('/api/reminders/due')
+def api_reminders_due():
+    """Reminder notifications delivered in the last hour (``events`` sink), oldest first."""
+    return jsonify({'ok': True, 'due': dispatcher.recent_due()})
+
+
+@main_bp.route('/api/reminders/changes')
+def api_reminders_changes():
+    """Reminders and recurring rules created, updated or deleted since ``since``.
+
+    Clients apply ``deleted`` first, then upsert ``reminders`` and
+    ``recurring_rules``, and pass back ``cursor`` next time. ``reset`` means
+    the cursor is missing or too old to diff from: refetch everything. At
+    most ``limit`` rows come back; ``has_more`` means call again with the
+    returned ``cursor`` straight away.
+    """
+    cursor = new_cursor()
+    since_raw = request.args.get('since')
+    position = parse_position(since_raw)
+    if since_raw and position is None:
+        return jsonify({'ok': False, 'error': 'Invalid cursor'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit') or PAGE_SIZE), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({'ok': False, 'error': 'Invalid limit'}), 400
+    result = {
+        'ok': True,
+        'cursor': cursor,
+        'reset': position is None or position[0] < tombstone_horizon(),
+        'has_more': False,
+        'reminders': [],
+        'recurring_rules': [],
+        'deleted': {'reminders': [], 'recurring_rules': []},
+    }
+    if result['reset']:
+        return jsonify(result)
+    at, after_stream, after_id = position
+
+    def after(stream, stamp, row_id):
+        # Rows strictly later than the position in (timestamp, stream, id) order
+        if stream > after_stream:
+            return stamp >= at
+        if stream == after_stream:
+            return db.or_(stamp > at, db.and_(stamp == at, row_id > after_id))
+        return stamp > at
+
+    # limit + 1 per stream is enough to fill the page from the merged order
+    rows = []
+    reminders = (Reminder.query.filter(after(0, Reminder.updated_at, Reminder.id))
+                 .order_by(Reminder.updated_at, Reminder.id).limit(limit + 1))
+    rows += [(r.updated_at, 0, r.id, r) for r in reminders]
+    rules = (RecurringReminder.query.filter(after(1, RecurringReminder.updated_at, RecurringReminder.id))
+             .order_by(RecurringReminder.updated_at, RecurringReminder.id).limit(limit + 1))
+    rows += [(rr.updated_at, 1, rr.id, rr) for rr in rules]
+    tombstones = (
+        db.session.query(DeletedRecord.deleted_at, DeletedRecord.id, DeletedRecord.table_name,
+                         DeletedRecord.row_id, DeletedRecord.day)
+        .filter(after(2, DeletedRecord.deleted_at, DeletedRecord.id))
+        .order_by(DeletedRecord.deleted_at, DeletedRecord.id)
+        .limit(limit + 1)
+    )
+    rows += [(t.deleted_at, 2, t.id, t) for t in tombstones]
+    rows.sort(key=lambda row: row[:3])
+    if len(rows) > limit:
+        rows = rows[:limit]
+        result['has_more'] = True
+        result['cursor'] = page_cursor(*rows[-1][:3])
+    for _, stream, _, row in rows:
+        if stream == 0:
+            result['reminders'].append(_serialize_reminder(row))
+        elif stream == 1:
+            result['recurring_rules'].append(_serialize_recurring_rule(row))
+        elif row.table_name == 'reminder':
+            result['deleted']['reminders'].append(
+                {'id': row.row_id, 'date': row.day.strftime('%Y-%m-%d') if row.day else None})
+        else:
+            result['deleted']['recurring_rules'].append(row.row_id)
+    return jsonify(result)
+
+
 @main_bp.route('/api/recurring_rules/<int:rid>', methods=['PATCH', 'DELETE'])
 def api_recurring_rules_update_delete(rid):
     rr = RecurringReminder.query.get_or_404(rid)
     if request.method == 'DELETE':
         payload = request.get_json(silent=True) or {}
         user = sanitize_text(payload.get('creator', ''))
-        admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-        admin_aliases = {admin_name, 'Administrator', 'admin'}
+        admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
         if not (user in admin_aliases or user == (rr.creator or '')):
             return jsonify({'ok': False, 'error': 'Not allowed'}), 403
         db.session.delete(rr)
@@ -320,8 +480,7 @@ def api_recurring_rules_update_delete(rid):
     # PATCH
     payload = request.get_json(silent=True) or {}
     user = sanitize_text(payload.get('creator', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if not (user in admin_aliases or user == (rr.creator or '')):
         return jsonify({'ok': False, 'error': 'Not allowed'}), 403
     # Updatable fields
@@ -363,25 +522,28 @@ def api_recurring_rules_update_delete(rid):
     return jsonify({'ok': True, 'rule': _serialize_recurring_rule(rr)})
 
 
-@main_bp.route('/api/reminders', methods=['POST'])
-def api_reminders_create():
-    payload = request.get_json(silent=True) or {}
+def _parse_time(value) -> str | None:
+    """Normalize 'HH:MM' (24h); None when missing or invalid."""
+    if isinstance(value, str) and len(value) == 5 and value[2] == ':':
+        hh, mm = value.split(':', 1)
+        if hh.isdigit() and mm.isdigit():
+            hhi, mmi = int(hh), int(mm)
+            if 0 <= hhi < 24 and 0 <= mmi < 60:
+                return f"{hhi:02d}:{mmi:02d}"
+    return None
+
+
+def _new_reminder_from_payload(payload: dict):
+    """Validate a create payload; returns (Reminder or RecurringReminder, None) or (None, error)."""
     title = sanitize_text(payload.get('title', ''))
     creator = sanitize_text(payload.get('creator', ''))
     description = sanitize_html(payload.get('description', ''))
     if not title:
-        return jsonify({'ok': False, 'error': 'Title required'}), 400
+        return None, 'Title required'
     d = _parse_date_param(payload.get('date'), None)
     if not d:
-        return jsonify({'ok': False, 'error': 'Invalid date'}), 400
-    time_raw = payload.get('time')
-    tval = None
-    if isinstance(time_raw, str) and len(time_raw) == 5 and time_raw[2] == ':':
-        hh, mm = time_raw.split(':', 1)
-        if hh.isdigit() and mm.isdigit():
-            hhi, mmi = int(hh), int(mm)
-            if 0 <= hhi < 24 and 0 <= mmi < 60:
-                tval = f"{hhi:02d}:{mmi:02d}"
+        return None, 'Invalid date'
+    tval = _parse_time(payload.get('time'))
     # Recurring support (optional)
     recur = payload.get('recurring')
     if recur and isinstance(recur, dict):
@@ -404,29 +566,19 @@ def api_reminders_create():
                                frequency=None, monthly_mode=None,
                                time=tval, category=payload.get('category'), color=payload.get('color'),
                                start_date=d, end_date=end_d, effective_from=d)
-        db.session.add(rr)
-        db.session.commit()
-        return jsonify({'ok': True, 'recurring_id': rr.id})
+        return rr, None
     r = Reminder(date=d, title=title, description=description, creator=creator, time=tval)
     cat = payload.get('category'); col = payload.get('color')
-    if hasattr(r, 'category'):
-        r.category = sanitize_text(cat) if cat else None
-    if hasattr(r, 'color'):
-        r.color = sanitize_text(col) if col else None
-    db.session.add(r)
-    db.session.commit()
-    return jsonify({'ok': True, 'reminder': _serialize_reminder(r)})
+    r.category = sanitize_text(cat) if cat else None
+    r.color = sanitize_text(col) if col else None
+    return r, None
 
 
-@main_bp.route('/api/reminders/<int:rid>', methods=['PATCH'])
-def api_reminders_update(rid):
-    r = Reminder.query.get_or_404(rid)
-    payload = request.get_json(silent=True) or {}
-    user = sanitize_text(payload.get('creator', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
-    if user not in admin_aliases and user != (r.creator or ''):
-        return jsonify({'ok': False, 'error': 'Not allowed'}), 403
+def _can_edit_reminder(user: str, r: Reminder, admin_aliases) -> bool:
+    return user in admin_aliases or user == (r.creator or '')
+
+
+def _apply_reminder_patch(r: Reminder, payload: dict):
     if 'title' in payload:
         title = sanitize_text(payload['title'])
         if title:
@@ -437,22 +589,138 @@ def api_reminders_update(rid):
         nd = _parse_date_param(payload['date'], None)
         if nd:
             r.date = nd
-    if hasattr(r, 'time') and 'time' in payload:
-        time_raw = payload.get('time')
-        if isinstance(time_raw, str) and len(time_raw) == 5 and time_raw[2] == ':':
-            hh, mm = time_raw.split(':', 1)
-            if hh.isdigit() and mm.isdigit():
-                hhi, mmi = int(hh), int(mm)
-                if 0 <= hhi < 24 and 0 <= mmi < 60:
-                    r.time = f"{hhi:02d}:{mmi:02d}"
-    if hasattr(r, 'category') and 'category' in payload:
+    if 'time' in payload:
+        tval = _parse_time(payload.get('time'))
+        if tval:
+            r.time = tval
+    if 'category' in payload:
         r.category = sanitize_text(payload.get('category')) if payload.get('category') else None
-    if hasattr(r, 'color') and 'color' in payload:
+    if 'color' in payload:
         r.color = sanitize_text(payload.get('color')) if payload.get('color') else None
+
+
+@main_bp.route('/api/reminders', methods=['POST'])
+def api_reminders_create():
+    payload = request.get_json(silent=True) or {}
+    item, error = _new_reminder_from_payload(payload)
+    if error:
+        return jsonify({'ok': False, 'error': error}), 400
+    db.session.add(item)
+    db.session.commit()
+    if isinstance(item, RecurringReminder):
+        return jsonify({'ok': True, 'recurring_id': item.id})
+    return jsonify({'ok': True, 'reminder': _serialize_reminder(item)})
+
+
+@main_bp.route('/api/reminders/<int:rid>', methods=['PATCH'])
+def api_reminders_update(rid):
+    r = Reminder.query.get_or_404(rid)
+    payload = request.get_json(silent=True) or {}
+    user = sanitize_text(payload.get('creator', ''))
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
+    if not _can_edit_reminder(user, r, admin_aliases):
+        return jsonify({'ok': False, 'error': 'Not allowed'}), 403
+    _apply_reminder_patch(r, payload)
     db.session.commit()
     return jsonify({'ok': True, 'reminder': _serialize_reminder(r)})
 
 
+BATCH_MAX_OPERATIONS = 1000
+IN_CHUNK = 500  # ids per IN (...) query; stays under SQLite's bound-parameter limit
+
+
+@main_bp.route('/api/reminders/batch', methods=['POST'])
+def api_reminders_batch():
+    """Apply many creates/updates in one transaction.
+
+    Body: ``{"operations": [{"op": "create", ...create payload},
+    {"op": "update", "id": 12, ...patch payload}]}`` (a bare list also works).
+    Each operation is validated like the single-item endpoints; invalid ones
+    are reported in ``results`` and skipped, the rest commit together.
+    """
+    payload = request.get_json(silent=True)
+    ops = payload.get('operations') if isinstance(payload, dict) else payload
+    if not isinstance(ops, list) or not ops:
+        return jsonify({'ok': False, 'error': 'No operations provided'}), 400
+    if len(ops) > BATCH_MAX_OPERATIONS:
+        return jsonify({'ok': False, 'error': f'Too many operations (max {BATCH_MAX_OPERATIONS})'}), 400
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
+    # Load every reminder targeted by an update up front (chunked IN queries)
+    update_ids = list({op.get('id') for op in ops if isinstance(op, dict) and op.get('op') == 'update'
+                       and isinstance(op.get('id'), int)})
+    existing = {}
+    for i in range(0, len(update_ids), IN_CHUNK):
+        for r in Reminder.query.filter(Reminder.id.in_(update_ids[i:i + IN_CHUNK])):
+            existing[r.id] = r
+    results = [None] * len(ops)
+    created = []  # (index, item)
+    updated = []  # (index, reminder)
+    for index, op in enumerate(ops):
+        kind = op.get('op') if isinstance(op, dict) else None
+        if kind == 'create':
+            item, error = _new_reminder_from_payload(op)
+            if error:
+                results[index] = {'ok': False, 'error': error, 'status': 400}
+            else:
+                created.append((index, item))
+        elif kind == 'update':
+            r = existing.get(op.get('id'))
+            if r is None:
+                results[index] = {'ok': False, 'error': 'Not found', 'status': 404}
+            elif not _can_edit_reminder(sanitize_text(op.get('creator', '')), r, admin_aliases):
+                results[index] = {'ok': False, 'error': 'Not allowed', 'status': 403}
+            else:
+                _apply_reminder_patch(r, op)
+                updated.append((index, r))
+        else:
+            results[index] = {'ok': False, 'error': "op must be 'create' or 'update'", 'status': 400}
+    if created or updated:
+        db.session.add_all(item for _, item in created)
+        # One flush assigns the new ids; one commit for the whole batch
+        db.session.flush()
+        for index, item in created:
+            if isinstance(item, RecurringReminder):
+                results[index] = {'ok': True, 'recurring_id': item.id}
+            else:
+                results[index] = {'ok': True, 'reminder': _serialize_reminder(item)}
+        for index, r in updated:
+            results[index] = {'ok': True, 'reminder': _serialize_reminder(r)}
+        db.session.commit()
+    applied = len(created) + len(updated)
+    return jsonify({'ok': True, 'applied': applied, 'failed': len(ops) - applied, 'results': results})
+
+
+BULK_DELETE_MAX_IDS = 5000
+
+
+def _bulk_delete_reminders(ids: list[int], user: str, blank_creator_matches: bool = False) -> tuple[list[int], list[str]]:
+    """Delete the reminders in ``ids`` that ``user`` may delete.
+
+    Returns (deleted ids, affected dates). The permission check runs in SQL:
+    admins may delete anything, others only rows they created.
+    """
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
+    owner = db.func.coalesce(Reminder.creator, '') if blank_creator_matches else Reminder.creator
+    deleted, dates = [], set()
+    for i in range(0, len(ids), IN_CHUNK):
+        chunk = ids[i:i + IN_CHUNK]
+        q = db.session.query(Reminder.id, Reminder.date).filter(Reminder.id.in_(chunk))
+        if user not in admin_aliases:
+            q = q.filter(owner == user)
+        rows = q.all()
+        if not rows:
+            continue
+        Reminder.query.filter(Reminder.id.in_([rid for rid, _ in rows])).delete(synchronize_session=False)
+        record_deletions(db.session.connection(), 'reminder', rows)
+        for rid, rdate in rows:
+            deleted.append(rid)
+            if rdate:
+                dates.add(rdate.strftime('%Y-%m-%d'))
+    if deleted:
+        db.session.commit()
+    return deleted, sorted(dates)
+
+
 @main_bp.route('/api/reminders', methods=['DELETE'])
 def api_reminders_delete_bulk():
     payload = request.get_json(silent=True) or {}
@@ -460,24 +728,13 @@ def api_reminders_delete_bulk():
     user = sanitize_text(payload.get('creator', ''))
     if not isinstance(ids, list) or not ids:
         return jsonify({'ok': False, 'error': 'No ids provided'}), 400
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
-    deleted = 0
-    dates = set()
-    for rid in ids:
-        if not isinstance(rid, int):
-            continue
-        r = Reminder.query.get(rid)
-        if not r:
-            continue
-        if user in admin_aliases or user == (r.creator or ''):
-            if r.date:
-                dates.add(r.date.strftime('%Y-%m-%d'))
-            db.session.delete(r)
-            deleted += 1
-    if deleted:
-        db.session.commit()
-    return jsonify({'ok': True, 'deleted': deleted, 'dates': list(dates)})
+    ids = list(dict.fromkeys(rid for rid in ids if isinstance(rid, int) and not isinstance(rid, bool)))
+    if len(ids) > BULK_DELETE_MAX_IDS:
+        return jsonify({'ok': False, 'error': f'Too many ids (max {BULK_DELETE_MAX_IDS})'}), 400
+    deleted, dates = _bulk_delete_reminders(ids, user, blank_creator_matches=True)
+    done = set(deleted)
+    skipped = [rid for rid in ids if rid not in done]
+    return jsonify({'ok': True, 'deleted': len(deleted), 'dates': dates, 'skipped': skipped})
 
 
 @main_bp.route('/calendar/add', methods=['POST'])
@@ -505,8 +762,7 @@ def add_reminder():
 def delete_reminder(reminder_id):
     r = Reminder.query.get_or_404(reminder_id)
     user = sanitize_text(request.form.get('user'))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == r.creator:
         db.session.delete(r)
         db.session.commit()
@@ -535,24 +791,14 @@ def delete_reminders_bulk():
             id_list.append(int(part))
     if not id_list:
         return redirect(url_for('main.index'))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
-    kept_date = None
-    deleted = 0
-    for rid in id_list:
-        r = Reminder.query.get(rid)
-        if not r:
-            continue
-        if kept_date is None and getattr(r, 'date', None):
-            try:
-                kept_date = r.date.strftime('%Y-%m-%d')
-            except Exception:
-                kept_date = None
-        if user in admin_aliases or user == r.creator:
-            db.session.delete(r)
-            deleted += 1
+    id_list = list(dict.fromkeys(id_list))
+    if len(id_list) > BULK_DELETE_MAX_IDS:
+        flash(f'Too many reminders selected (max {BULK_DELETE_MAX_IDS}).', 'error')
+        return redirect(url_for('main.index'))
+    deleted_ids, dates = _bulk_delete_reminders(id_list, user)
+    deleted = len(deleted_ids)
+    kept_date = dates[0] if dates else None
     if deleted:
-        db.session.commit()
         flash(f'Deleted {deleted} reminder(s).', 'success')
     else:
         flash('No reminders deleted (permission?).', 'error')
@@ -580,11 +826,37 @@ def update_notice():
     return redirect(url_for('main.index'))
 
 
+@main_bp.route('/api/household_status')
+@conditional('home_status', 'member_status', changed_at=presence.last_expiry)
+def api_household_status():
+    """Who-is-home and personal statuses; refetched by open pages on live events."""
+    family = get_family_set(current_app.config['HOMEHUB_CONFIG'])
+    who_statuses, member_statuses = presence.statuses(family)
+    return jsonify({'ok': True, 'who_statuses': who_statuses, 'member_statuses': member_statuses})
+
+
+@main_bp.route('/api/presence/heartbeat', methods=['POST'])
+def api_presence_heartbeat():
+    """A device reports its owner at home; the status falls back to Away when beats stop.
+
+    Authenticated by session or ``Authorization: Bearer <presence_token>``.
+    Body (JSON or form): ``{"name": "<family member>"}``.
+    """
+    config = current_app.config['HOMEHUB_CONFIG']
+    payload = request.get_json(silent=True) or request.form
+    name = sanitize_text(payload.get('name', ''))
+    if not name or name not in get_family_set(config):
+        return jsonify({'ok': False, 'error': 'Invalid user'}), 400
+    written = presence.record_heartbeat(name)
+    ttl = presence.heartbeat_ttl(config)
+    return jsonify({'ok': True, 'status': 'Home', 'written': written, 'expires_in': int(ttl.total_seconds())})
+
+
 @main_bp.route('/whoishome', methods=['POST'])
 def who_is_home_action():
     action = sanitize_text(request.form.get('action', 'update'))
     config = current_app.config['HOMEHUB_CONFIG']
-    family = set(config.get('family_members', []))
+    family = get_family_set(config)
     name = sanitize_text(request.form.get('name', ''))
     if not name or name not in family:
         if request.headers.get('X-Requested-With') != 'fetch':
@@ -594,10 +866,7 @@ def who_is_home_action():
         return redirect(url_for('main.index'))
     result = None
     if action == 'clear':
-        hs = HomeStatus.query.filter_by(name=name).first()
-        if hs:
-            db.session.delete(hs)
-            db.session.commit()
+        if presence.clear_home_status(name):
             result = 'cleared'
             if request.headers.get('X-Requested-With') != 'fetch':
                 flash('Status cleared.', 'success')
@@ -607,18 +876,12 @@ def who_is_home_action():
                 flash('No status to clear.', 'info')
     else:
         status = sanitize_text(request.form.get('status', '')) or 'Away'
-        hs = HomeStatus.query.filter_by(name=name).first()
-        if hs:
-            hs.status = status
-        else:
-            db.session.add(HomeStatus(name=name, status=status))
-        db.session.commit()
+        presence.set_home_status(name, status)
         result = 'updated'
         if request.headers.get('X-Requested-With') != 'fetch':
             flash('Status updated.', 'success')
     if request.headers.get('X-Requested-With') == 'fetch':
-        who_statuses = {s.name: s.status for s in HomeStatus.query.all() if s.name in family}
-        member_statuses = {ms.name: ms.text for ms in MemberStatus.query.all() if ms.name in family and (ms.text or '').strip()}
+        who_statuses, member_statuses = presence.statuses(family)
         result = result or 'updated'
         return jsonify({'ok': True, 'who_statuses': who_statuses, 'member_statuses': member_statuses, 'result': result})
     date_q = request.args.get('date') or request.form.get('date')
@@ -628,7 +891,7 @@ def who_is_home_action():
 @main_bp.route('/status/update', methods=['POST'])
 def member_status_update():
     config = current_app.config['HOMEHUB_CONFIG']
-    family = set(config.get('family_members', []))
+    family = get_family_set(config)
     name = sanitize_text(request.form.get('name', ''))
     raw_text = request.form.get('text', '') or ''
     text = sanitize_text(raw_text)
@@ -644,19 +907,11 @@ def member_status_update():
         else:
             flash('Status cannot be empty.', 'error')
             return redirect(url_for('main.index'))
-    ms = MemberStatus.query.filter_by(name=name).first()
-    now = datetime.utcnow()
-    if ms:
-        ms.text = text
-        ms.updated_at = now
-    else:
-        db.session.add(MemberStatus(name=name, text=text, updated_at=now))
-    db.session.commit()
+    presence.set_member_status(name, text)
     if request.headers.get('X-Requested-With') != 'fetch':
         flash('Status saved.', 'success')
     if request.headers.get('X-Requested-With') == 'fetch':
-        who_statuses = {s.name: s.status for s in HomeStatus.query.all() if s.name in family}
-        member_statuses = {ms.name: ms.text for ms in MemberStatus.query.all() if ms.name in family and (ms.text or '').strip()}
+        who_statuses, member_statuses = presence.statuses(family)
         return jsonify({'ok': True, 'who_statuses': who_statuses, 'member_statuses': member_statuses, 'result': 'saved'})
     return redirect(url_for('main.index'))
 
@@ -664,7 +919,7 @@ def member_status_update():
 @main_bp.route('/status/delete', methods=['POST'])
 def member_status_delete():
     config = current_app.config['HOMEHUB_CONFIG']
-    family = set(config.get('family_members', []))
+    family = get_family_set(config)
     name = sanitize_text(request.form.get('name', ''))
     if not name or name not in family:
         if request.headers.get('X-Requested-With') != 'fetch':
@@ -672,16 +927,11 @@ def member_status_delete():
         if request.headers.get('X-Requested-With') == 'fetch':
             return jsonify({'ok': False, 'error': 'Invalid user'}), 400
         return redirect(url_for('main.index'))
-    ms = MemberStatus.query.filter_by(name=name).first()
-    removed = False
-    if ms:
-        db.session.delete(ms)
-        db.session.commit()
-        removed = True
+    removed = presence.clear_member_status(name)
+    if removed:
         if request.headers.get('X-Requested-With') != 'fetch':
             flash('Status removed.', 'success')
     if request.headers.get('X-Requested-With') == 'fetch':
-        who_statuses = {s.name: s.status for s in HomeStatus.query.all() if s.name in family}
-        member_statuses = {ms.name: ms.text for ms in MemberStatus.query.all() if ms.name in family and (ms.text or '').strip()}
+        who_statuses, member_statuses = presence.statuses(family)
         return jsonify({'ok': True, 'who_statuses': who_statuses, 'member_statuses': member_statuses, 'result': 'removed' if removed else 'none'})
     return redirect(url_for('main.index'))
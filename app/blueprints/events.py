@@ -0,0 +1,16 @@
+from flask import Response, current_app, jsonify
+from ..blueprints import main_bp
+from .. import events as bus
+
+
+@main_bp.route('/api/events')
+def events_stream():
+    """Server-Sent Events stream of committed changes (see app/events.py)."""
+    sub = bus.subscribe(current_app._get_current_object())
+    if sub is None:
+        return jsonify({'ok': False, 'error': 'Too many live connections'}), 503, {'Retry-After': '30'}
+    # No app context inside the generator: the stream holds no database connection
+    response = Response(bus.stream(sub), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # keep nginx from buffering the stream
+    return response
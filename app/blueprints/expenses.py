@@ -2,9 +2,15 @@ from flask import render_template, request, redirect, url_for, flash, jsonify, c
 from datetime import datetime, date, timedelta
 import calendar as _calendar
 import json
+from sqlalchemy.dialects.sqlite import insert
 from ..models import db, RecurringExpense, ExpenseEntry
+from ..recurrence import compile_expense_rule
 from ..security import sanitize_text
 from ..blueprints import main_bp
+from ..config import get_admin_aliases
+from ..etag import conditional
+from ..scheduler import ensure_current, materialize_task
+from ..settings import get_settings, set_settings
 import bleach
 
 
@@ -22,74 +28,45 @@ def _fraction_factor_precision(value) -> int:
     return precision if factor == 1 else 2
 
 
+@materialize_task('expenses')
 def _generate_recurring_entries_until(today: date | None = None) -> None:
     today = today or date.today()
     recs = RecurringExpense.query.all()
     for r in recs:
-        start = r.start_date or today
         # Generate from rule start date; don't clamp to effective_from so rule owns entire range
-        base_day = (r.start_date or today).day
+        start = r.start_date or today
+        rule = compile_expense_rule(r, today)
         last = r.last_generated_date
-
-        def next_date(d: date) -> date:
-            if r.frequency == 'daily':
-                return d + timedelta(days=1)
-            if r.frequency == 'weekly':
-                return d + timedelta(weeks=1)
-            mode = getattr(r, 'monthly_mode', 'day_of_month') or 'day_of_month'
-            if mode == 'calendar':
-                ny = d.year + (1 if d.month == 12 else 0)
-                nm = 1 if d.month == 12 else d.month + 1
-                return date(ny, nm, 1)
-            else:
-                ny = d.year + (1 if d.month == 12 else 0)
-                nm = 1 if d.month == 12 else d.month + 1
-                last_dom = _calendar.monthrange(ny, nm)[1]
-                day = min(base_day, last_dom)
-                return date(ny, nm, day)
-
         if last is None or (last and last < start):
-            if r.frequency in ('daily', 'weekly'):
-                d = start
-            else:
-                mode = getattr(r, 'monthly_mode', 'day_of_month') or 'day_of_month'
-                if mode == 'calendar':
-                    if start.day == 1:
-                        d = start
-                    else:
-                        ny = start.year + (1 if start.month == 12 else 0)
-                        nm = 1 if start.month == 12 else start.month + 1
-                        d = date(ny, nm, 1)
-                else:
-                    d = start
+            d = rule.first_on_or_after(start)
         else:
-            d = next_date(last)
-
-        while d <= today and (not r.end_date or d <= r.end_date):
-            exists = ExpenseEntry.query.filter_by(date=d, recurring_id=r.id).first()
-            if not exists:
-                qty = r.default_quantity or 1.0
-                amt = (r.unit_price or 0.0) * qty
-                db.session.add(ExpenseEntry(
-                    date=d,
-                    title=r.title,
-                    category=getattr(r, 'category', None),
-                    unit_price=r.unit_price,
-                    quantity=qty,
-                    amount=amt,
-                    payer=r.creator,
-                    recurring_id=r.id
-                ))
+            d = rule.next_after(last)
+
+        rows = []
+        while d is not None and d <= today and (not r.end_date or d <= r.end_date):
+            qty = r.default_quantity or 1.0
+            rows.append({
+                'date': d,
+                'title': r.title,
+                'category': getattr(r, 'category', None),
+                'unit_price': r.unit_price,
+                'quantity': qty,
+                'amount': (r.unit_price or 0.0) * qty,
+                'payer': r.creator,
+                'recurring_id': r.id,
+            })
             r.last_generated_date = d
-            d = next_date(d)
+            d = rule.next_after(d)
+        if rows:
+            # ux_expense_entry_recurring_date: a date generated before (or by another worker) is skipped
+            db.session.execute(insert(ExpenseEntry).on_conflict_do_nothing(), rows)
     db.session.commit()
 
 
 def _load_expense_settings() -> dict:
     settings = {'currency': '\u20b9', 'categories': [], 'fraction_factor': 100, 'fraction_precision': 2}
     try:
-        rows = db.session.execute(db.text("SELECT key, value FROM app_setting WHERE key IN ('currency','categories','fraction_factor')"))
-        data = {k: v for k, v in rows}
+        data = get_settings()
         if data.get('currency'):
             settings['currency'] = data['currency']
         if data.get('categories'):
@@ -163,8 +140,8 @@ def _build_month_payload(y: int, m: int) -> dict:
 @main_bp.route('/expenses', methods=['GET', 'POST'])
 def expenses():
     today = date.today()
-    # Ensure recurring entries are generated up to today for a consistent view
-    _generate_recurring_entries_until(today)
+    # Ensure recurring entries are generated up to today (no-op when the scheduler already did)
+    ensure_current('expenses', today)
 
     if request.method == 'POST':
         form_type = request.form.get('form_type')
@@ -221,8 +198,7 @@ def expenses():
 def edit_recurring_expense(rid):
     r = RecurringExpense.query.get_or_404(rid)
     user = sanitize_text(request.form.get('user', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if not (user in admin_aliases or user == (r.creator or '')):
         flash('Not allowed to edit rule.', 'error')
         return redirect(url_for('main.expenses'))
@@ -411,8 +387,7 @@ def edit_recurring_expense(rid):
 def delete_recurring_expense(rid):
     r = RecurringExpense.query.get_or_404(rid)
     user = sanitize_text(request.form.get('user', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if not (user in admin_aliases or user == (r.creator or '')):
         flash('Not allowed to delete rule.', 'error')
         return redirect(url_for('main.expenses'))
@@ -447,10 +422,7 @@ def expenses_settings():
     except Exception:
         fraction_factor = 100
     try:
-        db.session.execute(db.text("INSERT INTO app_setting(key,value) VALUES('currency', :v) ON CONFLICT(key) DO UPDATE SET value=excluded.value"), {"v": currency})
-        db.session.execute(db.text("INSERT INTO app_setting(key,value) VALUES('categories', :v) ON CONFLICT(key) DO UPDATE SET value=excluded.value"), {"v": categories})
-        db.session.execute(db.text("INSERT INTO app_setting(key,value) VALUES('fraction_factor', :v) ON CONFLICT(key) DO UPDATE SET value=excluded.value"), {"v": str(fraction_factor)})
-        db.session.commit()
+        set_settings({'currency': currency, 'categories': categories, 'fraction_factor': fraction_factor})
         flash('Settings saved.', 'success')
     except Exception:
         flash('Failed to save settings.', 'error')
@@ -464,8 +436,7 @@ def expenses_settings():
 def delete_expense_entry(entry_id):
     entry = ExpenseEntry.query.get_or_404(entry_id)
     user = sanitize_text(request.form.get('user', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if not (user in admin_aliases or user == (entry.payer or '')):
         flash('Not allowed to delete entry.', 'error')
         return redirect(url_for('main.expenses'))
@@ -484,8 +455,7 @@ def delete_expense_entry(entry_id):
 def edit_expense_entry(entry_id):
     entry = ExpenseEntry.query.get_or_404(entry_id)
     user = sanitize_text(request.form.get('user', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if not (user in admin_aliases or user == (entry.payer or '')):
         flash('Not allowed to edit entry.', 'error')
         return redirect(url_for('main.expenses'))
@@ -517,8 +487,7 @@ def edit_expense_entry(entry_id):
 @main_bp.route('/expenses/bulk-delete', methods=['POST'])
 def bulk_delete_expenses():
     user = sanitize_text(request.form.get('user', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     ids = request.form.getlist('ids')
     if not ids:
         flash('No entries selected.', 'warning')
@@ -543,9 +512,10 @@ def bulk_delete_expenses():
 
 
 @main_bp.route('/api/expenses/month', methods=['GET'])
+@conditional('expense_entry', 'recurring_expense', 'app_setting')
 def api_expenses_month():
     # Keep recurring data up-to-date before answering
-    _generate_recurring_entries_until(date.today())
+    ensure_current('expenses')
     today = date.today()
     # Parse query params with clear validation and logging
     y, m = today.year, today.month
@@ -574,7 +544,7 @@ def api_expenses_month():
 def recurring_expenses_page():
     """Dedicated page for managing recurring expense rules and settings."""
     today = date.today()
-    _generate_recurring_entries_until(today)
+    ensure_current('expenses', today)
     
     rules = RecurringExpense.query.order_by(RecurringExpense.timestamp.desc()).all()
     expense_settings = _load_expense_settings()
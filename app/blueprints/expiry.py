@@ -2,6 +2,7 @@ from flask import render_template, request, redirect, url_for, current_app
 from datetime import datetime, date
 from ..models import db, ExpiryItem
 from ..blueprints import main_bp
+from ..config import get_admin_aliases
 from ..security import sanitize_text
 
 
@@ -33,8 +34,7 @@ def expiry():
 def delete_expiry(item_id):
     it = ExpiryItem.query.get_or_404(item_id)
     user = sanitize_text(request.form['user'])
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == it.creator:
         db.session.delete(it)
         db.session.commit()
@@ -1,9 +1,11 @@
 import os, re, shutil, subprocess
-from threading import Thread
 from flask import render_template, request, redirect, url_for, send_from_directory, jsonify, current_app, flash
 from datetime import datetime
 from ..models import db, Media, PDF
 from ..blueprints import main_bp
+from .. import retention
+from ..config import get_admin_aliases
+from ..jobs import enqueue, job_handler
 from ..security import sanitize_text, is_url_safe_for_fetch
 from werkzeug.utils import secure_filename
 
@@ -13,6 +15,66 @@ MEDIA_FOLDER = os.path.join(BASE_DIR, 'media')
 PDF_FOLDER = os.path.join(BASE_DIR, 'pdfs')
 
 
+@job_handler('media_download')
+def _download_media(payload: dict):
+    mid = payload['media_id']
+    base_prefix = payload['base']
+    m = Media.query.get(mid)
+    if not m:
+        return
+    try:
+        proc = subprocess.Popen(payload['command'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        last_percent = -1
+        for line in proc.stdout:
+            try:
+                m = Media.query.get(mid)
+                if not m:
+                    continue
+                match = re.search(r"\[download\]\s+(\d+(?:\.\d+)?)%", line)
+                if match:
+                    p = int(float(match.group(1)))
+                    if p != last_percent and p % 5 == 0:
+                        m.progress = f"{p}%"
+                        db.session.commit()
+                        last_percent = p
+            except Exception:
+                pass
+        ret = proc.wait()
+        if ret != 0:
+            raise RuntimeError(f"yt-dlp exited with {ret}")
+        saved = None
+        for fname in os.listdir(MEDIA_FOLDER):
+            if fname.startswith(base_prefix):
+                saved = fname
+                break
+        m.filepath = saved or ''
+        m.status = 'done'
+    except Exception:
+        m.status = 'error'
+    finally:
+        m.progress = None
+        db.session.commit()
+
+
+@job_handler('pdf_compress')
+def _compress_pdf(payload: dict):
+    input_path = os.path.join(PDF_FOLDER, payload['input'])
+    output_path = os.path.join(PDF_FOLDER, payload['output'])
+    tmp_path = output_path + '.part'
+    gs_cmd = [
+        'gs', '-sDEVICE=pdfwrite', '-dCompatibilityLevel=1.4',
+        '-dPDFSETTINGS=/ebook', '-dNOPAUSE', '-dQUIET', '-dBATCH',
+        f'-sOutputFile={tmp_path}', input_path
+    ]
+    try:
+        subprocess.run(gs_cmd, check=True)
+        # Swap in atomically so downloads never see a half-written file
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 @main_bp.route('/media', methods=['GET', 'POST'])
 def media():
     if request.method == 'POST':
@@ -41,47 +103,14 @@ def media():
             cmd += ["-f", fmt_string, "--merge-output-format", "mp4"]
         cmd += [url]
 
-        app_obj = current_app._get_current_object()
-
-        def worker(app, mid: int, base_prefix: str, command: list):
-            with app.app_context():
-                m = Media.query.get(mid)
-                try:
-                    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
-                    last_percent = -1
-                    for line in proc.stdout:
-                        try:
-                            m = Media.query.get(mid)
-                            if not m:
-                                continue
-                            match = re.search(r"\[download\]\s+(\d+(?:\.\d+)?)%", line)
-                            if match:
-                                p = int(float(match.group(1)))
-                                if p != last_percent and p % 5 == 0:
-                                    m.progress = f"{p}%"
-                                    db.session.commit()
-                                    last_percent = p
-                        except Exception:
-                            pass
-                    ret = proc.wait()
-                    if ret != 0:
-                        raise RuntimeError(f"yt-dlp exited with {ret}")
-                    saved = None
-                    for fname in os.listdir(MEDIA_FOLDER):
-                        if fname.startswith(base_prefix):
-                            saved = fname
-                            break
-                    m.filepath = saved or ''
-                    m.status = 'done'
-                except Exception:
-                    m.status = 'error'
-                finally:
-                    m.progress = None
-                    db.session.commit()
-
-        Thread(target=worker, args=(app_obj, media_obj.id, base, cmd), daemon=True).start()
+        # Run by whichever worker holds the job lease (see app/jobs.py)
+        enqueue('media_download', {'media_id': media_obj.id, 'base': base, 'command': cmd})
         return redirect(url_for('main.media'))
     media_list = Media.query.order_by(Media.download_time.desc()).all()
+    if retention.include_archived():
+        media_list += retention.load_archived(
+            Media, order_by=(retention.archive_for(Media).c.download_time.desc(),), limit=retention.ARCHIVED_PAGE_LIMIT,
+        )
     config = current_app.config['HOMEHUB_CONFIG']
     return render_template('media.html', media_list=media_list, config=config)
 
@@ -113,8 +142,7 @@ def preview_media(filename):
 def delete_media(media_id):
     m = Media.query.get_or_404(media_id)
     user = sanitize_text(request.form['user'])
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == m.creator:
         try:
             if m.filepath:
@@ -150,18 +178,12 @@ def pdfs():
         pdf_file.save(input_path)
         compressed_path = f"compressed_{safe_name}"
         output_path = os.path.join(PDF_FOLDER, compressed_path)
-        try:
-            gs_cmd = [
-                'gs', '-sDEVICE=pdfwrite', '-dCompatibilityLevel=1.4',
-                '-dPDFSETTINGS=/ebook', '-dNOPAUSE', '-dQUIET', '-dBATCH',
-                f'-sOutputFile={output_path}', input_path
-            ]
-            subprocess.run(gs_cmd, check=True)
-        except Exception:
-            shutil.copy(input_path, output_path)
+        # Serve the original until the background job swaps in the compressed copy
+        shutil.copy(input_path, output_path)
         pdf_obj = PDF(filename=safe_name, creator=creator, compressed_path=compressed_path)
         db.session.add(pdf_obj)
         db.session.commit()
+        enqueue('pdf_compress', {'input': safe_name, 'output': compressed_path})
         return redirect(url_for('main.pdfs'))
     pdfs = PDF.query.order_by(PDF.upload_time.desc()).all()
     config = current_app.config['HOMEHUB_CONFIG']
@@ -188,8 +210,7 @@ def preview_pdf(filename):
 def delete_pdf(pdf_id):
     p = PDF.query.get_or_404(pdf_id)
     user = sanitize_text(request.form['user'])
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == p.creator:
         try:
             if p.compressed_path:
@@ -0,0 +1,20 @@
+from flask import current_app, request, jsonify, Response
+from ..blueprints import main_bp
+from ..config import get_admin_aliases
+from ..metrics import render_prometheus
+from ..security import bearer_token, sanitize_text, token_matches
+
+
+@main_bp.route('/api/_metrics')
+def api_metrics():
+    """Prometheus text exposition of per-endpoint request metrics (admin only).
+
+    Scrapers authenticate with ``Authorization: Bearer <metrics_token>`` from
+    config.yml; from a logged-in browser pass ``?user=<admin name>``.
+    """
+    cfg = current_app.config['HOMEHUB_CONFIG']
+    user = sanitize_text(request.args.get('user', ''))
+    token = bearer_token(request.headers.get('Authorization', ''))
+    if not (token_matches(cfg.get('metrics_token'), token) or user in get_admin_aliases(cfg)):
+        return jsonify({"ok": False, "error": "admin only"}), 403
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
@@ -1,6 +1,7 @@
 from flask import render_template, request, redirect, url_for, current_app
 from ..models import db, Note
 from ..blueprints import main_bp
+from ..config import get_admin_aliases
 from ..security import sanitize_text, sanitize_html
 
 
@@ -12,8 +13,7 @@ def notes():
         creator = sanitize_text(request.form['creator'])
         if note_id:
             n = Note.query.get_or_404(int(note_id))
-            admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-            admin_aliases = {admin_name, 'Administrator', 'admin'}
+            admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
             if creator in admin_aliases or creator == n.creator:
                 n.content = content
                 db.session.commit()
@@ -31,8 +31,7 @@ def notes():
 def delete_note(note_id):
     note = Note.query.get_or_404(note_id)
     user = sanitize_text(request.form['user'])
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == note.creator:
         db.session.delete(note)
         db.session.commit()
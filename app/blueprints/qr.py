@@ -1,4 +1,5 @@
 import base64
+import hashlib
 import os
 from io import BytesIO
 
@@ -7,6 +8,8 @@ import qrcode
 
 from ..models import db, QRCode
 from ..blueprints import main_bp
+from .. import retention
+from ..config import get_admin_aliases
 from ..security import sanitize_text
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -62,7 +65,9 @@ def qr_view():
         qr_img = b64
         # Persist a file for history download
         os.makedirs(STATIC_DIR, exist_ok=True)
-        filename = f"qr_{len(text)}_{abs(hash(payload)) % (10**8)}.png"
+        # Content digest, not hash(): str hashes are randomized per process
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+        filename = f"qr_{len(text)}_{digest}.png"
         out_path = os.path.join(STATIC_DIR, filename)
         img.save(out_path)
         # Save DB row
@@ -70,6 +75,9 @@ def qr_view():
         db.session.add(rec)
         db.session.commit()
     history = QRCode.query.order_by(QRCode.timestamp.desc()).limit(50).all()
+    if retention.include_archived():
+        # Same cap as the live history: the newest 50
+        history += retention.load_archived(QRCode, order_by=(retention.archive_for(QRCode).c.timestamp.desc(),), limit=50)
     config = current_app.config['HOMEHUB_CONFIG']
     return render_template('qr.html', qr_img=qr_img, history=history, config=config)
 
@@ -78,8 +86,7 @@ def qr_view():
 def qr_delete(qr_id: int):
     rec = QRCode.query.get_or_404(qr_id)
     user = sanitize_text(request.form.get('user', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == rec.creator:
         try:
             path = os.path.join(STATIC_DIR, rec.filename)
@@ -1,7 +1,10 @@
 from flask import render_template, request, redirect, url_for, current_app, flash, jsonify
 from ..models import db, Recipe
 from ..blueprints import main_bp
+from ..config import get_admin_aliases
 from ..security import sanitize_text, sanitize_html, is_http_url
+from ..tags import filter_by_tags
+from ..etag import conditional
 import json
 
 
@@ -40,8 +43,7 @@ def recipes():
         
         if recipe_id:
             rec = Recipe.query.get_or_404(int(recipe_id))
-            admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-            admin_aliases = {admin_name, 'Administrator', 'admin'}
+            admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
             if creator in admin_aliases or creator == rec.creator:
                 rec.title = title
                 rec.link = link
@@ -59,21 +61,8 @@ def recipes():
             return redirect(url_for('main.recipes'))
     
     # Filter by tags if provided
-    filter_tags = request.args.get('tags')
-    recipes_list = Recipe.query.order_by(Recipe.timestamp.desc()).all()
-    if filter_tags:
-        try:
-            selected = json.loads(filter_tags)
-            if isinstance(selected, list) and selected:
-                def match(item_tags):
-                    try:
-                        arr = json.loads(item_tags or '[]')
-                    except Exception:
-                        arr = []
-                    return any(t in arr for t in selected)
-                recipes_list = [r for r in recipes_list if match(r.tags)]
-        except Exception:
-            pass
+    q = filter_by_tags(Recipe.query, Recipe, request.args.get('tags'))
+    recipes_list = q.order_by(Recipe.timestamp.desc()).all()
     
     # Convert Recipe objects to dictionaries for JSON serialization in template
     recipes_dicts = []
@@ -97,8 +86,7 @@ def recipes():
 def edit_recipe(recipe_id):
     rec = Recipe.query.get_or_404(recipe_id)
     user = sanitize_text(request.args.get('user', ''))
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if not (user in admin_aliases or user == (rec.creator or '')):
         flash('Not allowed to edit recipe.', 'error')
         return redirect(url_for('main.recipes'))
@@ -137,8 +125,7 @@ def edit_recipe(recipe_id):
 def delete_recipe(recipe_id):
     recipe = Recipe.query.get_or_404(recipe_id)
     user = sanitize_text(request.form['user'])
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == recipe.creator:
         db.session.delete(recipe)
         db.session.commit()
@@ -153,8 +140,7 @@ def update_recipe_tags(recipe_id):
     try:
         data = request.get_json(force=True) or {}
         user = sanitize_text(str(data.get('user', '')))
-        admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-        admin_aliases = {admin_name, 'Administrator', 'admin'}
+        admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
         if not (user in admin_aliases or user == (recipe.creator or '')):
             return jsonify({"ok": False, "error": "not allowed"}), 403
         tags = data.get('tags', [])
@@ -172,23 +158,11 @@ def update_recipe_tags(recipe_id):
 
 
 @main_bp.route('/api/recipes', methods=['GET'])
+@conditional('recipe')
 def api_get_recipes():
     """Get recipes with optional tag filtering"""
-    tags = request.args.get('tags')
-    items = Recipe.query.order_by(Recipe.timestamp.desc()).all()
-    if tags:
-        try:
-            sel = json.loads(tags)
-            if isinstance(sel, list) and sel:
-                def match(item_tags):
-                    try:
-                        arr = json.loads(item_tags or '[]')
-                    except Exception:
-                        arr = []
-                    return any(t in arr for t in sel)
-                items = [i for i in items if match(i.tags)]
-        except Exception:
-            pass
+    q = filter_by_tags(Recipe.query, Recipe, request.args.get('tags'))
+    items = q.order_by(Recipe.timestamp.desc()).all()
     
     result = []
     for r in items:
@@ -2,7 +2,11 @@ from flask import render_template, request, redirect, url_for, current_app, json
 from datetime import datetime, timedelta
 from ..models import db, ShoppingItem, GroceryHistory
 from ..blueprints import main_bp
+from ..config import get_admin_aliases
 from ..security import sanitize_text
+from ..tags import filter_by_tags, matches_tag_filter
+from .. import retention
+from ..etag import conditional
 import json
 
 
@@ -30,22 +34,8 @@ def shopping():
         db.session.commit()
         return redirect(url_for('main.shopping'))
     # Filtering by tags (if provided)
-    filter_tags = request.args.get('tags')
-    q = ShoppingItem.query
+    q = filter_by_tags(ShoppingItem.query, ShoppingItem, request.args.get('tags'))
     items = q.order_by(ShoppingItem.checked.asc(), ShoppingItem.timestamp.desc()).all()
-    if filter_tags:
-        try:
-            selected = json.loads(filter_tags)
-            if isinstance(selected, list) and selected:
-                def match(item_tags):
-                    try:
-                        arr = json.loads(item_tags or '[]')
-                    except Exception:
-                        arr = []
-                    return any(t in arr for t in selected)
-                items = [i for i in items if match(i.tags)]
-        except Exception:
-            pass
     cutoff = datetime.utcnow() - timedelta(days=90)
     existing = {i.item.lower() for i in items}
     rows = db.session.execute(db.text("""
@@ -73,8 +63,7 @@ def check_shopping(item_id):
 def delete_shopping(item_id):
     item = ShoppingItem.query.get_or_404(item_id)
     user = sanitize_text(request.form['user'])
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == item.creator:
         db.session.delete(item)
         db.session.commit()
@@ -87,8 +76,7 @@ def update_shopping_tags(item_id):
     try:
         data = request.get_json(force=True) or {}
         user = sanitize_text(str(data.get('user', '')))
-        admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-        admin_aliases = {admin_name, 'Administrator', 'admin'}
+        admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
         if not (user in admin_aliases or user == (item.creator or '')):
             return jsonify({"ok": False, "error": "not allowed"}), 403
         tags = data.get('tags', [])
@@ -107,28 +95,24 @@ def update_shopping_tags(item_id):
 
 
 @main_bp.route('/api/shopping', methods=['GET'])
+@conditional('shopping_item')
 def api_get_shopping():
-    tags = request.args.get('tags')
-    items = ShoppingItem.query.order_by(ShoppingItem.checked.asc(), ShoppingItem.timestamp.desc()).all()
-    if tags:
-        try:
-            sel = json.loads(tags)
-            if isinstance(sel, list) and sel:
-                def match(item_tags):
-                    try:
-                        arr = json.loads(item_tags or '[]')
-                    except Exception:
-                        arr = []
-                    return any(t in arr for t in sel)
-                items = [i for i in items if match(i.tags)]
-        except Exception:
-            pass
+    q = filter_by_tags(ShoppingItem.query, ShoppingItem, request.args.get('tags'))
+    items = q.order_by(ShoppingItem.checked.asc(), ShoppingItem.timestamp.desc()).all()
+    if retention.include_archived():
+        # Archived items are all checked and older than the live ones, so they go last
+        archived = retention.archive_for(ShoppingItem).c
+        items += [
+            i for i in retention.load_archived(ShoppingItem, order_by=(archived.timestamp.desc(),))
+            if matches_tag_filter(i.tags, request.args.get('tags'))
+        ]
     def to_dict(i):
         try:
             tags = json.loads(i.tags or '[]')
         except Exception:
             tags = []
-        return {"id": i.id, "item": i.item, "checked": i.checked, "creator": i.creator, "timestamp": i.timestamp.isoformat(), "tags": tags}
+        extra = {"archived": True} if getattr(i, 'archived', False) else {}
+        return {"id": i.id, "item": i.item, "checked": i.checked, "creator": i.creator, "timestamp": i.timestamp.isoformat(), "tags": tags, **extra}
     return jsonify([to_dict(i) for i in items])
 
 
@@ -138,8 +122,7 @@ def api_update_shopping(item_id):
     try:
         data = request.get_json(force=True) or {}
         user = sanitize_text(str(data.get('user', '')))
-        admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-        admin_aliases = {admin_name, 'Administrator', 'admin'}
+        admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
         if not (user in admin_aliases or user == (item.creator or '')):
             return jsonify({"ok": False, "error": "not allowed"}), 403
         new_item = data.get('item')
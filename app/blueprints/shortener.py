@@ -2,6 +2,7 @@ from flask import render_template, request, redirect, url_for, current_app, flas
 from ..models import db, ShortURL
 from ..utils import generate_short_code
 from ..blueprints import main_bp
+from ..config import get_admin_aliases
 from ..security import sanitize_text, is_http_url
 
 
@@ -39,8 +40,7 @@ def redirect_short(short_code):
 def delete_short(url_id):
     su = ShortURL.query.get_or_404(url_id)
     user = sanitize_text(request.form['user'])
-    admin_name = current_app.config['HOMEHUB_CONFIG'].get('admin_name', 'Administrator')
-    admin_aliases = {admin_name, 'Administrator', 'admin'}
+    admin_aliases = get_admin_aliases(current_app.config['HOMEHUB_CONFIG'])
     if user in admin_aliases or user == su.creator:
         db.session.delete(su)
         db.session.commit()
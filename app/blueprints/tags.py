@@ -0,0 +1,12 @@
+from flask import request, jsonify
+from ..blueprints import main_bp
+from ..tags import ENTITY_ALIASES, tag_counts
+
+
+@main_bp.route('/api/tags', methods=['GET'])
+def api_tag_cloud():
+    """Per-tag counts for shopping items, chores or recipes (?entity=shopping|chores|recipes)."""
+    entity = ENTITY_ALIASES.get((request.args.get('entity') or '').strip().lower())
+    if not entity:
+        return jsonify({"ok": False, "error": "entity must be one of: shopping, chores, recipes"}), 400
+    return jsonify({"ok": True, "entity": entity, "tags": tag_counts(entity)})
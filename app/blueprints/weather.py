@@ -1,11 +1,16 @@
 from flask import jsonify, request, current_app
 import requests
 from ..blueprints import main_bp
+from ..cache import cache_get, cache_set
 from datetime import datetime, timezone
 
 
-# In-memory cache for weather data
-_weather_cache = {}
+# Weather responses are kept in the shared SQLite cache so every worker reuses them
+WEATHER_CACHE_TTL = 900
+
+
+def weather_cache_prefix(lat: float, lon: float) -> str:
+    return f"weather:{lat:.3f},{lon:.3f}|"
 
 
 @main_bp.route('/api/weather', methods=['GET'])
@@ -32,12 +37,11 @@ def weather_proxy():
             return jsonify({'error': 'Invalid coordinate format'}), 400
         
         # Create cache key from coordinates and relevant parameters
-        cache_key = f"{lat:.3f},{lon:.3f}|{params.get('current','')}|{params.get('daily','')}|{params.get('timezone','auto')}"
+        cache_key = f"{weather_cache_prefix(lat, lon)}{params.get('current','')}|{params.get('daily','')}|{params.get('timezone','auto')}"
         
         # Check cache first
-        if cache_key in _weather_cache:
-            cached_data = _weather_cache[cache_key]
-            
+        cached_data = cache_get(cache_key)
+        if cached_data is not None:
             # Use API's timestamp from cached response
             api_time_str = cached_data.get('current', {}).get('time')
             if api_time_str:
@@ -62,7 +66,7 @@ def weather_proxy():
                     age_seconds = (now_utc - api_time_utc).total_seconds()
                     
                     # Cache for 15 minutes (900 seconds)
-                    if 0 <= age_seconds < 900:
+                    if 0 <= age_seconds < WEATHER_CACHE_TTL:
                         current_app.logger.debug(f'Weather cache HIT for {cache_key}, age: {age_seconds:.0f}s')
                         return jsonify(cached_data)
                     else:
@@ -79,17 +83,10 @@ def weather_proxy():
         
         data = response.json()
         
-        # Cache the response using API's timestamp
-        _weather_cache[cache_key] = data
+        # Cache the response; freshness is still judged by the API's timestamp on read
+        cache_set(cache_key, data, WEATHER_CACHE_TTL)
         current_app.logger.debug(f'Weather cache MISS for {cache_key}, fetched fresh data')
         
-        # Limit cache size to prevent memory issues (keep last 100 entries)
-        if len(_weather_cache) > 100:
-            # Remove oldest entries
-            oldest_keys = list(_weather_cache.keys())[:-50]
-            for key in oldest_keys:
-                _weather_cache.pop(key, None)
-        
         return jsonify(data)
         
     except requests.exceptions.Timeout:
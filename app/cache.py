@@ -0,0 +1,109 @@
+"""Small cross-worker cache stored in the ``shared_cache`` SQLite table.
+
+Module-level dicts are per process, so with several gunicorn workers each one
+would refetch the same data. Values here are JSON encoded and expire after a
+TTL; expired rows are pruned opportunistically on writes.
+"""
+import json
+import random
+import time
+
+from sqlalchemy import bindparam
+
+from . import db
+
+# Roughly one write in N also deletes expired rows
+_PRUNE_EVERY = 20
+
+
+def cache_get(key: str):
+    """Return the cached value for ``key`` or None if missing/expired."""
+    row = db.session.execute(
+        db.text("SELECT value, expires_at FROM shared_cache WHERE key=:k"), {'k': key}
+    ).first()
+    if row is None or (row[1] is not None and row[1] <= time.time()):
+        return None
+    try:
+        return json.loads(row[0])
+    except (TypeError, ValueError):
+        return None
+
+
+def cache_get_many(keys) -> dict:
+    """Unexpired cached values for ``keys`` in one query; missing keys are left out."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    rows = db.session.execute(
+        db.text("SELECT key, value FROM shared_cache WHERE key IN :keys AND (expires_at IS NULL OR expires_at > :now)")
+        .bindparams(bindparam('keys', expanding=True)),
+        {'keys': keys, 'now': time.time()},
+    )
+    found = {}
+    for key, value in rows:
+        try:
+            found[key] = json.loads(value)
+        except (TypeError, ValueError):
+            pass
+    return found
+
+
+def cache_get_latest(prefix: str):
+    """Unexpired value of the newest entry whose key starts with ``prefix``, or None."""
+    row = db.session.execute(
+        db.text(
+            "SELECT value FROM shared_cache WHERE key LIKE :p AND (expires_at IS NULL OR expires_at > :now) "
+            "ORDER BY expires_at DESC LIMIT 1"
+        ),
+        {'p': prefix + '%', 'now': time.time()},
+    ).first()
+    try:
+        return json.loads(row[0]) if row else None
+    except (TypeError, ValueError):
+        return None
+
+
+def cache_set(key: str, value, ttl: float, connection=None):
+    cache_set_many({key: value}, ttl, connection)
+
+
+def cache_set_many(values: dict, ttl: float, connection=None):
+    """Store several values in one transaction.
+
+    The write goes through its own connection, so whatever the caller has
+    pending on ``db.session`` is neither committed nor rolled back. Pass
+    ``connection`` to write inside a transaction the caller commits instead;
+    a caller that has already flushed writes holds SQLite's write lock and
+    must do so.
+    """
+    if not values:
+        return
+    if connection is None:
+        with db.engine.begin() as connection:
+            cache_set_many(values, ttl, connection)
+        return
+    now = time.time()
+    connection.execute(
+        db.text(
+            "INSERT INTO shared_cache(key, value, expires_at) VALUES(:k, :v, :e) "
+            "ON CONFLICT(key) DO UPDATE SET value=excluded.value, expires_at=excluded.expires_at"
+        ),
+        [{'k': key, 'v': json.dumps(value), 'e': now + ttl} for key, value in values.items()],
+    )
+    if random.randrange(_PRUNE_EVERY) == 0:
+        cache_prune(now, connection)
+
+
+def cache_delete(key: str):
+    with db.engine.begin() as connection:
+        connection.execute(db.text("DELETE FROM shared_cache WHERE key=:k"), {'k': key})
+
+
+def cache_prune(now: float | None = None, connection=None):
+    if connection is None:
+        with db.engine.begin() as connection:
+            cache_prune(now, connection)
+        return
+    connection.execute(
+        db.text("DELETE FROM shared_cache WHERE expires_at <= :now"), {'now': now or time.time()}
+    )
@@ -0,0 +1,98 @@
+"""Delta sync for reminders: cursors and deletion tombstones.
+
+``/api/reminders/changes?since=<cursor>`` returns reminders and recurring
+rules whose ``updated_at`` is past the cursor plus the tombstones written
+when rows were deleted. Row timestamps are taken at flush time, before the
+commit, so a reader can briefly miss a write whose stamp is older than its
+cursor; the query therefore reaches back ``OVERLAP`` and clients apply the
+(idempotent) results as upserts.
+
+Changes come oldest first, at most ``limit`` rows per call. A truncated
+response sets ``has_more`` and returns a page cursor
+(``<timestamp>~<stream>~<id>``) that resumes right after its last row; pass
+it back until ``has_more`` is false.
+
+ORM deletes of tracked rows get a tombstone from the ``after_flush`` hook.
+Bulk ``query.delete()`` calls bypass it and call ``record_deletions``
+themselves (see ``_bulk_delete_reminders``).
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import db
+
+TRACKED = {'reminder', 'recurring_reminder'}
+OVERLAP = timedelta(seconds=5)
+TOMBSTONE_DAYS = 60
+CURSOR_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+PAGE_SIZE = 500
+MAX_PAGE_SIZE = 2000
+# Change streams in page order: reminders, recurring rules, tombstones
+STREAMS = 3
+
+
+def new_cursor() -> str:
+    return datetime.utcnow().strftime(CURSOR_FORMAT)
+
+
+def parse_cursor(value) -> datetime | None:
+    try:
+        return datetime.strptime(value, CURSOR_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def page_cursor(at: datetime, stream: int, row_id: int) -> str:
+    """Cursor that resumes after row ``row_id`` of ``stream`` stamped ``at``."""
+    return f'{at.strftime(CURSOR_FORMAT)}~{stream}~{row_id}'
+
+
+def parse_position(value) -> tuple[datetime, int, int] | None:
+    """``(at, stream, id)`` to resume after; rows must sort strictly later.
+
+    A plain cursor resumes after everything stamped before ``cursor - OVERLAP``.
+    """
+    parts = str(value or '').split('~')
+    at = parse_cursor(parts[0])
+    if at is None:
+        return None
+    if len(parts) == 1:
+        return at - OVERLAP, STREAMS, 0
+    try:
+        stream, row_id = int(parts[1]), int(parts[2])
+    except (IndexError, ValueError):
+        return None
+    if len(parts) != 3 or not 0 <= stream < STREAMS:
+        return None
+    return at, stream, row_id
+
+
+def tombstone_horizon() -> datetime:
+    """Cursors older than this cannot be served: their tombstones are gone."""
+    return datetime.utcnow() - timedelta(days=TOMBSTONE_DAYS)
+
+
+def record_deletions(connection, table: str, rows):
+    """Write tombstones for ``rows`` of (id, date) and prune expired ones."""
+    now = datetime.utcnow()
+    params = [{'t': table, 'id': rid, 'day': day, 'now': now} for rid, day in rows]
+    if not params:
+        return
+    connection.execute(
+        db.text("INSERT INTO deleted_record(table_name, row_id, day, deleted_at) VALUES(:t, :id, :day, :now)"),
+        params,
+    )
+    connection.execute(db.text("DELETE FROM deleted_record WHERE deleted_at < :h"), {'h': tombstone_horizon()})
+
+
+@event.listens_for(Session, 'after_flush')
+def _tombstone_deleted_rows(session, flush_context):
+    by_table = {}
+    for obj in session.deleted:
+        table = obj.__table__.name
+        if table in TRACKED:
+            by_table.setdefault(table, []).append((obj.id, getattr(obj, 'date', None)))
+    for table, rows in by_table.items():
+        record_deletions(session.connection(), table, rows)
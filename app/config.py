@@ -1,10 +1,42 @@
 import yaml
 import os
 import hashlib
+import threading
+import logging
+import time
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 CONFIG_PATH = os.path.join(BASE_DIR, 'config.yml')
 
+logger = logging.getLogger(__name__)
+
+# Parsed config is cached per file version (inode, mtime, size) so requests
+# only pay for a stat() call instead of a YAML parse + password hash.
+_lock = threading.Lock()
+_cache = {'signature': None, 'config': None, 'failed_signature': None}
+# Derived values are computed once per config object (one slot is enough since
+# every request of a given config version shares the same dict). The slot holds
+# one (config, derived) tuple, replaced in a single assignment so a concurrent
+# reader never pairs one config with another's derived values.
+_derived_slot = [(None, None)]
+_watcher = None
+
+# SQLite performance profile; override any key under `database:` in config.yml
+DATABASE_DEFAULTS = {
+    'journal_mode': 'WAL',       # readers no longer block the writer (media worker vs requests)
+    'synchronous': 'NORMAL',     # safe with WAL, far fewer fsyncs than FULL
+    'busy_timeout_ms': 5000,     # wait for locks instead of failing with "database is locked"
+    'cache_size_kib': 16384,
+    'mmap_size_mb': 64,
+    'temp_store': 'MEMORY',
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_timeout': 30,
+    'pool_recycle': -1,
+    'pool_pre_ping': False,
+}
+
+
 def load_config():
     if not os.path.exists(CONFIG_PATH):
         raise FileNotFoundError(f'config.yml not found at {CONFIG_PATH}.')
@@ -51,4 +83,206 @@ def load_config():
     weather.setdefault('timezone', '')
     weather.setdefault('units', 'metric')
     weather.setdefault('view', 'compact')
+    # Database tuning defaults (see DATABASE_DEFAULTS)
+    database = config.setdefault('database', {})
+    if not isinstance(database, dict):
+        database = config['database'] = {}
+    for key, value in DATABASE_DEFAULTS.items():
+        database.setdefault(key, value)
     return config
+
+
+def _file_signature():
+    st = os.stat(CONFIG_PATH)
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def get_config(revalidate: bool = True):
+    """Return the parsed config, re-reading config.yml only when it changed.
+
+    When the file watcher is running it refreshes the cache itself, so callers
+    skip the stat() call entirely. If a changed file fails to parse, the last
+    good config is kept and the broken version is not retried until it changes.
+    """
+    cached = _cache['config']
+    if cached is not None and not revalidate:
+        return cached
+    if cached is not None and _watcher is not None and _watcher.is_alive():
+        return cached
+    try:
+        signature = _file_signature()
+    except FileNotFoundError:
+        if cached is not None:
+            return cached
+        raise FileNotFoundError(f'config.yml not found at {CONFIG_PATH}.')
+    if cached is not None and signature in (_cache['signature'], _cache['failed_signature']):
+        return cached
+    with _lock:
+        if _cache['config'] is not None and signature in (_cache['signature'], _cache['failed_signature']):
+            return _cache['config']
+        if _cache['config'] is None:
+            # First load: let errors propagate like a plain load_config() call
+            _store(load_config(), signature)
+            return _cache['config']
+        _reload(signature)
+        return _cache['config']
+
+
+def _store(config: dict, signature):
+    _cache['config'] = config
+    _cache['signature'] = signature
+    _cache['failed_signature'] = None
+    _derived(config)
+
+
+def _reload(signature):
+    # Caller holds _lock
+    try:
+        config = load_config()
+    except Exception:
+        logger.exception('Failed to reload config.yml; keeping previous version')
+        _cache['failed_signature'] = signature
+        return
+    _store(config, signature)
+
+
+def invalidate_config_cache():
+    with _lock:
+        _cache['config'] = None
+        _cache['signature'] = None
+        _cache['failed_signature'] = None
+
+
+def _derived(config: dict) -> dict:
+    cached_config, cached = _derived_slot[0]
+    if cached_config is config:
+        return cached
+    admin_name = config.get('admin_name', 'Administrator')
+    family = list(dict.fromkeys(config.get('family_members') or []))
+    categories = []
+    rcfg = (config.get('reminders') or {}).get('categories') or []
+    if isinstance(rcfg, list):
+        for entry in rcfg:
+            if not isinstance(entry, dict):
+                continue
+            key = entry.get('key')
+            if not key:
+                continue
+            categories.append({
+                'key': key,
+                'label': entry.get('label') or key,
+                'color': entry.get('color') or None,
+            })
+    derived = {
+        'admin_aliases': frozenset({admin_name, 'Administrator', 'admin'}),
+        'family_members': tuple(family),
+        'family_set': frozenset(family),
+        'reminder_categories': tuple(categories),
+    }
+    _derived_slot[0] = (config, derived)
+    return derived
+
+
+def get_admin_aliases(config: dict) -> frozenset:
+    """Names allowed to act as admin (configured admin name plus built-in aliases)."""
+    return _derived(config)['admin_aliases']
+
+
+def get_family_members(config: dict) -> tuple:
+    """Configured family members, de-duplicated in their configured order."""
+    return _derived(config)['family_members']
+
+
+def get_family_set(config: dict) -> frozenset:
+    return _derived(config)['family_set']
+
+
+def get_reminder_categories(config: dict) -> list:
+    """Valid reminder categories as [{'key', 'label', 'color'}]."""
+    return [dict(c) for c in _derived(config)['reminder_categories']]
+
+
+def get_database_settings(config: dict) -> dict:
+    """Database settings with defaults filled in for keys missing from config."""
+    settings = dict(DATABASE_DEFAULTS)
+    settings.update(config.get('database') or {})
+    return settings
+
+
+class ConfigWatcher(threading.Thread):
+    """Background thread that refreshes the config cache when config.yml changes.
+
+    Uses inotify on Linux (watching the directory, so editors that replace the
+    file and Docker bind mounts are handled) and falls back to polling stat().
+    """
+
+    def __init__(self, poll_interval: float = 2.0):
+        super().__init__(name='homehub-config-watcher', daemon=True)
+        self.poll_interval = poll_interval
+
+    def run(self):
+        try:
+            self._run_inotify()
+        except Exception:
+            logger.info('inotify unavailable; polling config.yml every %.1fs', self.poll_interval)
+            self._run_polling()
+
+    def _refresh(self):
+        try:
+            signature = _file_signature()
+        except OSError:
+            return
+        if signature not in (_cache['signature'], _cache['failed_signature']):
+            with _lock:
+                _reload(signature)
+
+    def _run_polling(self):
+        while True:
+            self._refresh()
+            time.sleep(self.poll_interval)
+
+    def _run_inotify(self):
+        import ctypes
+        import ctypes.util
+        import select
+        import struct
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        mask = 0x002 | 0x004 | 0x008 | 0x080 | 0x100 | 0x200
+        watch_dir = os.path.dirname(CONFIG_PATH).encode()
+        if libc.inotify_add_watch(fd, watch_dir, mask) < 0:
+            os.close(fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed')
+        target = os.path.basename(CONFIG_PATH).encode()
+        header = struct.Struct('iIII')
+        while True:
+            # Periodic wake-up also covers changes inotify cannot see (e.g. some network mounts)
+            ready, _, _ = select.select([fd], [], [], 30.0)
+            if not ready:
+                self._refresh()
+                continue
+            buf = os.read(fd, 64 * 1024)
+            offset = 0
+            touched = False
+            while offset + header.size <= len(buf):
+                _wd, _mask, _cookie, length = header.unpack_from(buf, offset)
+                name = buf[offset + header.size:offset + header.size + length].rstrip(b'\0')
+                offset += header.size + length
+                if name == target:
+                    touched = True
+            if touched:
+                self._refresh()
+
+
+def start_config_watcher(poll_interval: float = 2.0):
+    """Start the config watcher once per process; returns the thread."""
+    global _watcher
+    with _lock:
+        if _watcher is not None and _watcher.is_alive():
+            return _watcher
+        _watcher = ConfigWatcher(poll_interval=poll_interval)
+        _watcher.start()
+        return _watcher
@@ -0,0 +1,92 @@
+"""SQLite connection tuning driven by the ``database:`` section of config.yml.
+
+Pragmas are applied to every pooled DBAPI connection through an engine
+``connect`` hook, so connections opened by request handlers, the media worker
+thread and migrations all share the same profile.
+"""
+import logging
+
+from sqlalchemy import event
+
+from .config import get_database_settings
+
+logger = logging.getLogger(__name__)
+
+_JOURNAL_MODES = {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'}
+_SYNCHRONOUS = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+_TEMP_STORE = {'DEFAULT', 'FILE', 'MEMORY'}
+
+
+def _choice(settings: dict, key: str, allowed: set, default: str) -> str:
+    value = str(settings.get(key) or default).upper()
+    if value not in allowed:
+        logger.warning('Ignoring invalid database.%s=%r; using %s', key, settings.get(key), default)
+        return default
+    return value
+
+
+def _int(settings: dict, key: str, default: int) -> int:
+    try:
+        return int(settings.get(key, default))
+    except (TypeError, ValueError):
+        logger.warning('Ignoring invalid database.%s=%r; using %s', key, settings.get(key), default)
+        return default
+
+
+def build_pragmas(settings: dict) -> list[tuple[str, object]]:
+    """Translate database settings into an ordered list of (pragma, value)."""
+    from .config import DATABASE_DEFAULTS as d
+    return [
+        # busy_timeout first so the journal_mode switch itself waits on locks
+        ('busy_timeout', max(0, _int(settings, 'busy_timeout_ms', d['busy_timeout_ms']))),
+        ('journal_mode', _choice(settings, 'journal_mode', _JOURNAL_MODES, d['journal_mode'])),
+        ('synchronous', _choice(settings, 'synchronous', _SYNCHRONOUS, d['synchronous'])),
+        # Negative cache_size is in KiB rather than pages
+        ('cache_size', -max(0, _int(settings, 'cache_size_kib', d['cache_size_kib']))),
+        ('mmap_size', max(0, _int(settings, 'mmap_size_mb', d['mmap_size_mb'])) * 1024 * 1024),
+        ('temp_store', _choice(settings, 'temp_store', _TEMP_STORE, d['temp_store'])),
+    ]
+
+
+def engine_options(settings: dict, uri: str) -> dict:
+    """Pool options for SQLALCHEMY_ENGINE_OPTIONS (file databases only).
+
+    In-memory SQLite uses a single static connection, which rejects pool sizing.
+    """
+    from .config import DATABASE_DEFAULTS as d
+    if not uri.startswith('sqlite:///') or uri in ('sqlite://', 'sqlite:///:memory:'):
+        return {}
+    return {
+        'pool_size': max(1, _int(settings, 'pool_size', d['pool_size'])),
+        'max_overflow': max(0, _int(settings, 'max_overflow', d['max_overflow'])),
+        'pool_timeout': max(1, _int(settings, 'pool_timeout', d['pool_timeout'])),
+        'pool_recycle': _int(settings, 'pool_recycle', d['pool_recycle']),
+        'pool_pre_ping': bool(settings.get('pool_pre_ping', d['pool_pre_ping'])),
+    }
+
+
+def apply_pragmas(dbapi_conn, pragmas):
+    cur = dbapi_conn.cursor()
+    try:
+        for name, value in pragmas:
+            cur.execute(f'PRAGMA {name}={value}')
+    finally:
+        cur.close()
+
+
+def configure_engine(engine, settings: dict):
+    """Install the connect hook applying the configured pragmas on ``engine``."""
+    pragmas = build_pragmas(settings)
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_conn, _record):
+        apply_pragmas(dbapi_conn, pragmas)
+
+    return pragmas
+
+
+def init_database(app, db):
+    """Called from create_app after db.init_app: wire pragmas onto the engine."""
+    settings = get_database_settings(app.config.get('HOMEHUB_CONFIG') or {})
+    with app.app_context():
+        configure_engine(db.engine, settings)
@@ -0,0 +1,405 @@
+"""Due-reminder notifications, run by the job lease holder.
+
+Stored reminders and the occurrences of recurring rules for the next
+``HORIZON`` are loaded into a hierarchical timer wheel keyed by the minute
+they fall due: their ``time``, or ``reminder_notifications.all_day_time``
+(default 09:00) for reminders without one. Each poll costs a data_version
+probe plus, once a minute, one wheel step. Reminder and rule writes, from
+any worker, are picked up by that probe and applied incrementally: only the
+rows changed since the last poll (``updated_at`` and the delta-sync
+tombstones) are cancelled and rescheduled.
+
+Due events go to the sinks listed under ``reminder_notifications.sinks``:
+
+- ``log``: a log line per event.
+- ``events``: the ``/api/events`` stream (``reminder_due``) and the recent
+  list behind ``/api/reminders/due``.
+- ``webhook``: a JSON POST of ``{"events": [...]}`` to ``webhook_url``.
+
+Delivery is at-least-once. A sink that fails is retried with backoff (only
+that sink) up to ``MAX_ATTEMPTS`` times. A high-water mark in the settings
+table records the minute up to which every event has been delivered; a new
+lease holder reloads from there, delivering what was missed within
+``CATCHUP``. Every event carries a stable ``id`` for receivers to
+de-duplicate.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+
+import requests
+from flask import current_app
+
+from . import db
+from .cache import cache_get, cache_set
+from .changes import OVERLAP
+from .events import publish
+from .jobs import on_lease_tick
+from .models import DeletedRecord, RecurringReminder, Reminder
+from .reminder_rules import CompiledRule, rules_in_window
+from .settings import get_setting, set_setting
+from .versions import bump_versions, get_versions
+
+logger = logging.getLogger(__name__)
+
+TABLES = ('reminder', 'recurring_reminder')
+HORIZON = timedelta(days=2)
+CATCHUP = timedelta(hours=6)
+POLL_SECONDS = 5.0
+MAX_ATTEMPTS = 8
+HWM_SETTING = 'reminder_dispatch_hwm'
+HWM_FORMAT = '%Y-%m-%dT%H:%M'
+RECENT_KEY = 'reminders:due'
+RECENT_LIMIT = 20
+RECENT_TTL = 3600
+EPOCH = datetime(2000, 1, 1)
+
+_sinks = {}
+_state = {'wheel': None, 'versions': None, 'synced_at': None, 'hwm': None, 'loaded_until': None, 'retry': []}
+_last_poll = [0.0]
+
+
+def notification_sink(name: str):
+    """Register ``fn(config, events)``; it should raise when delivery failed."""
+    def register(fn):
+        _sinks[name] = fn
+        return fn
+    return register
+
+
+def to_tick(dt: datetime) -> int:
+    """Whole minutes since ``EPOCH`` (local wall-clock time, like reminder dates)."""
+    return int((dt - EPOCH).total_seconds() // 60)
+
+
+def from_tick(tick: int) -> datetime:
+    return EPOCH + timedelta(minutes=tick)
+
+
+class TimerWheel:
+    """Hierarchical timing wheel with one-minute resolution.
+
+    Levels of 60 one-minute, 24 one-hour and 8 one-day slots reach about a
+    week ahead. A timer sits in the coarsest slot that still separates it
+    from now and is moved down a level when that slot comes round, so
+    ``advance`` touches one slot per minute (plus one cascade per hour and
+    day) however many timers are pending. Scheduling and cancelling are O(1).
+    """
+
+    LEVELS = ((1, 60), (60, 24), (1440, 8))  # (minutes per slot, slots)
+
+    def __init__(self, tick: int):
+        self.tick = tick
+        self.slots = [[{} for _ in range(size)] for _, size in self.LEVELS]
+        self.overdue = {}
+        self.later = {}  # beyond the top level; re-placed at every day boundary
+        self.where = {}  # key -> the dict holding it
+
+    def __len__(self):
+        return len(self.where)
+
+    def __contains__(self, key):
+        return key in self.where
+
+    def keys(self):
+        return list(self.where)
+
+    def get(self, key):
+        slot = self.where.get(key)
+        return slot[key][1] if slot is not None else None
+
+    def schedule(self, key, due: int, item):
+        self.cancel(key)
+        self._place(key, due, item)
+
+    def cancel(self, key):
+        slot = self.where.pop(key, None)
+        if slot is not None:
+            return slot.pop(key)[1]
+        return None
+
+    def _place(self, key, due: int, item):
+        if due <= self.tick:
+            slot = self.overdue
+        elif due - self.tick < 60:
+            slot = self.slots[0][due % 60]
+        elif due // 60 - self.tick // 60 <= 24:
+            slot = self.slots[1][(due // 60) % 24]
+        elif due // 1440 - self.tick // 1440 <= 8:
+            slot = self.slots[2][(due // 1440) % 8]
+        else:
+            slot = self.later
+        slot[key] = (due, item)
+        self.where[key] = slot
+
+    def _take(self, slot: dict) -> list:
+        entries = list(slot.items())
+        slot.clear()
+        for key, _ in entries:
+            del self.where[key]
+        return entries
+
+    def _cascade(self, slot: dict):
+        for key, (due, item) in self._take(slot):
+            self._place(key, due, item)
+
+    def advance(self, to_tick: int) -> list:
+        """Step the wheel to ``to_tick``; returns ``(due, key, item)`` for every timer that came due."""
+        fired = []
+        while True:
+            fired += [(due, key, item) for key, (due, item) in self._take(self.overdue)]
+            if self.tick >= to_tick:
+                break
+            self.tick += 1
+            if self.tick % 1440 == 0:
+                self._cascade(self.slots[2][(self.tick // 1440) % 8])
+                self._cascade(self.later)
+            if self.tick % 60 == 0:
+                self._cascade(self.slots[1][(self.tick // 60) % 24])
+            fired += [(due, key, item) for key, (due, item) in self._take(self.slots[0][self.tick % 60])]
+        fired.sort(key=lambda entry: entry[0])
+        return fired
+
+
+def configured_sinks(config: dict) -> list[str]:
+    names = (config.get('reminder_notifications') or {}).get('sinks') or []
+    return [n for n in names if n in _sinks]
+
+
+def _all_day_minutes(config: dict) -> int:
+    value = (config.get('reminder_notifications') or {}).get('all_day_time') or '09:00'
+    try:
+        t = datetime.strptime(str(value), '%H:%M')
+    except ValueError:
+        t = datetime.strptime('09:00', '%H:%M')
+    return t.hour * 60 + t.minute
+
+
+def _due_tick(day, time_value, all_day: int) -> int:
+    minutes = all_day
+    if time_value:
+        try:
+            t = datetime.strptime(time_value, '%H:%M')
+            minutes = t.hour * 60 + t.minute
+        except ValueError:
+            pass
+    return to_tick(datetime.combine(day, datetime.min.time())) + minutes
+
+
+def _event(key, source, day, due: int) -> dict:
+    due_at = from_tick(due).strftime(HWM_FORMAT)
+    return {
+        # Stable across redeliveries, new when the reminder moves
+        'id': ':'.join(str(part) for part in key) + '@' + due_at,
+        'reminder_id': source.id if key[0] == 'reminder' else None,
+        'recurring_id': getattr(source, 'recurring_id', None) if key[0] == 'reminder' else source.id,
+        'title': source.title,
+        'description': source.description or '',
+        'creator': source.creator or '',
+        'category': source.category,
+        'date': day.strftime('%Y-%m-%d'),
+        'time': source.time,
+        'due_at': due_at,
+    }
+
+
+def _schedule_reminder(wheel, r: Reminder, all_day: int, floor: int | None = None):
+    key = ('reminder', r.id)
+    due = _due_tick(r.date, r.time, all_day)
+    if max(_state['hwm'], floor or 0) < due <= _state['loaded_until']:
+        wheel.schedule(key, due, _event(key, r, r.date, due))
+    if r.recurring_id is not None:
+        # A stored reminder replaces its rule's occurrence on that day
+        wheel.cancel(('rule', r.recurring_id, r.date.isoformat()))
+
+
+def _schedule_rule(wheel, rule, dates, overrides, all_day: int, floor: int | None = None):
+    for day in dates:
+        if (rule.id, day) in overrides:
+            continue
+        key = ('rule', rule.id, day.isoformat())
+        due = _due_tick(day, rule.time, all_day)
+        if max(_state['hwm'], floor or 0) < due <= _state['loaded_until']:
+            wheel.schedule(key, due, _event(key, rule, day, due))
+
+
+def _load(config: dict, start: int, end: int):
+    """Schedule everything due in ``(start, end]`` ticks."""
+    wheel, all_day = _state['wheel'], _all_day_minutes(config)
+    first, last = from_tick(start).date(), from_tick(end).date()
+    stored = Reminder.query.filter(Reminder.date >= first, Reminder.date <= last).all()
+    overrides = {(r.recurring_id, r.date) for r in stored if r.recurring_id is not None}
+    for r in stored:
+        _schedule_reminder(wheel, r, all_day, start)
+    for rule, dates in rules_in_window(first, last):
+        _schedule_rule(wheel, rule, dates, overrides, all_day, start)
+
+
+def _window_dates():
+    return from_tick(_state['hwm']).date(), from_tick(_state['loaded_until']).date()
+
+
+def _reschedule_rules(config: dict, rule_ids: set):
+    wheel, all_day = _state['wheel'], _all_day_minutes(config)
+    for key in wheel.keys():
+        if key[0] == 'rule' and key[1] in rule_ids:
+            wheel.cancel(key)
+    first, last = _window_dates()
+    overrides = {
+        (rid, day) for rid, day in db.session.query(Reminder.recurring_id, Reminder.date)
+        .filter(Reminder.recurring_id.in_(rule_ids), Reminder.date >= first, Reminder.date <= last)
+    }
+    for rr in RecurringReminder.query.filter(RecurringReminder.id.in_(rule_ids)):
+        rule = CompiledRule(rr)
+        _schedule_rule(wheel, rule, rule.between(first, last), overrides, all_day)
+
+
+def _sync_changes(config: dict, now_utc: datetime):
+    """Reschedule the reminders and rules written since the last poll."""
+    wheel, all_day = _state['wheel'], _all_day_minutes(config)
+    since = _state['synced_at'] - OVERLAP
+    rules = set()
+    deleted = DeletedRecord.query.filter(DeletedRecord.deleted_at > since, DeletedRecord.table_name.in_(TABLES))
+    for tomb in deleted:
+        if tomb.table_name == 'recurring_reminder':
+            rules.add(tomb.row_id)
+            continue
+        item = wheel.cancel(('reminder', tomb.row_id))
+        if item and item['recurring_id'] is not None:
+            rules.add(item['recurring_id'])  # its rule's occurrence comes back
+    for r in Reminder.query.filter(Reminder.updated_at > since):
+        old = wheel.cancel(('reminder', r.id))
+        if old and old['recurring_id'] is not None and old['date'] != r.date.isoformat():
+            rules.add(old['recurring_id'])
+        _schedule_reminder(wheel, r, all_day)
+    rules.update(rid for (rid,) in db.session.query(RecurringReminder.id).filter(RecurringReminder.updated_at > since))
+    if rules:
+        _reschedule_rules(config, rules)
+    _state['synced_at'] = now_utc
+
+
+def _rebuild(config: dict, now: datetime, now_utc: datetime):
+    stored = get_setting(HWM_SETTING)
+    floor = now - CATCHUP
+    try:
+        hwm = max(datetime.strptime(stored, HWM_FORMAT), floor) if stored else now - timedelta(minutes=1)
+    except ValueError:
+        hwm = floor
+    _state.update(
+        wheel=TimerWheel(to_tick(now)), hwm=to_tick(hwm), loaded_until=to_tick(now + HORIZON),
+        synced_at=now_utc, retry=[],
+    )
+    _load(config, _state['hwm'], _state['loaded_until'])
+
+
+def _deliver(config: dict, deliveries: list, now: datetime):
+    names = configured_sinks(config)
+    for name in names:
+        batch = [d for d in deliveries if name in d['sinks']]
+        if not batch:
+            continue
+        try:
+            _sinks[name](config, [d['event'] for d in batch])
+        except Exception:
+            logger.warning('Reminder sink %s failed; will retry', name, exc_info=True)
+            continue
+        for d in batch:
+            d['sinks'].discard(name)
+    retry = []
+    for d in deliveries:
+        if not d['sinks']:
+            continue
+        d['attempts'] += 1
+        if d['attempts'] >= MAX_ATTEMPTS:
+            logger.error('Giving up on reminder %s for sinks %s', d['event']['id'], sorted(d['sinks']))
+            continue
+        d['next_at'] = now + timedelta(minutes=min(30, 2 ** (d['attempts'] - 1)))
+        retry.append(d)
+    return retry
+
+
+def dispatch(config: dict, now: datetime | None = None, rebuild: bool = False) -> list[dict]:
+    """Deliver whatever came due; returns the events handed to the sinks."""
+    now = (now or datetime.now()).replace(second=0, microsecond=0)
+    now_utc = datetime.utcnow()
+    wheel = _state['wheel']
+    versions = get_versions(TABLES)
+    if rebuild or wheel is None or to_tick(now) - wheel.tick > 60:
+        _rebuild(config, now, now_utc)
+    elif versions != _state['versions']:
+        _sync_changes(config, now_utc)
+    _state['versions'] = versions
+    wheel = _state['wheel']
+    horizon = to_tick(now + HORIZON)
+    if horizon - _state['loaded_until'] >= 60:
+        start, _state['loaded_until'] = _state['loaded_until'], horizon
+        _load(config, start, horizon)
+
+    deliveries = [
+        {'event': item, 'due': due, 'sinks': set(configured_sinks(config)), 'attempts': 0}
+        for due, _, item in wheel.advance(to_tick(now))
+    ]
+    ready = [d for d in _state['retry'] if d['next_at'] <= now]
+    waiting = [d for d in _state['retry'] if d['next_at'] > now]
+    _state['retry'] = waiting + _deliver(config, ready + deliveries, now)
+
+    # Everything up to the high-water mark has reached every sink
+    pending = [d['due'] for d in _state['retry']]
+    _state['hwm'] = min([to_tick(now)] + [due - 1 for due in pending])
+    if ready or deliveries:
+        # Idle minutes need no write: nothing between the stored mark and now is pending
+        set_setting(HWM_SETTING, from_tick(_state['hwm']).strftime(HWM_FORMAT))
+    return [d['event'] for d in deliveries]
+
+
+def reset():
+    """Forget the in-memory schedule; the next dispatch reloads it."""
+    _state.update(wheel=None, versions=None, retry=[])
+
+
+@on_lease_tick
+def _dispatch_tick(became_owner: bool):
+    config = current_app.config['HOMEHUB_CONFIG']
+    if not configured_sinks(config):
+        if _state['wheel'] is not None:
+            reset()
+        return
+    if not became_owner and time.monotonic() - _last_poll[0] < POLL_SECONDS:
+        return
+    _last_poll[0] = time.monotonic()
+    dispatch(config, rebuild=became_owner)
+
+
+@notification_sink('log')
+def _log_sink(config: dict, events: list[dict]):
+    for ev in events:
+        logger.info('Reminder due: %s (%s)', ev['title'], ev['due_at'])
+
+
+@notification_sink('events')
+def _events_sink(config: dict, events: list[dict]):
+    # Shared cache + version bump reach clients connected to any worker
+    recent = (cache_get(RECENT_KEY) or []) + events
+    # One transaction of its own: the list and its version change together and
+    # nothing pending on the dispatcher's session is committed along with them
+    with db.engine.begin() as connection:
+        cache_set(RECENT_KEY, recent[-RECENT_LIMIT:], RECENT_TTL, connection)
+        bump_versions(connection, ['reminder_due'])
+        version = connection.execute(
+            db.text("SELECT version FROM data_version WHERE table_name='reminder_due'")
+        ).scalar()
+    publish([{'entity': 'reminder_due', 'id': ev['id'], 'op': 'due', 'version': version} for ev in events])
+
+
+@notification_sink('webhook')
+def _webhook_sink(config: dict, events: list[dict]):
+    url = (config.get('reminder_notifications') or {}).get('webhook_url')
+    if not url:
+        raise RuntimeError('reminder_notifications.webhook_url is not set')
+    response = requests.post(url, json={'events': events}, timeout=5)
+    response.raise_for_status()
+
+
+def recent_due() -> list[dict]:
+    """Events recently delivered to the ``events`` sink, oldest first."""
+    return cache_get(RECENT_KEY) or []
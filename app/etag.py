@@ -0,0 +1,70 @@
+"""Conditional GET support for the JSON APIs and feeds.
+
+``@conditional('reminder', 'recurring_reminder')`` gives a view a weak ETag
+derived from the endpoint, its query args, today's date (several views
+default to, or materialize up to, today) and the data versions of the tables
+it reads, plus a Last-Modified from the latest write to those tables. Views
+whose output also changes with the clock pass ``changed_at``, a callable
+returning the latest such change (naive UTC, or None), and it is folded into
+both validators. A
+request whose ``If-None-Match`` (or, without one, ``If-Modified-Since``)
+matches gets a 304 before the view runs any other query.
+"""
+import hashlib
+from datetime import date, datetime, timezone
+from functools import wraps
+
+from flask import make_response, request
+
+from .versions import get_version_state
+
+
+def compute_etag(tables, changed_at=None) -> tuple[str, datetime]:
+    """(ETag, Last-Modified) for the current request over ``tables``."""
+    versions, updated_at = get_version_state(tables)
+    moment = changed_at() if changed_at else None
+    key = '|'.join([
+        request.endpoint or '',
+        '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True))),
+        date.today().isoformat(),
+        ','.join(f'{t}:{v}' for t, v in sorted(versions.items())),
+        moment.isoformat() if moment else '',
+    ])
+    # Responses also change at local midnight (today-relative defaults and windows)
+    last_modified = datetime.combine(date.today(), datetime.min.time()).astimezone(timezone.utc)
+    if updated_at is not None:
+        last_modified = max(last_modified, updated_at.replace(tzinfo=timezone.utc))
+    if moment is not None:
+        last_modified = max(last_modified, moment.replace(tzinfo=timezone.utc))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:24], last_modified.replace(microsecond=0)
+
+
+def _not_modified(etag: str, last_modified: datetime) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return since is not None and last_modified <= since
+
+
+def conditional(*tables, changed_at=None):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+            etag, last_modified = compute_etag(tables, changed_at)
+            if _not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                # Recomputed after the view: it may have materialized recurring rows
+                etag, last_modified = compute_etag(tables, changed_at)
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            # Let clients keep the body but always revalidate
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,232 @@
+"""In-process pub/sub bus behind the ``/api/events`` Server-Sent Events stream.
+
+Committed ORM writes are published as compact events::
+
+    {"entity": "shopping_item", "id": 12, "op": "update", "version": 41}
+
+``version`` is the table's ``data_version`` counter after the write. Rows are
+collected in ``after_flush`` and published in ``after_commit``, so a rolled
+back transaction publishes nothing. ORM bulk ``query.update()/delete()``
+calls publish one ``op: "change"`` event without an id. Nothing is collected
+while no client is subscribed.
+
+Every subscriber has a bounded queue. A client that falls ``QUEUE_SIZE``
+events behind does not get to hold memory: its backlog is dropped and it
+receives a single ``op: "resync"`` event instead. Streams send a comment
+heartbeat every ``HEARTBEAT_SECONDS`` (which also detects closed sockets) and
+end after ``STREAM_SECONDS``; EventSource reconnects on its own.
+
+Other gunicorn workers publish to their own bus, so while anyone is
+subscribed a watcher thread polls ``data_version`` every ``POLL_SECONDS``
+and publishes a table-level ``change`` event for counters that moved without
+a local event. Clients should treat any event for an entity as "refetch it".
+
+Each open stream holds a server thread. ``HOMEHUB_EVENTS_MAX_CLIENTS`` caps
+streams per worker (default 8); extra clients get a 503 and retry later.
+"""
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import bindparam, event, inspect, text
+from sqlalchemy.orm import Session
+
+from . import db
+from .versions import UNTRACKED
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 200
+HEARTBEAT_SECONDS = 15.0
+STREAM_SECONDS = 300.0
+POLL_SECONDS = 2.0
+MAX_SUBSCRIBERS = int(os.environ.get('HOMEHUB_EVENTS_MAX_CLIENTS', '8'))
+
+_lock = threading.Lock()
+_subscribers = set()
+_seen = {}  # table -> highest version published by this process
+_ids = itertools.count(1)
+_watcher = None
+
+
+class Subscriber:
+    __slots__ = ('queue', 'overflowed')
+
+    def __init__(self):
+        self.queue = queue.Queue(QUEUE_SIZE)
+        self.overflowed = False
+
+
+def subscribe(app) -> Subscriber | None:
+    """Register a stream; None when this worker is at ``MAX_SUBSCRIBERS``."""
+    global _watcher
+    with _lock:
+        if len(_subscribers) >= MAX_SUBSCRIBERS:
+            return None
+        sub = Subscriber()
+        _subscribers.add(sub)
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch_versions, args=(app,), name='homehub-events', daemon=True)
+            _watcher.start()
+    return sub
+
+
+def unsubscribe(sub: Subscriber):
+    with _lock:
+        _subscribers.discard(sub)
+
+
+def subscriber_count() -> int:
+    return len(_subscribers)
+
+
+def publish(events: list[dict]):
+    if not events:
+        return
+    with _lock:
+        for ev in events:
+            if ev.get('version'):
+                _seen[ev['entity']] = max(_seen.get(ev['entity'], 0), ev['version'])
+        subs = list(_subscribers)
+    for sub in subs:
+        if sub.overflowed:
+            continue
+        for ev in events:
+            try:
+                sub.queue.put_nowait((next(_ids), ev))
+            except queue.Full:
+                # The stream drains the backlog and sends one resync instead
+                sub.overflowed = True
+                break
+
+
+def _format(event_id: int, payload: dict) -> str:
+    return f'id: {event_id}\ndata: {json.dumps(payload, separators=(",", ":"))}\n\n'
+
+
+def stream(sub: Subscriber):
+    """SSE body for ``sub``; unsubscribes when the client goes away or the stream ends."""
+    deadline = time.monotonic() + STREAM_SECONDS
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if sub.overflowed:
+                while True:
+                    try:
+                        sub.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                sub.overflowed = False
+                yield _format(next(_ids), {'op': 'resync'})
+                continue
+            try:
+                event_id, payload = sub.queue.get(timeout=min(HEARTBEAT_SECONDS, remaining))
+            except queue.Empty:
+                yield ': ping\n\n'
+                continue
+            yield _format(event_id, payload)
+    finally:
+        unsubscribe(sub)
+
+
+def _read_versions(connection, tables) -> dict:
+    rows = connection.execute(
+        text("SELECT table_name, version FROM data_version WHERE table_name IN :names")
+        .bindparams(bindparam('names', expanding=True)),
+        {'names': sorted(tables)},
+    )
+    return dict(rows.all())
+
+
+def _row_id(obj):
+    # Not identity: new rows only get their identity key once the flush completes
+    key = inspect(obj).mapper.primary_key_from_instance(obj)
+    return key[0] if len(key) == 1 else list(key)
+
+
+def _queue_events(session, events: list[dict]):
+    versions = _read_versions(session.connection(), {ev['entity'] for ev in events})
+    for ev in events:
+        ev['version'] = versions.get(ev['entity'], 0)
+    session.info.setdefault('homehub_events', []).extend(events)
+
+
+# Registered after app.versions, so the counters read here already include this flush
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_rows(session, flush_context):
+    if not _subscribers:
+        return
+    events = []
+    for op, objs in (('insert', session.new), ('delete', session.deleted), ('update', session.dirty)):
+        for obj in objs:
+            table = obj.__table__.name
+            if table in UNTRACKED:
+                continue
+            if op == 'update' and not session.is_modified(obj, include_collections=False):
+                continue
+            events.append({'entity': table, 'id': _row_id(obj), 'op': op})
+    if events:
+        _queue_events(session, events)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_write(orm_execute_state):
+    if not _subscribers:
+        return
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.local_table.name not in UNTRACKED:
+        _queue_events(orm_execute_state.session, [{'entity': mapper.local_table.name, 'op': 'change'}])
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_committed(session):
+    publish(session.info.pop('homehub_events', []))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_rolled_back(session):
+    session.info.pop('homehub_events', None)
+
+
+def poll_versions(app, primed: bool = True):
+    """Publish a ``change`` event for each table whose counter moved without a local event."""
+    with app.app_context():
+        try:
+            rows = db.session.execute(text("SELECT table_name, version FROM data_version")).all()
+        finally:
+            db.session.remove()
+    events = []
+    with _lock:
+        for table, version in rows:
+            if table in UNTRACKED:
+                continue
+            if primed and version > _seen.get(table, 0):
+                events.append({'entity': table, 'op': 'change', 'version': version})
+            else:
+                _seen[table] = max(_seen.get(table, 0), version)
+    publish(events)
+
+
+def _watch_versions(app):
+    global _watcher
+    primed = False
+    while True:
+        with _lock:
+            if not _subscribers:
+                _watcher = None
+                return
+        try:
+            poll_versions(app, primed)
+            primed = True
+        except Exception:
+            logger.exception('Event watcher poll failed')
+        time.sleep(POLL_SECONDS)
@@ -0,0 +1,113 @@
+"""iCalendar (RFC 5545) rendering for the reminders feed.
+
+Recurring reminders become a single VEVENT with an RRULE where RFC 5545 and
+HomeHub agree. They disagree for monthly/yearly rules starting after the
+28th: HomeHub clamps to the month end (Jan 31 -> Feb 28), an RRULE skips the
+short months. Those rules are expanded into one VEVENT per occurrence inside
+the feed window instead.
+"""
+from datetime import date, datetime, timedelta
+
+import bleach
+
+RRULE_FREQ = {'day': 'DAILY', 'week': 'WEEKLY', 'month': 'MONTHLY', 'year': 'YEARLY'}
+EVENT_MINUTES = 30
+
+
+def escape_text(value) -> str:
+    text = bleach.clean(str(value or ''), tags=[], strip=True)
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def fold(line: str) -> str:
+    """Content line folded at 75 octets, CRLF terminated."""
+    raw = line.encode('utf-8')
+    if len(raw) <= 75:
+        return line + '\r\n'
+    parts, start, limit = [], 0, 75
+    while start < len(raw):
+        end = min(start + limit, len(raw))
+        # Never split a UTF-8 sequence
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(raw[start:end].decode('utf-8'))
+        start, limit = end, 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _utc_stamp(value: datetime | None) -> str:
+    return (value or datetime.utcnow()).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _valid_time(value) -> str | None:
+    """'HH:MM' when ``value`` is a usable time of day; timed events need one."""
+    try:
+        return datetime.strptime(value, '%H:%M').strftime('%H:%M') if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _start_lines(day: date, time_s: str | None, prop: str = 'DTSTART') -> list[str]:
+    if time_s:
+        return [f'{prop}:{day:%Y%m%d}T{time_s.replace(":", "")}00']
+    return [f'{prop};VALUE=DATE:{day:%Y%m%d}']
+
+
+def _timing_lines(day: date, time_s: str | None) -> list[str]:
+    lines = _start_lines(day, time_s)
+    if time_s:
+        lines.append(f'DURATION:PT{EVENT_MINUTES}M')
+    else:
+        lines.append(f'DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}')
+    return lines
+
+
+def vevent(uid: str, day: date, time_s, title, description=None, category=None, stamp=None,
+           rrule: str | None = None, recurrence_id: date | None = None, recurrence_time=None) -> str:
+    time_s, recurrence_time = _valid_time(time_s), _valid_time(recurrence_time)
+    lines = ['BEGIN:VEVENT', f'UID:{uid}', f'DTSTAMP:{_utc_stamp(stamp)}']
+    if recurrence_id is not None:
+        lines += _start_lines(recurrence_id, recurrence_time, 'RECURRENCE-ID')
+    lines += _timing_lines(day, time_s)
+    if rrule:
+        lines.append(f'RRULE:{rrule}')
+    lines.append(f'SUMMARY:{escape_text(title)}')
+    if description:
+        lines.append(f'DESCRIPTION:{escape_text(description)}')
+    if category:
+        lines.append(f'CATEGORIES:{escape_text(category)}')
+    lines.append('END:VEVENT')
+    return ''.join(fold(line) for line in lines)
+
+
+def rrule_for(recurrence, time_s: str | None) -> str | None:
+    """RRULE for a compiled rule, or None when RFC 5545 semantics would differ."""
+    if recurrence.unit == 'month' and (recurrence.start.day > 28 or recurrence.mode != 'drift'):
+        return None
+    if recurrence.unit == 'month' and recurrence.interval % 12 == 0:
+        parts = ['FREQ=YEARLY', f'INTERVAL={recurrence.interval // 12}']
+    else:
+        parts = [f'FREQ={RRULE_FREQ[recurrence.unit]}', f'INTERVAL={recurrence.interval}']
+    if recurrence.end:
+        # UNTIL must have the same value type as DTSTART
+        if _valid_time(time_s):
+            parts.append(f'UNTIL={recurrence.end:%Y%m%d}T235959')
+        else:
+            parts.append(f'UNTIL={recurrence.end:%Y%m%d}')
+    return ';'.join(parts)
+
+
+def calendar_header(name: str) -> str:
+    return ''.join(fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//HomeHub//Reminders//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}',
+        'REFRESH-INTERVAL;VALUE=DURATION:PT15M',
+    ])
+
+
+CALENDAR_FOOTER = 'END:VCALENDAR\r\n'
@@ -0,0 +1,253 @@
+"""Background jobs owned by exactly one process.
+
+Requests enqueue work as rows in the ``job`` table. Every process starts a
+``JobRunner`` thread, but only the holder of the ``jobs`` row in
+``worker_lease`` runs jobs; the others just retry the lease. If the owner
+dies, its lease expires after ``LEASE_TTL`` seconds, another worker takes
+over, and jobs left ``running`` by the old owner are queued again.
+
+Handlers are registered per job kind with ``@job_handler('kind')`` and are
+called as ``handler(payload)`` inside an app context.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from . import db
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = 'jobs'
+LEASE_TTL = 30.0
+POLL_INTERVAL = 1.0
+# Finished jobs are kept this long for inspection, then deleted
+JOB_RETENTION = timedelta(days=7)
+PRUNE_INTERVAL = 3600.0
+
+_handlers = {}
+_lease_hooks = []
+_runner = None
+_last_prune = [0.0]
+
+
+def job_handler(kind: str):
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def on_lease_tick(fn):
+    """Register ``fn(became_owner)``, called on every runner loop while holding the lease."""
+    _lease_hooks.append(fn)
+    return fn
+
+
+def enqueue(kind: str, payload: dict) -> Job:
+    """Queue a job; commits so the lease holder (possibly another process) sees it."""
+    job = Job(kind=kind, payload=json.dumps(payload), status='pending')
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def process_owner_id() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def acquire_lease(name: str, owner: str, ttl: float = LEASE_TTL, now: float | None = None) -> bool:
+    """Take or renew a lease; True when ``owner`` holds it afterwards."""
+    now = now or time.time()
+    db.session.execute(
+        db.text(
+            "INSERT INTO worker_lease(name, owner, expires_at) VALUES(:n, :o, :e) "
+            "ON CONFLICT(name) DO UPDATE SET owner=excluded.owner, expires_at=excluded.expires_at "
+            "WHERE worker_lease.owner=excluded.owner OR worker_lease.expires_at < :now"
+        ),
+        {'n': name, 'o': owner, 'e': now + ttl, 'now': now},
+    )
+    holder = db.session.execute(
+        db.text("SELECT owner FROM worker_lease WHERE name=:n"), {'n': name}
+    ).scalar()
+    db.session.commit()
+    return holder == owner
+
+
+def release_lease(name: str, owner: str):
+    db.session.execute(
+        db.text("DELETE FROM worker_lease WHERE name=:n AND owner=:o"), {'n': name, 'o': owner}
+    )
+    db.session.commit()
+
+
+def requeue_orphans(owner: str) -> int:
+    """Jobs left running by a previous lease holder go back to pending."""
+    result = db.session.execute(
+        db.text("UPDATE job SET status='pending', owner=NULL WHERE status='running' AND (owner IS NULL OR owner != :o)"),
+        {'o': owner},
+    )
+    db.session.commit()
+    return result.rowcount or 0
+
+
+def claim_next(owner: str) -> Job | None:
+    """Atomically move the oldest pending job to running for ``owner``."""
+    while True:
+        job_id = db.session.execute(
+            db.text("SELECT id FROM job WHERE status='pending' ORDER BY id LIMIT 1")
+        ).scalar()
+        if job_id is None:
+            db.session.commit()
+            return None
+        claimed = db.session.execute(
+            db.text(
+                "UPDATE job SET status='running', owner=:o, started_at=:t, attempts=COALESCE(attempts, 0) + 1 "
+                "WHERE id=:id AND status='pending'"
+            ),
+            {'o': owner, 't': datetime.utcnow(), 'id': job_id},
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id)
+
+
+def run_job(job_id: int):
+    """Execute one claimed job and record the outcome."""
+    job = db.session.get(Job, job_id)
+    handler = _handlers.get(job.kind)
+    try:
+        if handler is None:
+            raise RuntimeError(f'no handler for job kind {job.kind!r}')
+        handler(json.loads(job.payload or '{}'))
+        status, error = 'done', None
+    except Exception as exc:
+        logger.exception('Job %s (%s) failed', job_id, job.kind)
+        status, error = 'error', str(exc)
+    db.session.rollback()
+    db.session.execute(
+        db.text("UPDATE job SET status=:s, error=:e, finished_at=:t WHERE id=:id"),
+        {'s': status, 'e': error, 't': datetime.utcnow(), 'id': job_id},
+    )
+    db.session.commit()
+    return status
+
+
+def prune_finished(older_than: timedelta = JOB_RETENTION) -> int:
+    """Delete done/error jobs that finished more than ``older_than`` ago."""
+    result = db.session.execute(
+        db.text("DELETE FROM job WHERE status IN ('done', 'error') AND finished_at < :t"),
+        {'t': datetime.utcnow() - older_than},
+    )
+    db.session.commit()
+    return result.rowcount or 0
+
+
+@on_lease_tick
+def _prune_tick(became_owner: bool):
+    """Prune finished jobs when the lease is taken and hourly after that."""
+    now = time.time()
+    if became_owner or now - _last_prune[0] > PRUNE_INTERVAL:
+        _last_prune[0] = now
+        pruned = prune_finished()
+        if pruned:
+            logger.info('Pruned %d finished job(s)', pruned)
+
+
+def run_pending_jobs(owner: str | None = None) -> int:
+    """Run queued jobs synchronously in the calling thread (tests, one-off scripts)."""
+    owner = owner or process_owner_id()
+    count = 0
+    while True:
+        job = claim_next(owner)
+        if job is None:
+            return count
+        run_job(job.id)
+        count += 1
+
+
+class JobRunner(threading.Thread):
+    """Per-process thread that runs jobs while this process holds the lease."""
+
+    def __init__(self, app, threads: int = 2):
+        super().__init__(name='homehub-jobs', daemon=True)
+        self.app = app
+        self.owner = process_owner_id()
+        self.threads = max(1, threads)
+        self._stop_event = threading.Event()
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _execute(self, job_id: int):
+        with self.app.app_context():
+            try:
+                run_job(job_id)
+            finally:
+                db.session.remove()
+                with self._lock:
+                    self._active.discard(job_id)
+
+    def run(self):
+        is_owner = False
+        last_renew = 0.0
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='homehub-job') as pool:
+            while not self._stop_event.is_set():
+                with self.app.app_context():
+                    try:
+                        now = time.time()
+                        if not is_owner or now - last_renew > LEASE_TTL / 3:
+                            was_owner = is_owner
+                            is_owner = acquire_lease(LEASE_NAME, self.owner)
+                            last_renew = now
+                            if is_owner and not was_owner:
+                                logger.info('Job runner %s acquired the lease', self.owner)
+                                requeue_orphans(self.owner)
+                            became_owner = is_owner and not was_owner
+                        else:
+                            became_owner = False
+                        if is_owner:
+                            for hook in _lease_hooks:
+                                # A failing hook must not cost the lease or stop the others
+                                try:
+                                    hook(became_owner)
+                                except Exception:
+                                    logger.exception('Lease hook %s failed', getattr(hook, '__qualname__', hook))
+                                    db.session.rollback()
+                        while is_owner:
+                            with self._lock:
+                                if len(self._active) >= self.threads:
+                                    break
+                            job = claim_next(self.owner)
+                            if job is None:
+                                break
+                            with self._lock:
+                                self._active.add(job.id)
+                            pool.submit(self._execute, job.id)
+                    except Exception:
+                        logger.exception('Job runner loop error')
+                        is_owner = False
+                    finally:
+                        db.session.remove()
+                self._stop_event.wait(POLL_INTERVAL)
+            if is_owner:
+                with self.app.app_context():
+                    release_lease(LEASE_NAME, self.owner)
+                    db.session.remove()
+
+
+def start_job_runner(app) -> JobRunner:
+    global _runner
+    if _runner is None or not _runner.is_alive():
+        threads = int(os.environ.get('HOMEHUB_JOB_THREADS', '2') or 2)
+        _runner = JobRunner(app, threads)
+        _runner.start()
+    return _runner
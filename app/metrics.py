@@ -0,0 +1,163 @@
+"""In-process request metrics: latency, SQL time/count, render time, response size.
+
+Installed by create_app. Each ``main`` endpoint gets a fixed set of histograms
+with preallocated buckets, so memory is bounded by the route table and a request
+only adds to a few counters. Exposed in Prometheus text format at
+``/api/_metrics`` (admin only) and summarized per response in a
+``Server-Timing`` header.
+
+Set HOMEHUB_METRICS=0 to disable.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+
+# Bucket upper bounds; the implicit last bucket is +Inf
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024)
+
+# (metric name, help, buckets)
+SERIES = (
+    ('request_duration_seconds', 'Wall time per request', DURATION_BUCKETS),
+    ('sql_duration_seconds', 'Time spent in SQL per request', DURATION_BUCKETS),
+    ('render_duration_seconds', 'Time spent rendering templates per request', DURATION_BUCKETS),
+    ('sql_queries', 'SQL statements per request', QUERY_BUCKETS),
+    ('response_size_bytes', 'Response body size', SIZE_BUCKETS),
+)
+
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_endpoints: dict[str, tuple[Histogram, ...]] = {}
+
+
+def _histograms(endpoint: str) -> tuple[Histogram, ...]:
+    hs = _endpoints.get(endpoint)
+    if hs is None:
+        hs = _endpoints.setdefault(endpoint, tuple(Histogram(b) for _, _, b in SERIES))
+    return hs
+
+
+def record(endpoint: str, wall: float, sql: float, render: float, queries: int, size: int | None):
+    with _lock:
+        hs = _histograms(endpoint)
+        hs[0].observe(wall)
+        hs[1].observe(sql)
+        hs[2].observe(render)
+        hs[3].observe(queries)
+        if size is not None:
+            hs[4].observe(size)
+
+
+def reset():
+    with _lock:
+        _endpoints.clear()
+
+
+def _fmt(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus() -> str:
+    lines = []
+    with _lock:
+        snapshot = {ep: [(list(h.counts), h.total, h.count) for h in hs] for ep, hs in _endpoints.items()}
+    for idx, (name, help_text, bounds) in enumerate(SERIES):
+        metric = 'homehub_' + name
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for endpoint in sorted(snapshot):
+            counts, total, count = snapshot[endpoint][idx]
+            label = endpoint.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, c in zip(bounds + ('+Inf',), counts):
+                cumulative += c
+                lines.append(f'{metric}_bucket{{endpoint="{label}",le="{_fmt(bound)}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{endpoint="{label}"}} {_fmt(total)}')
+            lines.append(f'{metric}_count{{endpoint="{label}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+# -- hooks -------------------------------------------------------------------
+
+# The start time lives on the execution context, which is discarded with the
+# statement: a query that raises leaves nothing behind on the pooled connection.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_metrics_query_start', None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    # Background threads (media worker, scheduler) have no request to charge
+    if has_request_context() and '_metrics_start' in g:
+        g._metrics_sql += elapsed
+        g._metrics_queries += 1
+
+
+def _before_render(sender, template, context, **extra):
+    if '_metrics_start' in g:
+        g._metrics_render_start = time.perf_counter()
+
+
+def _after_render(sender, template, context, **extra):
+    start = g.get('_metrics_render_start')
+    if start is not None:
+        g._metrics_render += time.perf_counter() - start
+        g._metrics_render_start = None
+
+
+def _start_request():
+    g._metrics_start = time.perf_counter()
+    g._metrics_sql = 0.0
+    g._metrics_render = 0.0
+    g._metrics_queries = 0
+
+
+def _finish_request(response):
+    start = g.get('_metrics_start')
+    endpoint = request.endpoint or ''
+    if start is None or not endpoint.startswith('main.'):
+        return response
+    wall = time.perf_counter() - start
+    size = None if response.is_streamed else response.calculate_content_length()
+    record(endpoint, wall, g._metrics_sql, g._metrics_render, g._metrics_queries, size)
+    response.headers['Server-Timing'] = (
+        f'sql;dur={g._metrics_sql * 1000:.1f};desc="{g._metrics_queries} queries", '
+        f'render;dur={g._metrics_render * 1000:.1f}, '
+        f'total;dur={wall * 1000:.1f}'
+    )
+    return response
+
+
+def init_metrics(app, db):
+    """Register request, SQL and template hooks on ``app`` and its engine."""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
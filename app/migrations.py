@@ -0,0 +1,254 @@
+"""Versioned schema migrations for the SQLite database.
+
+Applied versions are recorded in a ``schema_version`` table. At boot
+``run_migrations`` does a single query when the schema is already current;
+otherwise it applies the pending steps in order, each in its own
+``BEGIN IMMEDIATE`` transaction together with its version row. pysqlite would
+commit ahead of every DDL statement on its own, so the transaction is opened
+explicitly: a step that fails leaves nothing behind. The write lock is taken
+before the version is re-read, so two processes booting together apply each
+step once; the second just sees it recorded. Steps are also written to be
+idempotent (they check for existing columns/tables) so a database upgraded by
+the old ad-hoc probing code can be migrated safely.
+
+Run ahead of a deploy with ``flask --app wsgi migrate``.
+"""
+import logging
+from contextlib import contextmanager
+
+import click
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from . import db
+
+logger = logging.getLogger(__name__)
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+def _table_exists(conn, table: str) -> bool:
+    row = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:t"), {'t': table}
+    ).first()
+    return row is not None
+
+
+def _columns(conn, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def _add_column(conn, table: str, column: str, type_spec: str, backfill=None):
+    """Add a column if missing; optionally fill NULLs in the new column."""
+    if column in _columns(conn, table):
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {type_spec}"))
+    if backfill is not None:
+        conn.execute(text(f"UPDATE {table} SET {column}=:v WHERE {column} IS NULL"), {'v': backfill})
+    return True
+
+
+def _m001_baseline(conn):
+    """Baseline schema: all model tables plus columns added by earlier releases."""
+    from . import models  # noqa: F401 ensures model metadata is registered
+    db.metadata.create_all(conn)
+    # Columns introduced after the first releases (older databases lack them)
+    _add_column(conn, 'chore', 'done', 'INTEGER DEFAULT 0')
+    _add_column(conn, 'chore', 'due_date', 'DATE')
+    _add_column(conn, 'chore', 'recurring_id', 'INTEGER')
+    _add_column(conn, 'chore', 'tags', "TEXT DEFAULT '[]'")
+    _add_column(conn, 'shopping_item', 'tags', "TEXT DEFAULT '[]'")
+    _add_column(conn, 'recipe', 'tags', "TEXT DEFAULT '[]'")
+    _add_column(conn, 'media', 'status', "TEXT DEFAULT 'done'")
+    _add_column(conn, 'media', 'progress', 'TEXT')
+    _add_column(conn, 'reminder', 'category', 'TEXT')
+    _add_column(conn, 'reminder', 'color', 'TEXT')
+    _add_column(conn, 'reminder', 'updated_at', 'TIMESTAMP')
+    _add_column(conn, 'reminder', 'time', 'TEXT')
+    _add_column(conn, 'reminder', 'recurring_id', 'INTEGER')
+    _add_column(conn, 'recurring_expense', 'monthly_mode', 'TEXT', 'day_of_month')
+    _add_column(conn, 'recurring_expense', 'category', 'TEXT')
+    _add_column(conn, 'recurring_expense', 'effective_from', 'DATE')
+    _add_column(conn, 'qr_code', 'original_input', 'TEXT')
+    _add_column(conn, 'recurring_reminder', 'interval', 'INTEGER', 1)
+    # Map legacy frequency before defaulting, so weekly/monthly rules keep their unit
+    _add_column(conn, 'recurring_reminder', 'unit', 'TEXT')
+    conn.execute(text("UPDATE recurring_reminder SET unit='day' WHERE (unit IS NULL OR unit='') AND frequency='daily'"))
+    conn.execute(text("UPDATE recurring_reminder SET unit='week' WHERE (unit IS NULL OR unit='') AND frequency='weekly'"))
+    conn.execute(text("UPDATE recurring_reminder SET unit='month' WHERE (unit IS NULL OR unit='') AND frequency='monthly'"))
+    conn.execute(text("UPDATE recurring_reminder SET unit='day' WHERE unit IS NULL OR unit=''"))
+    # Key/value settings (currency, expense categories, homepage toggles)
+    conn.execute(text("CREATE TABLE IF NOT EXISTS app_setting (key TEXT PRIMARY KEY, value TEXT)"))
+
+
+def _create_indexes(conn, table: str, names: list[str]):
+    """Create the named indexes declared on a model table, if missing."""
+    indexes = {ix.name: ix for ix in db.metadata.tables[table].indexes}
+    for name in names:
+        indexes[name].create(conn, checkfirst=True)
+
+
+def _m002_hot_query_indexes(conn):
+    """Indexes for date-range, recurring probe and name lookups."""
+    from . import models  # noqa: F401
+    _create_indexes(conn, 'reminder', ['ix_reminder_date'])
+    _create_indexes(conn, 'expense_entry', ['ix_expense_entry_date'])
+    # Replaced by the unique ux_expense_entry_recurring_date in migration 9
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_expense_entry_recurring_date ON expense_entry (recurring_id, date)"))
+    _create_indexes(conn, 'chore', ['ix_chore_recurring_id', 'ix_chore_done_due_date'])
+    _create_indexes(conn, 'grocery_history', ['ix_grocery_history_timestamp_item'])
+    _create_indexes(conn, 'home_status', ['ix_home_status_name'])
+    _create_indexes(conn, 'member_status', ['ix_member_status_name'])
+    _create_indexes(conn, 'expiry_item', ['ix_expiry_item_expiry_date'])
+
+
+def _m003_item_tag_index(conn):
+    """Normalized tag table, backfilled from the JSON tags columns."""
+    from .models import ItemTag
+    from .tags import rebuild_tag_index
+    ItemTag.__table__.create(conn, checkfirst=True)
+    rebuild_tag_index(conn)
+
+
+def _m004_multi_worker_tables(conn):
+    """Shared cache, worker lease and job queue for multi-worker deployments."""
+    from .models import Job, SharedCache, WorkerLease
+    for model in (SharedCache, WorkerLease, Job):
+        model.__table__.create(conn, checkfirst=True)
+
+
+def _m005_data_version(conn):
+    """Per-table change counters used for conditional GETs."""
+    from .models import DataVersion
+    DataVersion.__table__.create(conn, checkfirst=True)
+
+
+def _m006_reminder_changes(conn):
+    """updated_at on recurring rules and deletion tombstones for /api/reminders/changes."""
+    from .models import DeletedRecord
+    _add_column(conn, 'recurring_reminder', 'updated_at', 'TIMESTAMP')
+    conn.execute(text("UPDATE recurring_reminder SET updated_at=timestamp WHERE updated_at IS NULL"))
+    _create_indexes(conn, 'reminder', ['ix_reminder_updated_at'])
+    _create_indexes(conn, 'recurring_reminder', ['ix_recurring_reminder_updated_at'])
+    DeletedRecord.__table__.create(conn, checkfirst=True)
+
+
+def _m007_presence_heartbeat(conn):
+    """Device heartbeat time on who-is-home statuses."""
+    _add_column(conn, 'home_status', 'heartbeat_at', 'TIMESTAMP')
+
+
+def _m008_archive_tables(conn):
+    """Archive tables that retention moves stale rows into."""
+    from .models import chore_archive, media_archive, qr_code_archive, reminder_archive, shopping_item_archive
+    for table in (reminder_archive, chore_archive, shopping_item_archive, qr_code_archive, media_archive):
+        table.create(conn, checkfirst=True)
+
+
+def _m009_unique_recurring_expense_entries(conn):
+    """One generated expense entry per rule and date (drops duplicates from racing generators)."""
+    from . import models  # noqa: F401
+    conn.execute(text(
+        "DELETE FROM expense_entry WHERE recurring_id IS NOT NULL AND id NOT IN "
+        "(SELECT MIN(id) FROM expense_entry WHERE recurring_id IS NOT NULL GROUP BY recurring_id, date)"
+    ))
+    _create_indexes(conn, 'expense_entry', ['ux_expense_entry_recurring_date'])
+    conn.execute(text("DROP INDEX IF EXISTS ix_expense_entry_recurring_date"))
+
+
+# Ordered list of (version, description, step). Append only; never renumber.
+MIGRATIONS = [
+    (1, 'baseline schema and legacy columns', _m001_baseline),
+    (2, 'indexes for hot query columns', _m002_hot_query_indexes),
+    (3, 'item_tag table for SQL tag filters', _m003_item_tag_index),
+    (4, 'shared cache, worker lease and job queue', _m004_multi_worker_tables),
+    (5, 'data_version change counters', _m005_data_version),
+    (6, 'reminder change tracking and tombstones', _m006_reminder_changes),
+    (7, 'presence heartbeat column', _m007_presence_heartbeat),
+    (8, 'archive tables for retention', _m008_archive_tables),
+    (9, 'unique generated expense entries', _m009_unique_recurring_expense_entries),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn) -> int | None:
+    """Highest applied version, or None if the schema_version table is missing."""
+    try:
+        return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+    except OperationalError:
+        return None
+
+
+def pending_migrations(conn) -> list[tuple]:
+    version = current_version(conn) or 0
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+@contextmanager
+def _write_transaction(engine):
+    """Connection inside ``BEGIN IMMEDIATE``, committed or rolled back as a whole (DDL included)."""
+    with engine.connect() as conn:
+        # Take transaction control away from pysqlite, which commits before DDL
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.exec_driver_sql('ROLLBACK')
+            raise
+        conn.exec_driver_sql('COMMIT')
+
+
+def run_migrations(engine=None) -> list[int]:
+    """Apply pending migrations; returns the versions applied (empty when current)."""
+    engine = engine or db.engine
+    with engine.connect() as conn:
+        version = current_version(conn)
+    if version is not None and version >= LATEST_VERSION:
+        return []
+    with _write_transaction(engine) as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "version INTEGER PRIMARY KEY, description TEXT, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        ))
+    applied = []
+    for number, description, step in MIGRATIONS:
+        with _write_transaction(engine) as conn:
+            # Re-read under the write lock: another process may have applied it meanwhile
+            if (current_version(conn) or 0) >= number:
+                continue
+            try:
+                step(conn)
+            except Exception as exc:
+                raise MigrationError(f'Migration {number} ({description}) failed: {exc}') from exc
+            conn.execute(
+                text("INSERT INTO schema_version(version, description) VALUES(:v, :d)"),
+                {'v': number, 'd': description},
+            )
+        logger.info('Applied schema migration %s: %s', number, description)
+        applied.append(number)
+    return applied
+
+
+def register_cli(app):
+    @app.cli.command('migrate')
+    @click.option('--check', is_flag=True, help='Only report pending migrations; exit 1 if any.')
+    def migrate_command(check):
+        """Apply pending database schema migrations."""
+        if check:
+            with db.engine.connect() as conn:
+                pending = pending_migrations(conn)
+            for number, description, _ in pending:
+                click.echo(f'pending {number}: {description}')
+            if pending:
+                raise SystemExit(1)
+            click.echo(f'Schema is current (version {LATEST_VERSION}).')
+            return
+        applied = run_migrations()
+        if applied:
+            click.echo('Applied migrations: ' + ', '.join(str(v) for v in applied))
+        else:
+            click.echo(f'Schema is current (version {LATEST_VERSION}).')
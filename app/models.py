@@ -40,6 +40,8 @@ class ShoppingItem(db.Model):
     tags = db.Column(db.Text, default='[]')
 
 class GroceryHistory(db.Model):
+    # Covers the 90-day suggestions query (range on timestamp, GROUP BY item)
+    __table_args__ = (db.Index('ix_grocery_history_timestamp_item', 'timestamp', 'item'),)
     id = db.Column(db.Integer, primary_key=True)
     item = db.Column(db.String(256), nullable=False)
     creator = db.Column(db.String(64))
@@ -47,17 +49,21 @@ class GroceryHistory(db.Model):
 
 class HomeStatus(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(64), nullable=False)
+    name = db.Column(db.String(64), nullable=False, index=True)
     status = db.Column(db.String(16), default='Away')
+    # Set when a device heartbeat reported the status; it expires to Away (app/presence.py)
+    heartbeat_at = db.Column(db.DateTime)
 
 class Chore(db.Model):
+    # Open chores ordered by due date (homepage widget, chores list)
+    __table_args__ = (db.Index('ix_chore_done_due_date', 'done', 'due_date'),)
     id = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.Text, nullable=False)
     creator = db.Column(db.String(64))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     done = db.Column(db.Boolean, default=False)
     due_date = db.Column(db.Date)
-    recurring_id = db.Column(db.Integer)
+    recurring_id = db.Column(db.Integer, index=True)
     # JSON-encoded list of tags (e.g., ["Alice", "Weekend"]) for assignment/filtering
     tags = db.Column(db.Text, default='[]')
 
@@ -88,7 +94,7 @@ class Recipe(db.Model):
 class ExpiryItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(256), nullable=False)
-    expiry_date = db.Column(db.Date)
+    expiry_date = db.Column(db.Date, index=True)
     creator = db.Column(db.String(64))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -115,7 +121,7 @@ class Notice(db.Model):
 
 class Reminder(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     time = db.Column(db.String(5))  # HH:MM (optional)
     title = db.Column(db.String(256), nullable=False)
     description = db.Column(db.Text)
@@ -124,13 +130,14 @@ class Reminder(db.Model):
     # New fields (phase 1) - added via auto-migration if missing
     category = db.Column(db.String(64))  # key referencing configured category
     color = db.Column(db.String(16))     # optional override hex color
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Indexed for /api/reminders/changes
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     # Tie back to a recurring rule (if generated)
     recurring_id = db.Column(db.Integer)
 
 class MemberStatus(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(64), nullable=False)
+    name = db.Column(db.String(64), nullable=False, index=True)
     text = db.Column(db.Text, default='')
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -168,10 +175,13 @@ class RecurringReminder(db.Model):
     last_generated_date = db.Column(db.Date)
     effective_from = db.Column(db.Date)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 class ExpenseEntry(db.Model):
+    # One generated entry per rule and date; the generator inserts with ON CONFLICT DO NOTHING
+    __table_args__ = (db.Index('ux_expense_entry_recurring_date', 'recurring_id', 'date', unique=True),)
     id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     title = db.Column(db.String(256), nullable=False)
     category = db.Column(db.String(64))
     unit_price = db.Column(db.Float)
@@ -180,3 +190,74 @@ class ExpenseEntry(db.Model):
     payer = db.Column(db.String(64))
     recurring_id = db.Column(db.Integer, db.ForeignKey('recurring_expense.id'))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ItemTag(db.Model):
+    # Normalized copy of the JSON `tags` column on shopping items, chores and recipes,
+    # kept in sync by mapper events in app/tags.py. Used for SQL-side tag filters.
+    __tablename__ = 'item_tag'
+    __table_args__ = (
+        db.Index('ix_item_tag_entity_tag', 'entity_type', 'tag', 'entity_id'),
+        db.Index('ix_item_tag_entity', 'entity_type', 'entity_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(32), nullable=False)  # table name: shopping_item, chore, recipe
+    entity_id = db.Column(db.Integer, nullable=False)
+    tag = db.Column(db.String(128), nullable=False)
+
+class SharedCache(db.Model):
+    # Cross-worker cache (e.g. weather responses); values are JSON text
+    __tablename__ = 'shared_cache'
+    key = db.Column(db.String(256), primary_key=True)
+    value = db.Column(db.Text)
+    expires_at = db.Column(db.Float, index=True)  # unix time
+
+class WorkerLease(db.Model):
+    # Named lease held by exactly one process at a time (background job runner)
+    __tablename__ = 'worker_lease'
+    name = db.Column(db.String(64), primary_key=True)
+    owner = db.Column(db.String(128))
+    expires_at = db.Column(db.Float)  # unix time
+
+class Job(db.Model):
+    # Background work queued by requests and run by the lease holder (app/jobs.py)
+    __table_args__ = (db.Index('ix_job_status_id', 'status', 'id'),)
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    payload = db.Column(db.Text, default='{}')  # JSON
+    status = db.Column(db.String(16), default='pending')  # pending, running, done, error
+    owner = db.Column(db.String(128))
+    attempts = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+class DataVersion(db.Model):
+    # Per-table change counter bumped on every write (app/versions.py); feeds ETags
+    __tablename__ = 'data_version'
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class DeletedRecord(db.Model):
+    # Deletion tombstones for delta sync (app/changes.py); pruned after a retention window
+    __tablename__ = 'deleted_record'
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(64), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    day = db.Column(db.Date)  # the row's date, so clients know which cached month to patch
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+def _archive_table(model, *indexed):
+    # Same columns as `model` plus archived_at; rows are moved here by app/retention.py
+    # (own key: SQLite can hand an archived row's id to a new row in the hot table)
+    columns = [db.Column(c.name, c.type, index=c.name in indexed) for c in model.__table__.columns]
+    return db.Table(f'{model.__tablename__}_archive',
+                    db.Column('archive_id', db.Integer, primary_key=True), *columns,
+                    db.Column('archived_at', db.DateTime, default=datetime.utcnow))
+
+reminder_archive = _archive_table(Reminder, 'date')
+chore_archive = _archive_table(Chore)
+shopping_item_archive = _archive_table(ShoppingItem)
+qr_code_archive = _archive_table(QRCode)
+media_archive = _archive_table(Media)
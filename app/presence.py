@@ -0,0 +1,176 @@
+"""Household presence: who-is-home statuses and personal status lines.
+
+The snapshot of both tables lives in memory, tagged with their data
+versions. Reads compare those two counters (one primary-key query) and only
+rescan the tables when another worker has written since. Writes made through
+this module update the snapshot in place after they commit, as long as the
+counters show no other write slipped in between.
+
+Phones and home automation can ``POST /api/presence/heartbeat`` to mark
+their owner Home. A status set that way expires to "Away" once no heartbeat
+has arrived for ``presence.heartbeat_ttl_minutes``: reads apply the expiry
+immediately and the job lease holder writes it back. Until it does,
+``last_expiry`` tells conditional GETs that the output changed.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from . import db
+from .jobs import on_lease_tick
+from .models import HomeStatus, MemberStatus
+from .versions import get_versions
+
+TABLES = ('home_status', 'member_status')
+DEFAULT_TTL_MINUTES = 15
+SWEEP_SECONDS = 60.0
+
+_lock = threading.Lock()
+# home: name -> (status, heartbeat_at or None); members: name -> text
+_state = {'versions': None, 'home': {}, 'members': {}}
+_last_sweep = [0.0]
+
+
+def heartbeat_ttl(config: dict) -> timedelta:
+    try:
+        minutes = float((config.get('presence') or {}).get('heartbeat_ttl_minutes') or DEFAULT_TTL_MINUTES)
+    except (TypeError, ValueError):
+        minutes = DEFAULT_TTL_MINUTES
+    return timedelta(minutes=max(1.0, minutes))
+
+
+def _rebuild(versions: dict):
+    home = {s.name: (s.status, s.heartbeat_at) for s in HomeStatus.query.order_by(HomeStatus.id)}
+    members = {ms.name: ms.text for ms in MemberStatus.query.order_by(MemberStatus.id)}
+    _state.update(versions=versions, home=home, members=members)
+
+
+def invalidate():
+    with _lock:
+        _state['versions'] = None
+
+
+def _snapshot() -> tuple[dict, dict]:
+    """Copies of (home, members), rescanned first if another writer changed the tables."""
+    versions = get_versions(TABLES)
+    with _lock:
+        if _state['versions'] != versions:
+            _rebuild(versions)
+        return dict(_state['home']), dict(_state['members'])
+
+
+def statuses(family, now: datetime | None = None) -> tuple[dict, dict]:
+    """(who_statuses, member_statuses) for ``family``, with expired heartbeats shown as Away."""
+    home, members = _snapshot()
+    now = now or datetime.utcnow()
+    cutoff = now - heartbeat_ttl(current_app.config['HOMEHUB_CONFIG'])
+    who = {
+        name: ('Away' if beat is not None and beat < cutoff else status)
+        for name, (status, beat) in home.items() if name in family
+    }
+    member = {name: text for name, text in members.items() if name in family and (text or '').strip()}
+    return who, member
+
+
+def last_expiry(now: datetime | None = None) -> datetime | None:
+    """When the most recently lapsed heartbeat ran out, or None if none has."""
+    home, _ = _snapshot()
+    now = now or datetime.utcnow()
+    ttl = heartbeat_ttl(current_app.config['HOMEHUB_CONFIG'])
+    # Same test as statuses(): a beat older than the TTL reads as Away
+    return max((beat + ttl for _, beat in home.values() if beat is not None and beat + ttl < now), default=None)
+
+
+def _commit(table: str, apply):
+    """Commit the pending write to ``table`` and mirror it into the snapshot via ``apply(state)``."""
+    db.session.flush()
+    # Read inside the transaction: includes this flush's bump and nobody else's
+    after = get_versions(TABLES)
+    db.session.commit()
+    with _lock:
+        before = _state['versions']
+        expected = before and {t: before[t] + (1 if t == table else 0) for t in TABLES}
+        if expected == after:
+            apply(_state)
+            _state['versions'] = after
+        else:
+            _state['versions'] = None  # another writer got in between: rescan on next read
+
+
+def set_home_status(name: str, status: str, heartbeat_at: datetime | None = None):
+    """Set ``name``'s status; ``heartbeat_at`` marks a device-reported status that can expire."""
+    hs = HomeStatus.query.filter_by(name=name).first()
+    if hs:
+        hs.status = status
+        hs.heartbeat_at = heartbeat_at
+    else:
+        db.session.add(HomeStatus(name=name, status=status, heartbeat_at=heartbeat_at))
+    _commit('home_status', lambda state: state['home'].__setitem__(name, (status, heartbeat_at)))
+
+
+def clear_home_status(name: str) -> bool:
+    hs = HomeStatus.query.filter_by(name=name).first()
+    if not hs:
+        return False
+    db.session.delete(hs)
+    _commit('home_status', lambda state: state['home'].pop(name, None))
+    return True
+
+
+def set_member_status(name: str, text: str):
+    ms = MemberStatus.query.filter_by(name=name).first()
+    now = datetime.utcnow()
+    if ms:
+        ms.text = text
+        ms.updated_at = now
+    else:
+        db.session.add(MemberStatus(name=name, text=text, updated_at=now))
+    _commit('member_status', lambda state: state['members'].__setitem__(name, text))
+
+
+def clear_member_status(name: str) -> bool:
+    ms = MemberStatus.query.filter_by(name=name).first()
+    if not ms:
+        return False
+    db.session.delete(ms)
+    _commit('member_status', lambda state: state['members'].pop(name, None))
+    return True
+
+
+def record_heartbeat(name: str, now: datetime | None = None) -> bool:
+    """Mark ``name`` Home from a device; returns False when the stored heartbeat is still fresh.
+
+    Devices usually beat every few minutes. Refreshing the stored time only
+    once a third of the TTL has passed keeps most beats from writing (and from
+    invalidating every cache keyed on home_status).
+    """
+    now = now or datetime.utcnow()
+    status, beat = _snapshot()[0].get(name, (None, None))
+    if status == 'Home' and beat is not None and now - beat < heartbeat_ttl(current_app.config['HOMEHUB_CONFIG']) / 3:
+        return False
+    set_home_status(name, 'Home', heartbeat_at=now)
+    return True
+
+
+def expire_heartbeats(now: datetime | None = None) -> int:
+    """Persist "Away" for device statuses whose heartbeat is older than the TTL."""
+    now = now or datetime.utcnow()
+    cutoff = now - heartbeat_ttl(current_app.config['HOMEHUB_CONFIG'])
+    expired = HomeStatus.query.filter(HomeStatus.heartbeat_at.isnot(None), HomeStatus.heartbeat_at < cutoff).all()
+    for hs in expired:
+        hs.status = 'Away'
+        hs.heartbeat_at = None
+    if expired:
+        db.session.commit()
+        invalidate()
+    return len(expired)
+
+
+@on_lease_tick
+def _sweep_heartbeats(became_owner: bool):
+    if time.monotonic() - _last_sweep[0] < SWEEP_SECONDS:
+        return
+    _last_sweep[0] = time.monotonic()
+    expire_heartbeats()
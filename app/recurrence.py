@@ -0,0 +1,163 @@
+"""Recurrence rules shared by reminders, chores and recurring expenses.
+
+A rule is compiled once into a ``Recurrence`` and can then jump straight to
+the first occurrence on or after any date instead of stepping from
+``start_date``; ``between`` yields the occurrences of a window lazily.
+
+Month and year steps keep the historical semantics:
+
+- reminders/chores (``drift``): each step adds months to the *previous*
+  occurrence and clamps to the month end, so Jan 31 -> Feb 28 -> Mar 28 and
+  Feb 29 yearly becomes Feb 28 from the first non-leap year on.
+- expenses ``day_of_month`` (``anchored``): every occurrence uses the start
+  day clamped to that month (Jan 31 -> Feb 28 -> Mar 31).
+- expenses ``calendar``: the 1st of every month.
+"""
+import calendar
+from datetime import date, timedelta
+from math import gcd
+
+UNITS = ('day', 'week', 'month', 'year')
+
+
+def _month_index(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _month_length(index: int) -> int:
+    return calendar.monthrange(index // 12, index % 12 + 1)[1]
+
+
+class Recurrence:
+    """A compiled rule: ``start`` repeated every ``interval`` ``unit`` until ``end``."""
+
+    __slots__ = ('start', 'end', 'unit', 'interval', 'mode')
+
+    def __init__(self, start: date, interval: int = 1, unit: str = 'day', end: date | None = None,
+                 mode: str = 'drift'):
+        unit = (unit or 'day').lower()
+        interval = max(1, int(interval or 1))
+        if unit == 'year':
+            unit, interval = 'month', interval * 12
+        elif unit not in UNITS:
+            unit = 'day'
+        self.start = start
+        self.end = end
+        self.unit = unit
+        self.interval = interval
+        self.mode = mode if unit == 'month' else 'drift'
+        if self.mode == 'calendar' and start.day != 1:
+            # Calendar-month rules begin on the next 1st
+            self.start = date.fromordinal(start.replace(day=1).toordinal() + _month_length(_month_index(start)))
+
+    def _step_days(self) -> int:
+        return self.interval * (7 if self.unit == 'week' else 1)
+
+    def _drift_day(self, k: int) -> int:
+        """Day of month of occurrence ``k`` when every step clamps the previous day."""
+        day = self.start.day
+        if day <= 28 or k == 0:
+            return day
+        m0 = _month_index(self.start)
+        # The month-of-year sequence repeats every `period` steps
+        period = 12 // gcd(self.interval, 12)
+        feb_step = None
+        for j in range(1, min(k, period) + 1):
+            index = m0 + j * self.interval
+            if index % 12 == 1:
+                feb_step = j
+            else:
+                day = min(day, _month_length(index))
+        if day <= 28 or feb_step is None:
+            return day
+        # Only February is left: 28 as soon as a visited February is not a leap one
+        j = feb_step
+        while j <= k:
+            day = min(day, _month_length(m0 + j * self.interval))
+            if day == 28:
+                break
+            j += period
+        return day
+
+    def occurrence(self, k: int) -> date:
+        """The ``k``-th occurrence (0 is ``start``), ignoring ``end``."""
+        if self.unit != 'month':
+            return self.start + timedelta(days=k * self._step_days())
+        index = _month_index(self.start) + k * self.interval
+        y, m = index // 12, index % 12 + 1
+        if self.mode == 'calendar':
+            return date(y, m, 1)
+        if self.mode == 'anchored':
+            return date(y, m, min(self.start.day, calendar.monthrange(y, m)[1]))
+        return date(y, m, self._drift_day(k))
+
+    def _index_on_or_after(self, target: date) -> int:
+        if target <= self.start:
+            return 0
+        if self.unit != 'month':
+            step = self._step_days()
+            return -(-(target - self.start).days // step)
+        k = -(-(_month_index(target) - _month_index(self.start)) // self.interval)
+        # Same month as target but an earlier (clamped) day: take the next one
+        return k if self.occurrence(k) >= target else k + 1
+
+    def first_on_or_after(self, target: date) -> date | None:
+        """First occurrence >= ``target``, or None if the rule has ended by then."""
+        try:
+            d = self.occurrence(self._index_on_or_after(target))
+        except (ValueError, OverflowError):
+            return None
+        if self.end and d > self.end:
+            return None
+        return d
+
+    def next_after(self, d: date) -> date:
+        """One step from ``d`` (which need not be an occurrence)."""
+        if self.unit != 'month':
+            return d + timedelta(days=self._step_days())
+        index = _month_index(d) + self.interval
+        y, m = index // 12, index % 12 + 1
+        if self.mode == 'calendar':
+            return date(y, m, 1)
+        day = self.start.day if self.mode == 'anchored' else d.day
+        return date(y, m, min(day, calendar.monthrange(y, m)[1]))
+
+    def between(self, window_start: date, window_end: date):
+        """Yield occurrences in ``[window_start, window_end]`` (and not after ``end``)."""
+        last = min(window_end, self.end) if self.end else window_end
+        try:
+            k = self._index_on_or_after(window_start)
+            d = self.occurrence(k)
+            while d <= last:
+                yield d
+                k += 1
+                d = self.occurrence(k)
+        except (ValueError, OverflowError):
+            return
+
+
+def compile_rule(rule, default_start: date | None = None) -> Recurrence:
+    """Compile a RecurringReminder/RecurringChore (interval/unit, legacy ``frequency``)."""
+    interval = getattr(rule, 'interval', None) or 1
+    unit = (getattr(rule, 'unit', None) or '').lower()
+    if not unit:
+        if hasattr(rule, 'frequency'):
+            # Legacy reminder rules only had daily/weekly/monthly; anything else
+            # (including no frequency at all) has always recurred monthly
+            unit = {'daily': 'day', 'weekly': 'week'}.get(rule.frequency, 'month')
+            interval = 1
+        else:
+            # Chore rules without a unit repeat daily
+            unit = 'day'
+    return Recurrence(rule.start_date or default_start, interval, unit, rule.end_date)
+
+
+def compile_expense_rule(rule, default_start: date | None = None) -> Recurrence:
+    """Compile a RecurringExpense (daily/weekly/monthly with ``monthly_mode``)."""
+    start = rule.start_date or default_start
+    if rule.frequency == 'daily':
+        return Recurrence(start, 1, 'day', rule.end_date)
+    if rule.frequency == 'weekly':
+        return Recurrence(start, 1, 'week', rule.end_date)
+    mode = getattr(rule, 'monthly_mode', 'day_of_month') or 'day_of_month'
+    return Recurrence(start, 1, 'month', rule.end_date, 'calendar' if mode == 'calendar' else 'anchored')
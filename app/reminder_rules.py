@@ -0,0 +1,95 @@
+"""Recurring reminder rules compiled once and shared across requests.
+
+The rules are loaded and compiled when the ``recurring_reminder`` data
+version changes, not on every reminders request; a version probe is the only
+query on the hot path. Occurrence lists are memoized per date window (the
+calendar asks for the same few months over and over), and only rules with at
+least one occurrence in the window are returned.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from .models import RecurringReminder
+from .recurrence import Recurrence, compile_rule
+from .versions import get_versions
+
+MAX_WINDOWS = 64
+
+_lock = threading.Lock()
+_state = {'version': None, 'rules': [], 'windows': OrderedDict()}
+
+
+class CompiledRule:
+    """A RecurringReminder detached from the session, with its recurrence and UI summary."""
+
+    __slots__ = ('id', 'title', 'description', 'creator', 'time', 'category', 'color',
+                 'recurrence', 'summary')
+
+    def __init__(self, rr: RecurringReminder):
+        self.id = rr.id
+        self.title = rr.title
+        self.description = rr.description or ''
+        self.creator = rr.creator or ''
+        self.time = rr.time
+        self.category = rr.category
+        self.color = rr.color
+        # Rules without a start date begin at whatever window is asked for
+        self.recurrence = compile_rule(rr, date.min)
+        if rr.start_date is None:
+            self.recurrence.start = None
+        # Interval/unit as the UI shows them (legacy rules only have ``frequency``)
+        unit = (rr.unit or '').lower()
+        if not unit:
+            unit = {'daily': 'day', 'weekly': 'week'}.get(rr.frequency, 'month')
+        self.summary = {
+            'id': rr.id,
+            'title': rr.title,
+            'description': self.description,
+            'creator': self.creator,
+            'interval': int(rr.interval or 1),
+            'unit': unit,
+            'time': rr.time,
+            'category': rr.category,
+            'color': rr.color,
+            'end_date': rr.end_date.strftime('%Y-%m-%d') if rr.end_date else None,
+        }
+
+    def between(self, window_start: date, window_end: date) -> list[date]:
+        rec = self.recurrence
+        if rec.start is None:
+            rec = Recurrence(window_start, rec.interval, rec.unit, rec.end, rec.mode)
+        return list(rec.between(window_start, window_end))
+
+
+def _load(version: int):
+    rules = [CompiledRule(rr) for rr in RecurringReminder.query.order_by(RecurringReminder.id)]
+    _state.update(version=version, rules=rules, windows=OrderedDict())
+
+
+def invalidate():
+    with _lock:
+        _state['version'] = None
+
+
+def rules_in_window(window_start: date, window_end: date) -> list[tuple[CompiledRule, list[date]]]:
+    """``(rule, occurrence dates)`` for every rule occurring in ``[window_start, window_end]``."""
+    version = get_versions(['recurring_reminder'])['recurring_reminder']
+    with _lock:
+        if _state['version'] != version:
+            _load(version)
+        windows = _state['windows']
+        key = (window_start, window_end)
+        hit = windows.get(key)
+        if hit is not None:
+            windows.move_to_end(key)
+            return hit
+        hit = []
+        for rule in _state['rules']:
+            dates = rule.between(window_start, window_end)
+            if dates:
+                hit.append((rule, dates))
+        windows[key] = hit
+        if len(windows) > MAX_WINDOWS:
+            windows.popitem(last=False)
+        return hit
@@ -0,0 +1,180 @@
+"""Retention policies that move stale rows out of the hot tables.
+
+Policies are set per entity under ``retention`` in config.yml::
+
+    retention:
+      reminders: {days: 730}   # reminders dated more than two years ago
+      chores: {days: 180}      # done chores
+      shopping: {days: 30}     # checked items
+      qr_codes: {rows: 200}    # keep the newest 200
+      media: {rows: 100}       # finished downloads
+
+``days`` archives eligible rows older than that; ``rows`` keeps only the
+newest N eligible rows; both may be combined. Entities without a policy are
+never archived. The job runner's lease holder applies the policies when it
+takes the lease and once a day after that.
+
+Archived rows move to ``<table>_archive``, which has the same columns
+(ids included) plus ``archived_at``. Each batch is copied and deleted in one
+transaction. Files on disk (QR images, downloads) are left in place. List
+endpoints return archived rows after the live ones when called with
+``?include_archived=1``; those rows carry ``archived: true`` and are
+read-only. The QR and media pages list only the newest archived rows.
+"""
+import logging
+from datetime import date, datetime, timedelta
+
+from flask import current_app, request
+from sqlalchemy import DateTime, literal, or_, select, union
+
+from . import db
+from .changes import TRACKED, record_deletions
+from .jobs import enqueue, job_handler, on_lease_tick
+from .models import (
+    Chore, ItemTag, Media, QRCode, RecurringChore, RecurringReminder, Reminder, ShoppingItem,
+    chore_archive, media_archive, qr_code_archive, reminder_archive, shopping_item_archive,
+)
+from .tags import TAGGED_MODELS
+from .versions import bump_versions
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# Newest archived rows listed on the HTML pages (/media); the archive itself can grow without bound
+ARCHIVED_PAGE_LIMIT = 100
+
+# entity -> (model, archive table, age column, eligibility criteria)
+ENTITIES = {
+    # Edited occurrences override their rule's virtual one; keep them while the rule exists
+    'reminders': (Reminder, reminder_archive, Reminder.date, lambda: [
+        or_(Reminder.recurring_id.is_(None), Reminder.recurring_id.not_in(select(RecurringReminder.id))),
+    ]),
+    # The generator reuses the row of a live recurring chore
+    'chores': (Chore, chore_archive, Chore.timestamp, lambda: [
+        Chore.done.is_(True),
+        or_(Chore.recurring_id.is_(None), Chore.recurring_id.not_in(select(RecurringChore.id))),
+    ]),
+    'shopping': (ShoppingItem, shopping_item_archive, ShoppingItem.timestamp, lambda: [
+        ShoppingItem.checked.is_(True),
+    ]),
+    'qr_codes': (QRCode, qr_code_archive, QRCode.timestamp, lambda: []),
+    'media': (Media, media_archive, Media.download_time, lambda: [
+        Media.status.in_(('done', 'error')),
+    ]),
+}
+
+ARCHIVES = {model.__tablename__: archive for model, archive, _, _ in ENTITIES.values()}
+
+_last_run_day = [None]
+
+
+def include_archived() -> bool:
+    """True when the request asks for archived rows (``?include_archived=1``)."""
+    return (request.args.get('include_archived') or '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def archive_for(model):
+    return ARCHIVES[model.__tablename__]
+
+
+def load_archived(model, *criteria, order_by=(), limit=None) -> list:
+    """Archived ``model`` rows as unsaved instances flagged ``archived``.
+
+    ``criteria`` and ``order_by`` refer to ``archive_for(model).c``.
+    """
+    table = archive_for(model)
+    names = [c.name for c in model.__table__.columns]
+    stmt = select(*(table.c[n] for n in names)).where(*criteria).order_by(*order_by)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    rows = []
+    for row in db.session.execute(stmt):
+        obj = model(**row._mapping)
+        obj.archived = True
+        rows.append(obj)
+    return rows
+
+
+def _policy_number(policy: dict, key: str) -> int | None:
+    try:
+        value = int(policy.get(key) or 0)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def stale_ids(entity: str, policy: dict, today: date | None = None) -> list[int]:
+    """Ids of ``entity`` rows the policy says to archive, oldest first."""
+    model, _, age, eligible = ENTITIES[entity]
+    days = _policy_number(policy, 'days')
+    keep = _policy_number(policy, 'rows')
+    selects = []
+    if days:
+        if isinstance(age.type, DateTime):
+            cutoff = datetime.utcnow() - timedelta(days=days)
+        else:
+            cutoff = (today or date.today()) - timedelta(days=days)
+        selects.append(select(model.id).where(*eligible(), age < cutoff))
+    if keep:
+        selects.append(select(model.id).where(*eligible()).order_by(age.desc(), model.id.desc()).offset(keep))
+    if not selects:
+        return []
+    stmt = selects[0] if len(selects) == 1 else union(*(s.subquery().select() for s in selects))
+    return sorted(db.session.execute(stmt).scalars())
+
+
+def archive_rows(model, ids) -> int:
+    """Move rows ``ids`` of ``model`` to its archive table in one transaction."""
+    src, dst = model.__table__, archive_for(model)
+    names = [c.name for c in src.columns]
+    connection = db.session.connection()
+    where = src.c.id.in_(ids)
+    if src.name in TRACKED:
+        # Delta sync clients drop archived reminders like deleted ones
+        record_deletions(connection, src.name, connection.execute(select(src.c.id, src.c.date).where(where)).all())
+    connection.execute(dst.insert().from_select(
+        names + ['archived_at'],
+        select(*src.c, literal(datetime.utcnow(), DateTime)).where(where),
+    ))
+    moved = connection.execute(src.delete().where(where)).rowcount
+    if src.name in TAGGED_MODELS:
+        connection.execute(ItemTag.__table__.delete().where(
+            ItemTag.entity_type == src.name, ItemTag.entity_id.in_(ids),
+        ))
+    # Core statements skip the ORM flush hooks
+    bump_versions(connection, [src.name, dst.name])
+    db.session.commit()
+    return moved
+
+
+def apply_retention(config: dict, today: date | None = None) -> dict:
+    """Apply every configured policy; returns rows archived per entity."""
+    policies = config.get('retention') or {}
+    moved = {}
+    for entity, (model, _, _, _) in ENTITIES.items():
+        policy = policies.get(entity)
+        if not isinstance(policy, dict):
+            continue
+        ids = stale_ids(entity, policy, today)
+        count = 0
+        for i in range(0, len(ids), BATCH_SIZE):
+            count += archive_rows(model, ids[i:i + BATCH_SIZE])
+        if count:
+            logger.info('Archived %d %s row(s)', count, entity)
+            moved[entity] = count
+    return moved
+
+
+@job_handler('retention')
+def _retention_job(payload: dict):
+    apply_retention(current_app.config['HOMEHUB_CONFIG'])
+
+
+@on_lease_tick
+def _schedule(became_owner: bool):
+    """Queue the retention job when this process takes the lease and at local midnight."""
+    today = date.today()
+    if became_owner or _last_run_day[0] != today:
+        _last_run_day[0] = today
+        if current_app.config['HOMEHUB_CONFIG'].get('retention'):
+            enqueue('retention', {})
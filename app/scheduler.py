@@ -0,0 +1,164 @@
+"""Materialize recurring data (expense entries, recurring chores) off the request path.
+
+Each generator is registered as a named task. After a task has run for a given
+day it stores a "materialized through" watermark in the settings service, so
+request handlers can call ``ensure_current(name)`` and skip the work entirely
+when the watermark is today; that costs only the cached settings lookup.
+
+The job runner's lease holder (see app/jobs.py) queues every task at startup
+and again when the local date changes. Changes to the rules (and to chores
+linked to a rule) clear the watermark in the same transaction and queue a
+refresh. A request that arrives before the job has run still does the
+catch-up inline, so it is always correct.
+
+Only one materializer runs a task at a time: a thread lock inside the process
+and a ``worker_lease`` row across processes. Whoever waits re-reads the stored
+watermark afterwards and skips the work the other one just did.
+"""
+import json
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from . import db
+from .jobs import acquire_lease, enqueue, job_handler, on_lease_tick, process_owner_id, release_lease
+from .models import Chore, Job, RecurringChore, RecurringExpense
+from .settings import get_setting, set_setting, write_settings_in_transaction
+
+WATERMARK_PREFIX = 'materialized_through:'
+LEASE_PREFIX = 'materialize:'
+# Longer than any catch-up run; a crashed holder's lease frees up after this
+LEASE_TTL = 300.0
+POLL_INTERVAL = 0.05
+
+_tasks = {}
+_task_locks = {}
+_last_scheduled_day = [None]
+
+
+def materialize_task(name: str):
+    """Register ``fn(today)`` as the generator for task ``name``."""
+    def register(fn):
+        _tasks[name] = fn
+        _task_locks[name] = threading.Lock()
+        return fn
+    return register
+
+
+def watermark(name: str) -> str:
+    return get_setting(WATERMARK_PREFIX + name) or ''
+
+
+def _stored_watermark(name: str) -> str:
+    # Straight from the table: the settings cache may predate the other materializer's write
+    value = db.session.execute(
+        db.text("SELECT value FROM app_setting WHERE key=:k"), {'k': WATERMARK_PREFIX + name}
+    ).scalar()
+    return value or ''
+
+
+def run_task(name: str, today: date | None = None):
+    today = today or date.today()
+    info = db.session().info
+    # The generators touch rules/chores themselves; that must not re-mark them stale
+    info['homehub_materializing'] = True
+    try:
+        _tasks[name](today)
+    finally:
+        info.pop('homehub_materializing', None)
+    set_setting(WATERMARK_PREFIX + name, today.isoformat())
+
+
+def ensure_current(name: str, today: date | None = None) -> bool:
+    """Run task ``name`` unless it already ran for ``today``; True if it ran."""
+    today = today or date.today()
+    day = today.isoformat()
+    if watermark(name) >= day:
+        return False
+    with _task_locks[name]:
+        owner = process_owner_id()
+        while not acquire_lease(LEASE_PREFIX + name, owner, LEASE_TTL):
+            if _stored_watermark(name) >= day:
+                return False
+            time.sleep(POLL_INTERVAL)
+        try:
+            if _stored_watermark(name) >= day:
+                return False
+            run_task(name, today)
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            release_lease(LEASE_PREFIX + name, owner)
+    return True
+
+
+@job_handler('materialize')
+def _materialize_job(payload: dict):
+    for name in payload.get('tasks') or list(_tasks):
+        if name in _tasks:
+            ensure_current(name)
+
+
+@on_lease_tick
+def _schedule(became_owner: bool):
+    """Queue all tasks when this process takes the lease and at local midnight."""
+    today = date.today()
+    if became_owner or _last_scheduled_day[0] != today:
+        _last_scheduled_day[0] = today
+        enqueue('materialize', {'tasks': list(_tasks)})
+
+
+def _stale_tasks(session) -> set[str]:
+    stale = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, RecurringExpense):
+            stale.add('expenses')
+        elif isinstance(obj, RecurringChore):
+            stale.add('chores')
+        elif isinstance(obj, Chore) and obj.recurring_id is not None:
+            stale.add('chores')
+    return stale
+
+
+@event.listens_for(Session, 'before_flush')
+def _collect_stale(session, flush_context, instances):
+    if session.info.get('homehub_materializing'):
+        return
+    stale = _stale_tasks(session)
+    if stale:
+        session.info.setdefault('homehub_stale_tasks', set()).update(stale)
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_watermarks(session, flush_context):
+    stale = session.info.pop('homehub_stale_tasks', None)
+    if not stale:
+        return
+    # Same transaction as the rule change: clear the watermark and queue a refresh
+    connection = session.connection()
+    write_settings_in_transaction(connection, {WATERMARK_PREFIX + name: '' for name in stale})
+    # One pending refresh covers every change made before it runs: fold the
+    # tasks into it instead of queueing a job per flush
+    job = Job.__table__
+    pending = connection.execute(
+        select(job.c.id, job.c.payload)
+        .where(job.c.kind == 'materialize', job.c.status == 'pending')
+        .order_by(job.c.id).limit(1)
+    ).first()
+    if pending is not None:
+        tasks = json.loads(pending.payload or '{}').get('tasks')
+        # No task list means the job already refreshes everything
+        merged = None if not tasks else sorted(stale | set(tasks))
+        updated = connection.execute(
+            job.update().where(job.c.id == pending.id, job.c.status == 'pending')
+            .values(payload=json.dumps({'tasks': merged} if merged else {}))
+        ).rowcount
+        if updated:
+            return
+    connection.execute(job.insert(), [{
+        'kind': 'materialize', 'payload': json.dumps({'tasks': sorted(stale)}), 'status': 'pending',
+    }])
@@ -1,4 +1,5 @@
 from urllib.parse import urlparse
+import hmac
 import socket
 import ipaddress
 import bleach
@@ -75,3 +76,21 @@ def sanitize_html(value: str) -> str:
 def sanitize_text(value: str) -> str:
     # Plain-text sanitize: strip tags and trim whitespace
     return bleach.clean(value or "", strip=True).strip()
+
+
+def bearer_token(authorization: str) -> str:
+    """Token from an ``Authorization: Bearer <token>`` header value ('' if absent)."""
+    if not (authorization or '').startswith('Bearer '):
+        return ''
+    return authorization[7:].strip()
+
+
+def token_matches(configured, supplied) -> bool:
+    """Constant-time comparison of a supplied token with a configured one.
+
+    An unset (empty) configured token never matches.
+    """
+    configured = str(configured or '')
+    if not configured:
+        return False
+    return hmac.compare_digest(str(supplied or '').encode('utf-8'), configured.encode('utf-8'))
@@ -0,0 +1,134 @@
+"""Cached access to the ``app_setting`` key/value table.
+
+All settings are loaded once into a per-app dict. Writes go through
+``set_settings`` which updates the table, bumps a version counter row and
+refreshes the local copy. Other workers notice the bumped counter on their next
+request: the counter is a single primary-key lookup, done at most once per
+request, and the full table is only re-read when it changed.
+"""
+import threading
+
+from flask import current_app, g, has_app_context, has_request_context
+
+from . import db
+from .versions import bump_versions
+
+VERSION_KEY = '_settings_version'
+
+_TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def _store() -> dict:
+    # Kept on the app (not module-level) so each app/database has its own copy
+    return current_app.extensions.setdefault('homehub_settings', {
+        'lock': threading.Lock(),
+        'version': None,
+        'values': {},
+    })
+
+
+def _read_version() -> int:
+    value = db.session.execute(
+        db.text("SELECT value FROM app_setting WHERE key=:k"), {'k': VERSION_KEY}
+    ).scalar()
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _load_all() -> dict:
+    rows = db.session.execute(db.text("SELECT key, value FROM app_setting WHERE key != :k"), {'k': VERSION_KEY})
+    return {k: v for k, v in rows}
+
+
+def _refresh(store: dict):
+    """Re-read the table if another worker (or raw SQL) bumped the version."""
+    # Once per request is enough; outside requests (CLI, background threads) always check
+    if has_request_context():
+        if g.get('_settings_checked'):
+            return
+        g._settings_checked = True
+    version = _read_version()
+    if version == store['version']:
+        return
+    values = _load_all()
+    with store['lock']:
+        store['values'] = values
+        store['version'] = version
+
+
+def get_settings() -> dict:
+    """Snapshot of all settings (do not mutate)."""
+    store = _store()
+    try:
+        _refresh(store)
+    except Exception:
+        current_app.logger.exception('Failed to refresh app settings; using cached values')
+    return store['values']
+
+
+def get_setting(key: str, default=None):
+    return get_settings().get(key, default)
+
+
+def get_bool_setting(key: str, default: bool = False) -> bool:
+    value = get_setting(key)
+    if value is None:
+        return default
+    return str(value).strip().lower() in _TRUE_VALUES
+
+
+def _write(connection, values: dict) -> int:
+    upsert = db.text(
+        "INSERT INTO app_setting(key,value) VALUES(:k, :v) ON CONFLICT(key) DO UPDATE SET value=excluded.value"
+    )
+    for key, value in values.items():
+        connection.execute(upsert, {'k': key, 'v': None if value is None else str(value)})
+    connection.execute(
+        db.text(
+            "INSERT INTO app_setting(key,value) VALUES(:k, '1') "
+            "ON CONFLICT(key) DO UPDATE SET value=CAST(value AS INTEGER) + 1"
+        ),
+        {'k': VERSION_KEY},
+    )
+    bump_versions(connection, ['app_setting'])
+    value = connection.execute(
+        db.text("SELECT value FROM app_setting WHERE key=:k"), {'k': VERSION_KEY}
+    ).scalar()
+    return int(value or 0)
+
+
+def set_settings(values: dict):
+    """Upsert settings, bump the version counter and commit (write-through)."""
+    version = _write(db.session.connection(), values)
+    db.session.commit()
+    store = _store()
+    with store['lock']:
+        if store['version'] is not None and store['version'] + 1 == version:
+            # Nobody else wrote in between: apply our change locally
+            merged = dict(store['values'])
+            merged.update({k: (None if v is None else str(v)) for k, v in values.items()})
+            store['values'] = merged
+            store['version'] = version
+        else:
+            store['version'] = None  # force a full reload on next read
+    if has_request_context():
+        g._settings_checked = False
+
+
+def write_settings_in_transaction(connection, values: dict):
+    """Like set_settings but on ``connection`` and without committing.
+
+    For flush hooks that must change a setting atomically with the data; the
+    local cache reloads on the next read.
+    """
+    _write(connection, values)
+    if has_app_context():
+        _store()['version'] = None
+    if has_request_context():
+        g._settings_checked = False
+
+
+def set_setting(key: str, value):
+    set_settings({key: value})
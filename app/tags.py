@@ -0,0 +1,136 @@
+"""Normalized tag index for shopping items, chores and recipes.
+
+The JSON ``tags`` column stays the source of truth for rendering; every ORM
+insert/update/delete of a tagged model rewrites that entity's rows in the
+``item_tag`` table, so list filters and the tag cloud can run in SQL instead of
+parsing JSON for every row.
+"""
+import json
+
+from sqlalchemy import event, func, inspect, select
+
+from . import db
+from .models import Chore, ItemTag, Recipe, ShoppingItem
+
+TAGGED_MODELS = {
+    'shopping_item': ShoppingItem,
+    'chore': Chore,
+    'recipe': Recipe,
+}
+
+# Friendly names accepted by /api/tags?entity=
+ENTITY_ALIASES = {
+    'shopping': 'shopping_item',
+    'shopping_item': 'shopping_item',
+    'chore': 'chore',
+    'chores': 'chore',
+    'recipe': 'recipe',
+    'recipes': 'recipe',
+}
+
+
+def parse_tags(value) -> list[str]:
+    """Decode a JSON tags column into a de-duplicated list of non-empty strings."""
+    try:
+        arr = json.loads(value or '[]')
+    except (ValueError, TypeError):
+        return []
+    if not isinstance(arr, list):
+        return []
+    seen = []
+    for t in arr:
+        if isinstance(t, str) and t and t not in seen:
+            seen.append(t)
+    return seen
+
+
+def parse_tag_filter(raw) -> list[str]:
+    """Parse the ``?tags=`` query argument (JSON array); empty list means no filter."""
+    if not raw:
+        return []
+    try:
+        selected = json.loads(raw)
+    except (ValueError, TypeError):
+        return []
+    if not isinstance(selected, list):
+        return []
+    return [t for t in selected if isinstance(t, str) and t]
+
+
+def write_tags(connection, entity_type: str, entity_id: int, tags: list[str]):
+    table = ItemTag.__table__
+    connection.execute(table.delete().where(
+        table.c.entity_type == entity_type, table.c.entity_id == entity_id
+    ))
+    if tags:
+        connection.execute(table.insert(), [
+            {'entity_type': entity_type, 'entity_id': entity_id, 'tag': t} for t in tags
+        ])
+
+
+def filter_by_tags(query, model, raw):
+    """Restrict ``query`` to rows of ``model`` having any of the tags in ``raw``."""
+    selected = parse_tag_filter(raw)
+    if not selected:
+        return query
+    tagged = select(ItemTag.entity_id).where(
+        ItemTag.entity_type == model.__tablename__,
+        ItemTag.tag.in_(selected),
+    )
+    return query.filter(model.id.in_(tagged))
+
+
+def matches_tag_filter(value, raw) -> bool:
+    """``filter_by_tags`` for one JSON tags value; used for archived rows, which have no item_tag rows."""
+    selected = parse_tag_filter(raw)
+    return not selected or not set(selected).isdisjoint(parse_tags(value))
+
+
+def tag_counts(entity_type: str) -> list[dict]:
+    """Per-tag counts for one entity type, most used first."""
+    model = TAGGED_MODELS[entity_type]
+    # Join back to the entity table so rows removed by bulk query deletes
+    # (which skip mapper events) are not counted.
+    rows = db.session.execute(
+        select(ItemTag.tag, func.count())
+        .join(model, model.id == ItemTag.entity_id)
+        .where(ItemTag.entity_type == entity_type)
+        .group_by(ItemTag.tag)
+        .order_by(func.count().desc(), ItemTag.tag)
+    ).all()
+    return [{'tag': tag, 'count': count} for tag, count in rows]
+
+
+def rebuild_tag_index(connection):
+    """Repopulate item_tag from the JSON columns (used by the migration)."""
+    table = ItemTag.__table__
+    connection.execute(table.delete())
+    for entity_type, model in TAGGED_MODELS.items():
+        src = model.__table__
+        rows = connection.execute(select(src.c.id, src.c.tags)).all()
+        values = [
+            {'entity_type': entity_type, 'entity_id': row_id, 'tag': t}
+            for row_id, raw in rows
+            for t in parse_tags(raw)
+        ]
+        if values:
+            connection.execute(table.insert(), values)
+
+
+def _after_insert(mapper, connection, target):
+    write_tags(connection, mapper.local_table.name, target.id, parse_tags(target.tags))
+
+
+def _after_update(mapper, connection, target):
+    if inspect(target).attrs.tags.history.has_changes():
+        write_tags(connection, mapper.local_table.name, target.id, parse_tags(target.tags))
+
+
+def _after_delete(mapper, connection, target):
+    write_tags(connection, mapper.local_table.name, target.id, [])
+
+
+for _model in TAGGED_MODELS.values():
+    event.listen(_model, 'after_insert', _after_insert)
+    event.listen(_model, 'after_update', _after_update)
+    event.listen(_model, 'after_delete', _after_delete)
@@ -0,0 +1,78 @@
+"""Per-table data version counters.
+
+Every flush that inserts, updates or deletes ORM rows bumps the counter of
+each affected table in ``data_version``, inside the same transaction, so all
+workers see a new version exactly when the data commits. ORM bulk
+``query.update()``/``query.delete()`` calls are covered by a
+``do_orm_execute`` hook; code that writes with raw SQL calls
+``bump_versions`` itself (see app/settings.py).
+"""
+from datetime import datetime
+
+from sqlalchemy import bindparam, event
+from sqlalchemy.orm import Session
+
+from . import db
+
+# Bookkeeping tables whose churn nobody caches on
+UNTRACKED = {'data_version', 'job', 'worker_lease', 'shared_cache', 'item_tag', 'schema_version'}
+
+
+def bump_versions(connection, tables):
+    tables = sorted(set(tables) - UNTRACKED)
+    if not tables:
+        return
+    now = datetime.utcnow()
+    connection.execute(
+        db.text(
+            "INSERT INTO data_version(table_name, version, updated_at) VALUES(:t, 1, :now) "
+            "ON CONFLICT(table_name) DO UPDATE SET version=data_version.version + 1, updated_at=excluded.updated_at"
+        ),
+        [{'t': t, 'now': now} for t in tables],
+    )
+
+
+def get_version_state(tables) -> tuple[dict, datetime | None]:
+    """Current counter per table name (0 for tables never written) and the latest write time (UTC)."""
+    tables = sorted(set(tables))
+    rows = db.session.execute(
+        db.text("SELECT table_name, version, updated_at FROM data_version WHERE table_name IN :names")
+        .bindparams(bindparam('names', expanding=True)),
+        {'names': tables},
+    ).all()
+    versions = dict.fromkeys(tables, 0)
+    versions.update({name: version for name, version, _ in rows})
+    stamps = [_as_datetime(updated_at) for _, _, updated_at in rows if updated_at]
+    return versions, max(stamps) if stamps else None
+
+
+def get_versions(tables) -> dict:
+    return get_version_state(tables)[0]
+
+
+def _as_datetime(value) -> datetime:
+    # Raw SQL reads of a DateTime column come back as ISO strings on SQLite
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_flushed_tables(session, flush_context):
+    tables = {obj.__table__.name for obj in session.new}
+    tables.update(obj.__table__.name for obj in session.deleted)
+    tables.update(
+        obj.__table__.name for obj in session.dirty
+        if session.is_modified(obj, include_collections=False)
+    )
+    if tables:
+        bump_versions(session.connection(), tables)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bump_bulk_tables(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        bump_versions(orm_execute_state.session.connection(), [mapper.local_table.name])
@@ -0,0 +1,8 @@
+"""Performance benchmarks for HomeHub (not shipped in the Docker image).
+
+Run modules directly, e.g. ``python -m benchmarks.sqlite_profile``.
+
+- ``datagen``: seeded synthetic household database at small/medium/large scale
+- ``endpoints``: key endpoint timings with JSON results and ``--compare``
+- ``sqlite_profile``: WAL/pragma profile throughput under concurrent writers
+"""
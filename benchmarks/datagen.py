@@ -0,0 +1,193 @@
+"""Seeded synthetic household data for benchmarks.
+
+Fills a SQLite database (schema created by the app's migrations) with a
+realistic mix of reminders, recurring rules, expenses, grocery history,
+shopping items, chores and recipes. The same seed, scale and ``today``
+always produce the same rows (``today`` defaults to the fixed ``ANCHOR_DATE``),
+so timings are comparable between releases.
+
+    python -m benchmarks.datagen --scale large --db /tmp/homehub-bench.db
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+
+from app import db  # noqa: F401 (model metadata)
+from app import models
+from app.migrations import run_migrations
+from app.tags import rebuild_tag_index
+
+SCALES = {
+    # Smoke-test size used by the test suite
+    'small': {
+        'years': 1, 'reminders_per_day': 1, 'recurring_rules': 20, 'expense_entries': 2_000,
+        'grocery_history': 1_000, 'shopping_items': 40, 'chores': 40, 'recipes': 50,
+    },
+    'medium': {
+        'years': 3, 'reminders_per_day': 2, 'recurring_rules': 80, 'expense_entries': 20_000,
+        'grocery_history': 10_000, 'shopping_items': 80, 'chores': 150, 'recipes': 400,
+    },
+    # A busy household after a decade of use
+    'large': {
+        'years': 10, 'reminders_per_day': 3, 'recurring_rules': 200, 'expense_entries': 100_000,
+        'grocery_history': 50_000, 'shopping_items': 150, 'chores': 500, 'recipes': 2_000,
+    },
+}
+
+FAMILY = ['Mom', 'Dad', 'Alice', 'Bob']
+GROCERIES = [
+    'Milk', 'Eggs', 'Bread', 'Butter', 'Rice', 'Apples', 'Bananas', 'Tomatoes', 'Onions', 'Potatoes',
+    'Cheese', 'Yogurt', 'Coffee', 'Tea', 'Sugar', 'Flour', 'Pasta', 'Chicken', 'Spinach', 'Lentils',
+    'Oats', 'Honey', 'Garlic', 'Ginger', 'Soap', 'Detergent', 'Toothpaste', 'Paper towels',
+]
+SHOP_TAGS = ['Costco', 'Dairy', 'Produce', 'Weekly', 'Pharmacy', 'Bakery']
+CHORE_TAGS = FAMILY + ['Weekend', 'Kitchen', 'Garden', 'Monthly']
+RECIPE_TAGS = ['Dessert', 'Quick', 'Vegetarian', 'Breakfast', 'Spicy', 'Kids', 'Party', 'Soup']
+EXPENSE_CATEGORIES = ['Groceries', 'Utilities', 'Rent', 'Transport', 'Dining', 'Health', 'Kids', 'Misc']
+REMINDER_CATEGORIES = ['birthday', 'bill', 'school', 'health', None]
+
+BATCH = 5_000
+# Default "today" for generated history; a fixed date keeps a seed's rows identical on every run
+ANCHOR_DATE = date(2025, 1, 1)
+
+
+def _tags(rng, pool, k_max=3):
+    return json.dumps(rng.sample(pool, rng.randint(0, k_max)))
+
+
+def _insert(conn, model, rows):
+    for i in range(0, len(rows), BATCH):
+        conn.execute(insert(model.__table__), rows[i:i + BATCH])
+
+
+def generate(engine, scale='small', seed=42, today: date | None = None) -> dict:
+    """Populate ``engine``'s database; returns the row counts per table."""
+    params = SCALES[scale] if isinstance(scale, str) else scale
+    rng = random.Random(seed)
+    today = today or ANCHOR_DATE
+    start = today - timedelta(days=365 * params['years'])
+    now = datetime.combine(today, datetime.min.time())
+    run_migrations(engine)
+    counts = {}
+
+    with engine.begin() as conn:
+        # One-off reminders spread over the whole history (plus a month ahead)
+        span = (today - start).days + 30
+        rows = []
+        for _ in range(span * params['reminders_per_day']):
+            d = start + timedelta(days=rng.randrange(span))
+            rows.append({
+                'date': d, 'title': f'Reminder {rng.randrange(10_000)}', 'description': '',
+                'creator': rng.choice(FAMILY), 'category': rng.choice(REMINDER_CATEGORIES),
+                'time': rng.choice([None, '08:00', '18:30']), 'timestamp': now,
+            })
+        _insert(conn, models.Reminder, rows)
+        counts['reminder'] = len(rows)
+
+        # Recurring rules: 60% reminders, 25% expenses, 15% chores
+        n_rules = params['recurring_rules']
+        n_rem, n_exp = int(n_rules * 0.6), int(n_rules * 0.25)
+        n_chore = n_rules - n_rem - n_exp
+        _insert(conn, models.RecurringReminder, [{
+            'title': f'Recurring {i}', 'creator': rng.choice(FAMILY),
+            'interval': rng.choice([1, 1, 2, 3]), 'unit': rng.choice(['day', 'week', 'month', 'year']),
+            'frequency': 'daily', 'monthly_mode': 'day_of_month',
+            'category': rng.choice(REMINDER_CATEGORIES), 'time': rng.choice([None, '09:00']),
+            'start_date': start + timedelta(days=rng.randrange(365)), 'timestamp': now,
+        } for i in range(n_rem)])
+        _insert(conn, models.RecurringExpense, [{
+            'title': f'Subscription {i}', 'unit_price': round(rng.uniform(1, 200), 2), 'default_quantity': 1.0,
+            'frequency': rng.choice(['daily', 'weekly', 'monthly']), 'monthly_mode': 'day_of_month',
+            'category': rng.choice(EXPENSE_CATEGORIES), 'creator': rng.choice(FAMILY),
+            'start_date': start, 'last_generated_date': today, 'timestamp': now,
+        } for i in range(n_exp)])
+        _insert(conn, models.RecurringChore, [{
+            'description': f'Recurring chore {i}', 'creator': rng.choice(FAMILY),
+            'interval': rng.choice([1, 2]), 'unit': rng.choice(['day', 'week', 'month']),
+            'start_date': start, 'tags': _tags(rng, CHORE_TAGS), 'timestamp': now,
+        } for i in range(n_chore)])
+        counts['recurring_rules'] = n_rules
+
+        span = (today - start).days + 1
+        rows = []
+        generated = set()
+        for _ in range(params['expense_entries']):
+            qty = rng.choice([1, 1, 1, 2, 3])
+            price = round(rng.uniform(0.5, 150), 2)
+            row = {
+                'date': start + timedelta(days=rng.randrange(span)), 'title': rng.choice(GROCERIES),
+                'category': rng.choice(EXPENSE_CATEGORIES), 'unit_price': price, 'quantity': qty,
+                'amount': round(price * qty, 2), 'payer': rng.choice(FAMILY), 'timestamp': now,
+                'recurring_id': rng.randint(1, n_exp) if n_exp and rng.random() < 0.1 else None,
+            }
+            # A rule generates at most one entry per date (ux_expense_entry_recurring_date)
+            if row['recurring_id'] is not None:
+                if (row['recurring_id'], row['date']) in generated:
+                    row['recurring_id'] = None
+                else:
+                    generated.add((row['recurring_id'], row['date']))
+            rows.append(row)
+        _insert(conn, models.ExpenseEntry, rows)
+        counts['expense_entry'] = len(rows)
+
+        # Grocery history concentrated in the last year (suggestions use 90 days)
+        _insert(conn, models.GroceryHistory, [{
+            'item': rng.choice(GROCERIES), 'creator': rng.choice(FAMILY),
+            'timestamp': now - timedelta(minutes=rng.randrange(365 * 24 * 60)),
+        } for _ in range(params['grocery_history'])])
+        counts['grocery_history'] = params['grocery_history']
+
+        _insert(conn, models.ShoppingItem, [{
+            'item': rng.choice(GROCERIES), 'checked': rng.random() < 0.3, 'creator': rng.choice(FAMILY),
+            'tags': _tags(rng, SHOP_TAGS), 'timestamp': now - timedelta(hours=rng.randrange(24 * 14)),
+        } for _ in range(params['shopping_items'])])
+        counts['shopping_item'] = params['shopping_items']
+
+        _insert(conn, models.Chore, [{
+            'description': f'Chore {i}', 'creator': rng.choice(FAMILY), 'done': rng.random() < 0.6,
+            'due_date': today + timedelta(days=rng.randint(-60, 30)), 'tags': _tags(rng, CHORE_TAGS),
+            'timestamp': now - timedelta(hours=rng.randrange(24 * 90)),
+        } for i in range(params['chores'])])
+        counts['chore'] = params['chores']
+
+        _insert(conn, models.Recipe, [{
+            'title': f'Recipe {i}', 'link': None, 'creator': rng.choice(FAMILY),
+            'ingredients': '<ul>' + ''.join(f'<li>{g}</li>' for g in rng.sample(GROCERIES, 5)) + '</ul>',
+            'instructions': '<p>Mix and cook.</p>' * rng.randint(1, 5),
+            'tags': _tags(rng, RECIPE_TAGS), 'timestamp': now - timedelta(days=rng.randrange(365 * params['years'])),
+        } for i in range(params['recipes'])])
+        counts['recipe'] = params['recipes']
+
+        _insert(conn, models.HomeStatus, [{'name': n, 'status': rng.choice(['Home', 'Away'])} for n in FAMILY])
+        # Core inserts skip the ORM tag listeners; build the tag index in one go
+        rebuild_tag_index(conn)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', required=True, help='SQLite file to create (must not exist)')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--today', type=date.fromisoformat, default=ANCHOR_DATE,
+                        help=f'date the history ends at (default {ANCHOR_DATE})')
+    args = parser.parse_args(argv)
+    if os.path.exists(args.db):
+        parser.error(f'{args.db} already exists')
+    engine = create_engine('sqlite:///' + os.path.abspath(args.db))
+    t0 = time.perf_counter()
+    counts = generate(engine, args.scale, args.seed, args.today)
+    engine.dispose()
+    for table, n in counts.items():
+        print(f'{table:<18} {n:>9}')
+    print(f'generated in {time.perf_counter() - t0:.1f}s')
+    return counts
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""Time the key HomeHub endpoints against a synthetic database.
+
+Seeds a database with ``benchmarks.datagen`` (or reuses ``--db``), then calls
+each endpoint through the Flask test client and reports pytest-benchmark
+style statistics. Results are written as JSON so two releases can be
+compared:
+
+    python -m benchmarks.endpoints --scale large --output before.json
+    python -m benchmarks.endpoints --scale large --output after.json --compare before.json
+
+The generated history and every date-bound URL are pinned to
+``datagen.ANCHOR_DATE``, so runs on different days measure the same data.
+``--live-date`` uses the real date instead (comparable only within a day).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine
+
+from benchmarks.datagen import ANCHOR_DATE, FAMILY, SCALES, generate
+
+ENDPOINT_NAMES = (
+    'index', 'reminders_month', 'reminders_counts_year', 'expenses_month',
+    'expenses_page', 'shopping_page', 'chores_api', 'recipes_page',
+)
+
+
+def endpoints(today: date) -> list[tuple[str, str]]:
+    """(name, path) per benchmark, with date-bound views pinned to ``today``."""
+    # The home page has no date parameter; it always embeds the real current month
+    return list(zip(ENDPOINT_NAMES, [
+        '/',
+        f'/api/reminders?scope=month&date={today}',
+        f'/api/reminders/counts?from={today - timedelta(days=365)}&to={today}',
+        f'/api/expenses/month?year={today.year}&month={today.month}',
+        f'/expenses?y={today.year}&m={today.month}',
+        '/shopping',
+        '/api/chores',
+        '/recipes',
+    ]))
+
+
+def make_client(db_path):
+    from app import create_app
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.abspath(db_path),
+        'HOMEHUB_CONFIG': {'admin_name': 'Administrator', 'family_members': FAMILY},
+        'WTF_CSRF_ENABLED': False,
+        'SECRET_KEY': 'bench',
+    })
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['authed'] = True
+    return client
+
+
+def stats(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    mean = statistics.fmean(samples)
+    return {
+        'rounds': len(samples),
+        'min': samples[0],
+        'max': samples[-1],
+        'mean': mean,
+        'median': statistics.median(samples),
+        'stddev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'ops': 1.0 / mean if mean else 0.0,
+    }
+
+
+def time_endpoint(client, path, rounds, warmup):
+    for _ in range(warmup):
+        client.get(path)
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        resp = client.get(path)
+        samples.append(time.perf_counter() - t0)
+        if resp.status_code >= 400:
+            raise RuntimeError(f'{path} returned {resp.status_code}')
+    return stats(samples)
+
+
+def _git_describe():
+    try:
+        return subprocess.check_output(['git', 'describe', '--tags', '--always', '--dirty'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def run(db_path, rounds=20, warmup=2, only=None, today: date = ANCHOR_DATE) -> dict:
+    client = make_client(db_path)
+    results = {}
+    for name, path in endpoints(today):
+        if only and name not in only:
+            continue
+        results[name] = dict(path=path, **time_endpoint(client, path, rounds, warmup))
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of benchmarks whose median regressed by more than ``threshold`` (0.1 = 10%)."""
+    regressions = []
+    print(f"\n{'benchmark':<22} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        change = (cur['median'] - base['median']) / base['median'] if base['median'] else 0.0
+        flag = ' REGRESSION' if change > threshold else ''
+        print(f"{name:<22} {base['median'] * 1000:>12.2f} {cur['median'] * 1000:>11.2f} {change:>+8.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', choices=sorted(SCALES), default='medium')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', help='reuse an existing seeded database instead of generating one')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--only', nargs='*', choices=ENDPOINT_NAMES)
+    parser.add_argument('--live-date', action='store_true',
+                        help=f'generate data and query windows for today instead of {ANCHOR_DATE}')
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--compare', help='baseline results JSON; exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed median slowdown (default 0.10)')
+    args = parser.parse_args(argv)
+
+    today = date.today() if args.live_date else ANCHOR_DATE
+    db_path = args.db
+    if not db_path:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='homehub-bench-'), 'bench.db')
+        engine = create_engine('sqlite:///' + db_path)
+        generate(engine, args.scale, args.seed, today=today)
+        engine.dispose()
+
+    benchmarks = run(db_path, args.rounds, args.warmup, args.only, today)
+    print(f"{'benchmark':<22} {'median ms':>10} {'mean ms':>9} {'p95 ms':>8} {'ops/s':>8}")
+    for name, r in benchmarks.items():
+        print(f"{name:<22} {r['median'] * 1000:>10.2f} {r['mean'] * 1000:>9.2f} {r['p95'] * 1000:>8.2f} {r['ops']:>8.1f}")
+
+    payload = {
+        'generated_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'commit': _git_describe(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'scale': None if args.db else args.scale,
+        'seed': args.seed,
+        'today': today.isoformat(),
+        'benchmarks': benchmarks,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('benchmarks', {})
+        if compare(benchmarks, baseline, args.threshold):
+            raise SystemExit(1)
+    return payload
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Time the month view's merge of stored and synthesized recurring reminders.
+
+Seeds ``--rules`` daily recurring reminders plus ``--stored`` stored
+reminders in one month (a quarter of them materialized occurrences of a
+rule), then times ``/api/reminders?scope=month`` for that month:
+
+    python -m benchmarks.reminders_merge --rules 200 --stored 2000 --output merge.json
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine
+
+from app import models
+from app.migrations import run_migrations
+from benchmarks.datagen import FAMILY, REMINDER_CATEGORIES, _insert
+from benchmarks.endpoints import make_client, time_endpoint
+
+MONTH = date(2025, 3, 1)
+DAYS = 31
+
+
+def generate(engine, rules=200, stored=2000, seed=42) -> dict:
+    rng = random.Random(seed)
+    now = datetime.combine(MONTH, datetime.min.time())
+    run_migrations(engine)
+    with engine.begin() as conn:
+        _insert(conn, models.RecurringReminder, [{
+            'title': f'Recurring {i}', 'creator': rng.choice(FAMILY), 'interval': 1, 'unit': 'day',
+            'frequency': 'daily', 'category': rng.choice(REMINDER_CATEGORIES),
+            'start_date': MONTH - timedelta(days=rng.randrange(5 * 365)), 'timestamp': now,
+        } for i in range(rules)])
+        _insert(conn, models.Reminder, [{
+            'date': MONTH + timedelta(days=rng.randrange(DAYS)), 'title': f'Reminder {i}',
+            'creator': rng.choice(FAMILY), 'category': rng.choice(REMINDER_CATEGORIES),
+            'recurring_id': rng.randint(1, rules) if rules and i % 4 == 0 else None, 'timestamp': now,
+        } for i in range(stored)])
+    return {'recurring_reminder': rules, 'reminder': stored}
+
+
+def run(db_path, rounds=20, warmup=2) -> dict:
+    client = make_client(db_path)
+    path = '/api/reminders?scope=month&date=' + MONTH.isoformat()
+    return {'reminders_merge': dict(path=path, **time_endpoint(client, path, rounds, warmup))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', type=int, default=200)
+    parser.add_argument('--stored', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--output', help='write results JSON to this file')
+    args = parser.parse_args(argv)
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix='homehub-bench-'), 'merge.db')
+    engine = create_engine('sqlite:///' + db_path)
+    generate(engine, args.rules, args.stored, args.seed)
+    engine.dispose()
+
+    benchmarks = run(db_path, args.rounds, args.warmup)
+    r = benchmarks['reminders_merge']
+    print(f"{args.rules} rules x {DAYS} days x {args.stored} stored: "
+          f"median {r['median'] * 1000:.2f} ms, p95 {r['p95'] * 1000:.2f} ms")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'benchmarks': benchmarks}, f, indent=2)
+    return benchmarks
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""Compare SQLite read/write throughput with and without the tuned profile.
+
+Simulates the media worker committing progress rows while request handlers
+read and write reminders: N writer threads and M reader threads hammer a
+temporary database for a fixed duration under each profile.
+
+    python -m benchmarks.sqlite_profile --writers 4 --readers 4 --seconds 5
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import DATABASE_DEFAULTS
+from app.database import configure_engine, engine_options
+
+PROFILES = {
+    'legacy': None,  # bare engine, as create_app built it before the database: section
+    'tuned': DATABASE_DEFAULTS,
+}
+
+
+def _setup(engine):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE reminder (id INTEGER PRIMARY KEY, date DATE, title TEXT, creator TEXT)"))
+        conn.execute(text("CREATE INDEX ix_reminder_date ON reminder(date)"))
+        conn.execute(text("CREATE TABLE media (id INTEGER PRIMARY KEY, progress TEXT)"))
+        start = date(2024, 1, 1)
+        conn.execute(
+            text("INSERT INTO reminder(date, title, creator) VALUES (:d, :t, 'Alice')"),
+            [{'d': start + timedelta(days=i % 730), 't': f'Reminder {i}'} for i in range(5000)],
+        )
+        conn.execute(text("INSERT INTO media(id, progress) VALUES (1, '0%')"))
+
+
+def run_profile(name, settings, writers, readers, seconds):
+    tmpdir = tempfile.mkdtemp(prefix='homehub-bench-')
+    uri = 'sqlite:///' + os.path.join(tmpdir, 'bench.db')
+    if settings is None:
+        engine = create_engine(uri)
+    else:
+        engine = create_engine(uri, **engine_options(settings, uri))
+        configure_engine(engine, settings)
+    _setup(engine)
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+    write_latencies = []
+
+    def writer(idx):
+        n = 0
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    if idx == 0:
+                        conn.execute(text("UPDATE media SET progress=:p WHERE id=1"), {'p': f'{n % 100}%'})
+                    else:
+                        conn.execute(text("INSERT INTO reminder(date, title, creator) VALUES (:d, 'x', 'Bob')"), {'d': date(2025, 1, 1)})
+                with lock:
+                    counts['writes'] += 1
+                    write_latencies.append(time.perf_counter() - t0)
+            except OperationalError:
+                with lock:
+                    counts['locked'] += 1
+            n += 1
+
+    def reader():
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text(
+                        "SELECT id, title FROM reminder WHERE date BETWEEN '2024-03-01' AND '2024-03-31'"
+                    )).fetchall()
+                with lock:
+                    counts['reads'] += 1
+            except OperationalError:
+                with lock:
+                    counts['locked'] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    write_latencies.sort()
+    p99 = write_latencies[int(len(write_latencies) * 0.99) - 1] if write_latencies else 0.0
+    return {
+        'profile': name,
+        'reads_per_s': round(counts['reads'] / seconds, 1),
+        'writes_per_s': round(counts['writes'] / seconds, 1),
+        'locked_errors': counts['locked'],
+        'write_p99_ms': round(p99 * 1000, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args(argv)
+    results = [run_profile(name, settings, args.writers, args.readers, args.seconds) for name, settings in PROFILES.items()]
+    print(f"{'profile':<8} {'reads/s':>10} {'writes/s':>10} {'locked':>8} {'write p99 ms':>13}")
+    for r in results:
+        print(f"{r['profile']:<8} {r['reads_per_s']:>10} {r['writes_per_s']:>10} {r['locked_errors']:>8} {r['write_p99_ms']:>13}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
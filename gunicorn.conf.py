@@ -0,0 +1,30 @@
+"""Gunicorn settings, overridable with environment variables.
+
+The defaults (one gthread worker with 16 threads) let a slow request such as a
+large upload no longer stall the dashboard for everyone. For several
+processes set GUNICORN_WORKERS; background jobs, caches and sessions are
+shared through the database and data/secret_key, so any worker count works.
+Each open /api/events live stream occupies a thread; HOMEHUB_EVENTS_MAX_CLIENTS
+(default 8) caps them per worker so the rest stay free for requests.
+
+    GUNICORN_WORKERS=2 GUNICORN_THREADS=4 gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '16'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+
+
+def on_starting(server):
+    # Apply schema migrations once in the master so workers don't race on first boot
+    from app import create_app, db
+    app = create_app({'HOMEHUB_JOBS': False})
+    with app.app_context():
+        db.engine.dispose()
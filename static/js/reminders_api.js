@@ -2,7 +2,14 @@
 window.remindersApi = (function(){
   async function list(scope, dateStr){
     const params = new URLSearchParams({scope: scope||'day', date: dateStr});
-    const r = await fetch('/api/reminders?'+params.toString());
+    // no-cache: revalidate with the server's ETag; unchanged months come back as 304
+    const r = await fetch('/api/reminders?'+params.toString(), {cache: 'no-cache'});
+    return r.json();
+  }
+  // Rows changed or deleted since a cursor from an earlier page/changes call
+  async function changes(since){
+    const params = new URLSearchParams(since ? {since} : {});
+    const r = await fetch('/api/reminders/changes?'+params.toString(), {cache: 'no-store'});
     return r.json();
   }
   async function create(data){
@@ -13,6 +20,11 @@ window.remindersApi = (function(){
     const r = await fetch('/api/reminders/'+id, {method:'PATCH', headers:{'Content-Type':'application/json'}, body: JSON.stringify(data)});
     return r.json();
   }
+  // operations: [{op:'create', ...}, {op:'update', id, ...}]; one request, one transaction
+  async function batch(operations){
+    const r = await fetch('/api/reminders/batch', {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({operations})});
+    return r.json();
+  }
   async function removeMany(ids, creator){
     const r = await fetch('/api/reminders', {method:'DELETE', headers:{'Content-Type':'application/json'}, body: JSON.stringify({ids, creator})});
     return r.json();
@@ -25,5 +37,5 @@ window.remindersApi = (function(){
     const r = await fetch('/api/recurring_rules/'+id, {method:'DELETE', headers:{'Content-Type':'application/json'}, body: JSON.stringify({creator})});
     return r.json();
   }
-  return {list, create, update, removeMany, updateRule, deleteRule};
+  return {list, changes, create, update, batch, removeMany, updateRule, deleteRule};
 })();
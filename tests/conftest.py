@@ -0,0 +1,57 @@
+"""Shared fixtures: an app on an in-memory database and a signed-in client.
+
+A module that needs a different config overrides ``homehub_config``; one
+that needs more setup overrides ``app`` and requests the original by name.
+"""
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from app.blueprints import auth
+
+
+@pytest.fixture()
+def homehub_config():
+    return {'admin_name': 'Administrator', 'family_members': ['Alice', 'Bob']}
+
+
+@pytest.fixture()
+def app(homehub_config, monkeypatch):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'HOMEHUB_CONFIG': homehub_config,
+        'WTF_CSRF_ENABLED': False,
+        'SECRET_KEY': 'test',
+    })
+    monkeypatch.setattr(auth, 'get_config', lambda: homehub_config)
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture()
+def client(app):
+    c = app.test_client()
+    with c.session_transaction() as sess:
+        sess['authed'] = True
+    return c
+
+
+@pytest.fixture()
+def count_statements(app):
+    """``count_statements(fn)`` -> (fn's result, SQL statements it issued).
+
+    With ``parameters=True`` each statement comes as ``(sql, parameters)``.
+    """
+    def count(fn, parameters=False):
+        statements = []
+
+        def capture(conn, cursor, statement, params, context, executemany):
+            statements.append((statement, params) if parameters else statement)
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            result = fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        return result, statements
+    return count
@@ -0,0 +1,34 @@
+from sqlalchemy import create_engine, text
+
+from benchmarks import datagen, endpoints
+
+
+def test_datagen_is_seeded_and_endpoints_run(tmp_path):
+    db_path = tmp_path / 'bench.db'
+    engine = create_engine('sqlite:///' + str(db_path))
+    counts = datagen.generate(engine, 'small', seed=7)
+    with engine.connect() as conn:
+        first = conn.execute(text("SELECT title, date FROM reminder ORDER BY id LIMIT 5")).fetchall()
+        assert conn.execute(text("SELECT COUNT(*) FROM expense_entry")).scalar() == counts['expense_entry']
+        assert conn.execute(text("SELECT COUNT(*) FROM item_tag")).scalar() > 0
+    engine.dispose()
+
+    other = create_engine('sqlite:///' + str(tmp_path / 'again.db'))
+    datagen.generate(other, 'small', seed=7)
+    with other.connect() as conn:
+        assert conn.execute(text("SELECT title, date FROM reminder ORDER BY id LIMIT 5")).fetchall() == first
+    other.dispose()
+
+    results = endpoints.run(str(db_path), rounds=1, warmup=0, only=['shopping_page', 'chores_api'])
+    assert set(results) == {'shopping_page', 'chores_api'}
+    assert results['chores_api']['rounds'] == 1
+
+
+def test_reminders_merge_benchmark_runs(tmp_path):
+    from benchmarks import reminders_merge
+    db_path = tmp_path / 'merge.db'
+    engine = create_engine('sqlite:///' + str(db_path))
+    assert reminders_merge.generate(engine, rules=5, stored=40) == {'recurring_reminder': 5, 'reminder': 40}
+    engine.dispose()
+    results = reminders_merge.run(str(db_path), rounds=1, warmup=0)
+    assert results['reminders_merge']['rounds'] == 1
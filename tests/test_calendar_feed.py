@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import db
+from app.ics import fold
+from app.models import Reminder, RecurringReminder
+
+CONFIG = {
+    'admin_name': 'Administrator',
+    'family_members': ['Alice', 'Bob'],
+    'instance_name': 'Test Home',
+    'password_hash': 'x',
+    'calendar_feed_token': 'feed-secret',
+}
+
+
+@pytest.fixture()
+def homehub_config():
+    return CONFIG
+
+
+def _events(body: str) -> list[str]:
+    unfolded = body.replace('\r\n ', '')
+    return unfolded.split('BEGIN:VEVENT')[1:]
+
+
+def test_feed_requires_token_and_streams_events(app):
+    today = date.today()
+    first = today.replace(day=1)
+    db.session.add_all([
+        Reminder(date=today, title='Dentist, 3rd floor', creator='Alice', time='09:15', category='health'),
+        Reminder(date=today - timedelta(days=400), title='Ancient', creator='Alice'),
+        RecurringReminder(title='Bins', creator='Bob', interval=2, unit='week', start_date=first,
+                          end_date=first + timedelta(days=90)),
+        RecurringReminder(title='Rent', creator='Bob', interval=1, unit='month', start_date=date(2024, 1, 31)),
+    ])
+    db.session.commit()
+    client = app.test_client()
+    assert client.get('/calendar.ics').status_code == 302  # login redirect
+    assert client.get('/calendar.ics?token=wrong').status_code == 302
+
+    resp = client.get('/calendar.ics?token=feed-secret')
+    assert resp.status_code == 200
+    assert resp.mimetype == 'text/calendar'
+    body = resp.get_data(as_text=True)
+    assert body.startswith('BEGIN:VCALENDAR\r\n') and body.endswith('END:VCALENDAR\r\n')
+    assert 'X-WR-CALNAME:Test Home' in body
+    events = _events(body)
+    dentist = next(e for e in events if 'Dentist' in e)
+    assert 'SUMMARY:Dentist\\, 3rd floor' in dentist
+    assert f'DTSTART:{today:%Y%m%d}T091500' in dentist
+    assert 'Ancient' not in body
+    bins = next(e for e in events if 'Bins' in e)
+    until = first + timedelta(days=90)
+    assert f'RRULE:FREQ=WEEKLY;INTERVAL=2;UNTIL={until:%Y%m%d}' in bins
+    # Month-end rules clamp (Jan 31 -> Feb 29 -> Mar 29 ...), which RRULE cannot express: expanded
+    rent = [e for e in events if 'Rent' in e]
+    assert len(rent) > 10 and not any('RRULE' in e for e in rent)
+
+    only_bob = client.get('/calendar.ics?token=feed-secret&creator=Bob').get_data(as_text=True)
+    assert 'Dentist' not in only_bob and 'Bins' in only_bob
+
+
+def test_stored_occurrence_overrides_rrule_instance(app):
+    start = date.today().replace(day=1)
+    rule = RecurringReminder(title='Piano', creator='Alice', interval=1, unit='week', start_date=start, time='17:00')
+    db.session.add(rule)
+    db.session.commit()
+    db.session.add(Reminder(date=start + timedelta(days=7), title='Piano (recital)', creator='Alice',
+                            time='18:00', recurring_id=rule.id))
+    db.session.commit()
+    body = app.test_client().get('/calendar.ics?token=feed-secret').get_data(as_text=True)
+    override = next(e for e in _events(body) if 'recital' in e)
+    assert f'UID:rule-{rule.id}@homehub' in override
+    assert f'RECURRENCE-ID:{start + timedelta(days=7):%Y%m%d}T170000' in override
+
+
+def test_feed_revalidates_with_304(app):
+    client = app.test_client()
+    first = client.get('/calendar.ics?token=feed-secret')
+    etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+    assert client.get('/calendar.ics?token=feed-secret', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/calendar.ics?token=feed-secret',
+                      headers={'If-Modified-Since': last_modified}).status_code == 304
+    db.session.add(Reminder(date=date.today(), title='New', creator='Bob'))
+    db.session.commit()
+    assert client.get('/calendar.ics?token=feed-secret', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_fold_keeps_lines_short_and_utf8_intact():
+    line = 'SUMMARY:' + 'é' * 80
+    folded = fold(line)
+    assert all(len(part.encode('utf-8')) <= 75 for part in folded.rstrip('\r\n').split('\r\n'))
+    assert folded.replace('\r\n ', '').rstrip('\r\n') == line
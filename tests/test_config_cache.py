@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+import app.config as homehub_config
+
+
+@pytest.fixture()
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / 'config.yml'
+    path.write_text("admin_name: Boss\nfamily_members: [Alice, Bob, Alice]\n", encoding='utf-8')
+    monkeypatch.setattr(homehub_config, 'CONFIG_PATH', str(path))
+    homehub_config.invalidate_config_cache()
+    yield path
+    homehub_config.invalidate_config_cache()
+
+
+def _bump_mtime(path, seconds=5):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_config_parsed_once_until_file_changes(config_file, monkeypatch):
+    calls = []
+    real_load = homehub_config.load_config
+
+    def counting_load():
+        calls.append(1)
+        return real_load()
+
+    monkeypatch.setattr(homehub_config, 'load_config', counting_load)
+    first = homehub_config.get_config()
+    second = homehub_config.get_config()
+    assert first is second
+    assert len(calls) == 1
+
+    config_file.write_text("admin_name: Chief\nfamily_members: [Carol]\n", encoding='utf-8')
+    _bump_mtime(config_file)
+    third = homehub_config.get_config()
+    assert len(calls) == 2
+    assert third['admin_name'] == 'Chief'
+
+
+def test_broken_reload_keeps_last_good_config(config_file):
+    good = homehub_config.get_config()
+    config_file.write_text("admin_name: [unclosed\n", encoding='utf-8')
+    _bump_mtime(config_file)
+    assert homehub_config.get_config() is good
+
+
+def test_derived_values_precomputed_per_version(config_file):
+    cfg = homehub_config.get_config()
+    assert homehub_config.get_admin_aliases(cfg) == {'Boss', 'Administrator', 'admin'}
+    assert homehub_config.get_family_members(cfg) == ('Alice', 'Bob')
+    assert homehub_config.get_family_set(cfg) == {'Alice', 'Bob'}
+    assert homehub_config.get_reminder_categories(cfg) == []
+    # Same config object -> same derived object (no recomputation)
+    assert homehub_config.get_admin_aliases(cfg) is homehub_config.get_admin_aliases(homehub_config.get_config())
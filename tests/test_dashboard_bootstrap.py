@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+
+from app import db
+from app.cache import cache_set
+from app.models import Chore, HomeStatus, Notice, Reminder, RecurringReminder
+
+CONFIG = {
+    'admin_name': 'Administrator',
+    'family_members': ['Alice', 'Bob'],
+    'feature_toggles': {'chores': True, 'show_chores_on_homepage': True},
+    'weather': {'enabled': True, 'latitude': '51.5', 'longitude': '-0.12'},
+}
+
+
+@pytest.fixture()
+def homehub_config():
+    return CONFIG
+
+
+def test_bootstrap_returns_every_section(app, client):
+    db.session.add_all([
+        Notice(content='Bins out tonight', updated_by='Alice'),
+        HomeStatus(name='Alice', status='Home'),
+        Chore(description='Hoover', creator='Bob', due_date=date(2025, 6, 2)),
+        Reminder(date=date(2025, 6, 3), title='Dentist', creator='Alice'),
+        RecurringReminder(title='Bins', creator='Bob', interval=1, unit='week', start_date=date(2025, 6, 1)),
+    ])
+    db.session.commit()
+    cache_set('weather:51.500,-0.120|temperature_2m||auto', {'current': {'temperature_2m': 14}}, 900)
+
+    data = client.get('/api/dashboard/bootstrap?date=2025-06-15').get_json()
+    assert data['ok'] and data['date'] == '2025-06-01'
+    assert data['notice']['content'] == 'Bins out tonight'
+    assert data['who_statuses'] == {'Alice': 'Home'}
+    assert data['member_statuses'] == {}
+    assert [c['description'] for c in data['chores']] == ['Hoover']
+    assert data['reminders']['scope'] == 'month'
+    titles = [r['title'] for r in data['reminders']['reminders']]
+    assert titles.count('Bins') == 5 and 'Dentist' in titles
+    assert data['weather'] == {'current': {'temperature_2m': 14}}
+
+
+def test_sections_are_cached_until_their_tables_change(app, client, count_statements):
+    url = '/api/dashboard/bootstrap?date=2025-06-01'
+    first = client.get(url).get_json()
+    warm, statements = count_statements(lambda: client.get(url).get_json())
+    assert warm == first
+    # Section versions, section cache, presence versions, weather cache
+    assert len([s for s in statements if s.lstrip().upper().startswith('SELECT')]) == 4
+    assert not any(s.lstrip().upper().startswith('INSERT') for s in statements)
+
+    client.post('/whoishome', data={'name': 'Bob', 'status': 'Out'})
+    data, statements = count_statements(lambda: client.get(url).get_json())
+    assert data['who_statuses'] == {'Bob': 'Out'}
+    # The write updated the presence snapshot in place; nothing was rebuilt
+    assert not any('FROM home_status' in s or 'FROM reminder' in s for s in statements)
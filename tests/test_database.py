@@ -0,0 +1,56 @@
+from sqlalchemy import text
+
+from app import create_app, db
+from app.database import build_pragmas
+
+
+def make_app(db_uri, database=None):
+    homehub_config = {
+        'admin_name': 'Administrator',
+        'family_members': ['Alice', 'Bob'],
+    }
+    if database is not None:
+        homehub_config['database'] = database
+    test_config = {
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': db_uri,
+        'HOMEHUB_CONFIG': homehub_config,
+        'WTF_CSRF_ENABLED': False,
+        'SECRET_KEY': 'test',
+    }
+    return create_app(test_config)
+
+
+def _pragma(name):
+    return db.session.execute(text(f'PRAGMA {name}')).scalar()
+
+
+def test_default_profile_applied_to_file_database(tmp_path):
+    app = make_app('sqlite:///' + str(tmp_path / 'perf.db'))
+    with app.app_context():
+        assert _pragma('journal_mode') == 'wal'
+        assert _pragma('busy_timeout') == 5000
+        assert _pragma('synchronous') == 1  # NORMAL
+        assert _pragma('cache_size') == -16384
+        assert _pragma('temp_store') == 2  # MEMORY
+        assert db.engine.pool.size() == 5
+
+
+def test_custom_profile_and_invalid_values(tmp_path):
+    app = make_app('sqlite:///' + str(tmp_path / 'custom.db'), {
+        'journal_mode': 'delete',
+        'busy_timeout_ms': 250,
+        'synchronous': 'bogus',
+        'pool_size': 2,
+    })
+    with app.app_context():
+        assert _pragma('journal_mode') == 'delete'
+        assert _pragma('busy_timeout') == 250
+        assert _pragma('synchronous') == 1  # invalid value falls back to NORMAL
+        assert db.engine.pool.size() == 2
+
+
+def test_build_pragmas_orders_busy_timeout_first():
+    pragmas = build_pragmas({'mmap_size_mb': 1})
+    assert pragmas[0][0] == 'busy_timeout'
+    assert dict(pragmas)['mmap_size'] == 1024 * 1024
@@ -0,0 +1,124 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app import db, dispatcher
+from app.dispatcher import TimerWheel, from_tick, to_tick
+from app.models import RecurringReminder, Reminder
+from app.settings import get_setting
+
+CONFIG = {
+    'admin_name': 'Administrator',
+    'family_members': ['Alice', 'Bob'],
+    'reminder_notifications': {'sinks': ['test'], 'all_day_time': '07:30'},
+}
+DAY = date(2030, 1, 7)
+MORNING = datetime(2030, 1, 7, 8, 0)
+
+
+@pytest.fixture()
+def homehub_config():
+    return CONFIG
+
+
+@pytest.fixture()
+def sink(monkeypatch):
+    """A test sink recording titles in ``got``; it raises while ``fail`` is positive."""
+    def sink(config, events):
+        if sink.fail:
+            sink.fail -= 1
+            raise RuntimeError('receiver down')
+        sink.got.extend(ev['title'] for ev in events)
+    sink.got, sink.fail = [], 0
+    monkeypatch.setitem(dispatcher._sinks, 'test', sink)
+    return sink
+
+
+def test_timer_wheel_fires_each_timer_on_its_minute():
+    start = to_tick(MORNING)
+    wheel = TimerWheel(start)
+    offsets = [0, 1, 59, 60, 61, 185, 1439, 1440, 3 * 1440 + 7, 8 * 1440 + 5, 12 * 1440]
+    for offset in offsets:
+        wheel.schedule(('t', offset), start + offset, offset)
+    wheel.schedule(('t', 'gone'), start + 90, 'gone')
+    wheel.cancel(('t', 'gone'))
+    fired = {}
+    for tick in range(start, start + 12 * 1440 + 1):
+        for due, key, item in wheel.advance(tick):
+            fired[item] = tick
+    assert fired == {offset: start + offset for offset in offsets}
+    assert len(wheel) == 0
+
+
+def test_due_reminders_and_rule_occurrences_are_delivered_once(app, sink):
+    db.session.add_all([
+        Reminder(date=DAY, time='08:05', title='Dentist'),
+        Reminder(date=DAY + timedelta(days=1), title='All day'),
+        RecurringReminder(title='Pills', interval=1, unit='day', start_date=DAY, time='08:10'),
+    ])
+    db.session.commit()
+    dispatcher.dispatch(CONFIG, now=MORNING)
+    assert sink.got == []
+    dispatcher.dispatch(CONFIG, now=MORNING + timedelta(minutes=5))
+    assert sink.got == ['Dentist']
+    dispatcher.dispatch(CONFIG, now=MORNING + timedelta(minutes=12))
+    assert sink.got == ['Dentist', 'Pills']
+    assert get_setting(dispatcher.HWM_SETTING) == '2030-01-07T08:12'
+
+    # A new lease holder resumes from the high-water mark without repeats
+    dispatcher.reset()
+    dispatcher.dispatch(CONFIG, now=datetime(2030, 1, 8, 7, 30), rebuild=True)
+    assert sink.got == ['Dentist', 'Pills', 'All day']
+
+
+def test_edits_reschedule_incrementally(app, client, sink):
+    r = Reminder(date=DAY, time='08:05', title='Call plumber', creator='Alice')
+    db.session.add(r)
+    db.session.commit()
+    rid = r.id
+    dispatcher.dispatch(CONFIG, now=MORNING)
+    assert ('reminder', rid) in dispatcher._state['wheel']
+
+    resp = client.patch(f'/api/reminders/{rid}', json={'title': 'Call plumber', 'time': '08:20', 'creator': 'Alice'})
+    assert resp.get_json()['ok']
+    dispatcher.dispatch(CONFIG, now=MORNING + timedelta(minutes=10))
+    assert sink.got == []
+    dispatcher.dispatch(CONFIG, now=MORNING + timedelta(minutes=20))
+    assert sink.got == ['Call plumber']
+
+    # Deleting a stored override brings its rule's occurrence back
+    rule = RecurringReminder(title='Bins', creator='Alice', interval=1, unit='day', start_date=DAY, time='09:00')
+    db.session.add(rule)
+    db.session.commit()
+    override = Reminder(date=DAY, time='09:00', title='Bins (late)', creator='Alice', recurring_id=rule.id)
+    db.session.add(override)
+    db.session.commit()
+    dispatcher.dispatch(CONFIG, now=MORNING + timedelta(minutes=21))
+    assert ('rule', rule.id, DAY.isoformat()) not in dispatcher._state['wheel']
+    client.post(f'/calendar/delete/{override.id}', data={'user': 'Alice'})
+    dispatcher.dispatch(CONFIG, now=MORNING + timedelta(minutes=22))
+    assert ('rule', rule.id, DAY.isoformat()) in dispatcher._state['wheel']
+
+
+def test_failed_sink_is_retried_and_holds_the_high_water_mark(app, sink):
+    db.session.add(Reminder(date=DAY, time='08:01', title='Water plants'))
+    db.session.commit()
+    sink.fail = 1
+    dispatcher.dispatch(CONFIG, now=MORNING)
+    dispatcher.dispatch(CONFIG, now=MORNING + timedelta(minutes=1))
+    assert sink.got == []
+    assert get_setting(dispatcher.HWM_SETTING) == '2030-01-07T08:00'
+    dispatcher.dispatch(CONFIG, now=MORNING + timedelta(minutes=2))
+    assert sink.got == ['Water plants']
+    assert get_setting(dispatcher.HWM_SETTING) == '2030-01-07T08:02'
+
+
+def test_events_sink_feeds_the_due_endpoint(client, homehub_config, monkeypatch):
+    monkeypatch.setitem(homehub_config, 'reminder_notifications', {'sinks': ['events']})
+    db.session.add(Reminder(date=DAY, time='08:01', title='Leave for school'))
+    db.session.commit()
+    dispatcher.dispatch(homehub_config, now=MORNING)
+    dispatcher.dispatch(homehub_config, now=MORNING + timedelta(minutes=1))
+    due = client.get('/api/reminders/due').get_json()['due']
+    assert [(ev['title'], ev['due_at']) for ev in due] == [('Leave for school', '2030-01-07T08:01')]
+    assert from_tick(to_tick(MORNING)) == MORNING
@@ -0,0 +1,59 @@
+from datetime import date
+
+from app import db
+from app import settings
+from app.models import Chore, ShoppingItem
+from app.versions import get_versions
+
+
+def test_flush_and_bulk_writes_bump_versions(app):
+    before = get_versions(['shopping_item', 'chore', 'app_setting'])
+    db.session.add(ShoppingItem(item='Milk', creator='Alice'))
+    db.session.add(Chore(description='Dishes', creator='Bob'))
+    db.session.commit()
+    after_insert = get_versions(['shopping_item', 'chore'])
+    assert after_insert['shopping_item'] == before['shopping_item'] + 1
+    assert after_insert['chore'] == before['chore'] + 1
+
+    ShoppingItem.query.filter_by(item='Milk').delete()
+    db.session.commit()
+    assert get_versions(['shopping_item'])['shopping_item'] == after_insert['shopping_item'] + 1
+    assert get_versions(['chore'])['chore'] == after_insert['chore']
+
+    settings.set_setting('currency', '$')
+    assert get_versions(['app_setting'])['app_setting'] == before['app_setting'] + 1
+
+
+def test_matching_etag_returns_304_without_running_the_view(app, client, count_statements):
+    first = client.get('/api/shopping')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert etag.startswith('W/"')
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    cached, statements = count_statements(lambda: client.get('/api/shopping', headers={'If-None-Match': etag}))
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert not [s for s in statements if 'shopping_item' in s and 'data_version' not in s]
+
+    # Different args are a different resource
+    assert client.get('/api/shopping?tags=Dairy', headers={'If-None-Match': etag}).status_code == 200
+
+    db.session.add(ShoppingItem(item='Eggs', creator='Bob'))
+    db.session.commit()
+    changed = client.get('/api/shopping', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert [i['item'] for i in changed.get_json()] == ['Eggs']
+
+
+def test_reminders_etag_changes_with_rules(client):
+    month = f"/api/reminders?scope=month&date={date.today().replace(day=1).isoformat()}"
+    etag = client.get(month).headers['ETag']
+    assert client.get(month, headers={'If-None-Match': etag}).status_code == 304
+    resp = client.post('/api/reminders', json={
+        'date': date.today().isoformat(), 'title': 'Bins', 'creator': 'Alice',
+        'recurring': {'interval': 1, 'unit': 'week'},
+    })
+    assert resp.status_code == 200
+    assert client.get(month, headers={'If-None-Match': etag}).status_code == 200
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from app import db, events
+from app.models import HomeStatus, ShoppingItem
+from app.versions import bump_versions
+
+
+@pytest.fixture()
+def app(app, monkeypatch):
+    # Isolate the process-wide bus; tests drive the version watcher by hand
+    monkeypatch.setattr(events, '_subscribers', set())
+    monkeypatch.setattr(events, '_seen', {})
+    monkeypatch.setattr(events, '_watcher', None)
+    monkeypatch.setattr(events, '_watch_versions', lambda app: None)
+    monkeypatch.setattr(events, 'HEARTBEAT_SECONDS', 0.01)
+    monkeypatch.setattr(events, 'STREAM_SECONDS', 0.5)
+    return app
+
+
+def _payloads(chunks) -> list[dict]:
+    out = []
+    for chunk in chunks:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        out += [json.loads(line[6:]) for line in text.splitlines() if line.startswith('data: ')]
+    return out
+
+
+def test_stream_carries_committed_writes_only(app, client):
+    resp = client.get('/api/events', buffered=False)
+    assert resp.status_code == 200
+    assert resp.mimetype == 'text/event-stream'
+    assert events.subscriber_count() == 1
+
+    item = ShoppingItem(item='Milk', creator='Alice')
+    db.session.add(item)
+    db.session.commit()
+    db.session.add(ShoppingItem(item='Never', creator='Alice'))
+    db.session.flush()
+    db.session.rollback()
+    item.checked = True
+    db.session.commit()
+    item_id = item.id
+    db.session.delete(item)
+    db.session.commit()
+
+    payloads = _payloads(resp.response)  # ends after STREAM_SECONDS
+    assert [(p['entity'], p['id'], p['op']) for p in payloads] == [
+        ('shopping_item', item_id, 'insert'),
+        ('shopping_item', item_id, 'update'),
+        ('shopping_item', item_id, 'delete'),
+    ]
+    versions = [p['version'] for p in payloads]
+    assert versions == sorted(versions) and len(set(versions)) == 3
+    assert events.subscriber_count() == 0
+
+
+def test_slow_subscriber_gets_one_resync(app, monkeypatch):
+    monkeypatch.setattr(events, 'QUEUE_SIZE', 2)
+    sub = events.subscribe(app)
+    events.publish([{'entity': 'shopping_item', 'id': i, 'op': 'insert', 'version': i} for i in range(1, 6)])
+    assert sub.overflowed
+    stream = events.stream(sub)
+    assert next(stream).startswith('retry:')
+    assert _payloads([next(stream)]) == [{'op': 'resync'}]
+    assert next(stream) == ': ping\n\n'
+    stream.close()
+    assert events.subscriber_count() == 0
+
+
+def test_subscriber_cap_returns_503(app, client, monkeypatch):
+    monkeypatch.setattr(events, 'MAX_SUBSCRIBERS', 0)
+    resp = client.get('/api/events')
+    assert resp.status_code == 503
+    assert resp.headers['Retry-After'] == '30'
+
+
+def test_watcher_reports_writes_from_other_workers(app):
+    sub = events.subscribe(app)
+    db.session.add(HomeStatus(name='Alice', status='Home'))
+    db.session.commit()
+    while not sub.queue.empty():
+        sub.queue.get_nowait()
+    events.poll_versions(app)
+    assert sub.queue.empty()  # already published locally
+    # Raw SQL bump: what a write in another process looks like from here
+    with db.engine.begin() as conn:
+        bump_versions(conn, ['home_status'])
+    events.poll_versions(app)
+    _, payload = sub.queue.get_nowait()
+    assert payload['entity'] == 'home_status' and payload['op'] == 'change'
+    events.unsubscribe(sub)
+
+
+def test_household_status_endpoint(app, client):
+    client.post('/whoishome', data={'name': 'Alice', 'status': 'Home'})
+    client.post('/status/update', data={'name': 'Bob', 'text': 'At work'})
+    data = client.get('/api/household_status').get_json()
+    assert data['who_statuses'] == {'Alice': 'Home'}
+    assert data['member_statuses'] == {'Bob': 'At work'}
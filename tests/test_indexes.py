@@ -0,0 +1,58 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func
+
+from app import db
+from app.models import Chore, ExpenseEntry, ExpiryItem, GroceryHistory, HomeStatus, MemberStatus, Reminder
+
+
+@pytest.fixture()
+def query_plan(count_statements):
+    """``query_plan(query)`` runs ``query`` and returns SQLite's EXPLAIN QUERY PLAN for the SQL it issued."""
+    def plan(query) -> str:
+        _, statements = count_statements(query.all, parameters=True)
+        statement, parameters = statements[-1]
+        rows = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+        return '\n'.join(row[-1] for row in rows)
+    return plan
+
+
+def test_reminder_month_range_uses_date_index(query_plan):
+    start = date(2025, 3, 1)
+    plan = query_plan(Reminder.query.filter(Reminder.date >= start, Reminder.date <= start + timedelta(days=30)))
+    assert 'ix_reminder_date' in plan
+    assert 'SCAN reminder' not in plan
+
+
+def test_expense_queries_use_indexes(query_plan):
+    plan = query_plan(ExpenseEntry.query.filter(ExpenseEntry.date >= date(2025, 3, 1), ExpenseEntry.date <= date(2025, 3, 31)))
+    assert 'ix_expense_entry_date' in plan
+    plan = query_plan(ExpenseEntry.query.filter_by(date=date(2025, 3, 1), recurring_id=1))
+    assert 'ux_expense_entry_recurring_date' in plan
+
+
+def test_chore_queries_use_indexes(query_plan):
+    plan = query_plan(Chore.query.filter_by(recurring_id=3))
+    assert 'ix_chore_recurring_id' in plan
+    plan = query_plan(Chore.query.filter(Chore.done == False).order_by(Chore.due_date.asc()))  # noqa: E712
+    assert 'ix_chore_done_due_date' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_grocery_suggestions_use_covering_index(query_plan):
+    cutoff = datetime(2025, 1, 1)
+    query = (
+        db.session.query(GroceryHistory.item, func.count(GroceryHistory.id))
+        .filter(GroceryHistory.timestamp >= cutoff)
+        .group_by(GroceryHistory.item)
+    )
+    assert 'ix_grocery_history_timestamp_item' in query_plan(query)
+
+
+def test_name_and_expiry_lookups_use_indexes(query_plan):
+    assert 'ix_home_status_name' in query_plan(HomeStatus.query.filter_by(name='Alice'))
+    assert 'ix_member_status_name' in query_plan(MemberStatus.query.filter_by(name='Alice'))
+    plan = query_plan(ExpiryItem.query.order_by(ExpiryItem.expiry_date.asc()))
+    assert 'ix_expiry_item_expiry_date' in plan
+    assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,83 @@
+import pytest
+
+from app import metrics
+
+
+@pytest.fixture()
+def homehub_config():
+    return {'admin_name': 'Administrator', 'family_members': ['Alice', 'Bob'], 'metrics_token': 'scrape-me'}
+
+
+@pytest.fixture()
+def app(app):
+    metrics.reset()
+    yield app
+    metrics.reset()
+
+
+def test_histogram_buckets_are_fixed():
+    h = metrics.Histogram((1, 5))
+    for v in (0.5, 1, 3, 10, 100):
+        h.observe(v)
+    assert h.counts == [2, 1, 2]
+    assert h.count == 5
+
+
+def test_requests_record_sql_and_server_timing(app):
+    client = app.test_client()
+    resp = client.get('/api/shopping')
+    assert resp.status_code == 200
+    timing = resp.headers['Server-Timing']
+    assert 'sql;dur=' in timing and 'total;dur=' in timing
+    hs = metrics._endpoints['main.api_get_shopping']
+    assert hs[0].count == 1
+    assert hs[3].total >= 1  # at least the shopping SELECT
+    assert hs[4].total == len(resp.data)
+
+
+def test_histogram_memory_is_bounded_per_endpoint(app):
+    client = app.test_client()
+    client.get('/api/shopping')
+    before = len(metrics._endpoints)
+    for _ in range(20):
+        client.get('/api/shopping')
+        client.get('/no-such-page')
+    assert len(metrics._endpoints) == before
+    assert metrics._endpoints['main.api_get_shopping'][0].count == 21
+
+
+def test_metrics_endpoint_is_admin_only(app, monkeypatch):
+    import app.blueprints.auth as auth
+    cfg = app.config['HOMEHUB_CONFIG']
+    # Keep the test config instead of reloading config.yml on each request
+    monkeypatch.setattr(auth, 'get_config', lambda: cfg)
+    client = app.test_client()
+    client.get('/api/shopping')
+
+    assert client.get('/api/_metrics').status_code == 403
+    assert client.get('/api/_metrics?user=Alice').status_code == 403
+    resp = client.get('/api/_metrics?user=Administrator')
+    assert resp.status_code == 200
+    body = resp.get_data(as_text=True)
+    assert '# TYPE homehub_request_duration_seconds histogram' in body
+    assert 'homehub_sql_queries_bucket{endpoint="main.api_get_shopping",le="+Inf"} 1' in body
+
+    resp = client.get('/api/_metrics', headers={'Authorization': 'Bearer scrape-me'})
+    assert resp.status_code == 200
+
+    # With a login password set, the bearer token bypasses the session check
+    cfg['password_hash'] = 'not-a-real-hash'
+    assert client.get('/api/_metrics', headers={'Authorization': 'Bearer scrape-me'}).status_code == 200
+    assert client.get('/api/_metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 302
+
+
+def test_failed_queries_leave_no_timing_state_on_the_connection(app):
+    from sqlalchemy.exc import OperationalError
+    from app import db
+    with app.app_context():
+        with db.engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.exec_driver_sql('SELECT * FROM no_such_table')
+            conn.exec_driver_sql('SELECT 1')
+            assert not any(key.startswith('_metrics') for key in conn.info)
@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app import create_app, db
+from app import migrations
+
+
+def make_app():
+    test_config = {
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'HOMEHUB_CONFIG': {
+            'admin_name': 'Administrator',
+            'family_members': ['Alice', 'Bob'],
+        },
+        'WTF_CSRF_ENABLED': False,
+        'SECRET_KEY': 'test',
+    }
+    return create_app(test_config)
+
+
+def _legacy_engine(tmp_path):
+    engine = create_engine('sqlite:///' + str(tmp_path / 'legacy.db'))
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE reminder (id INTEGER PRIMARY KEY, date DATE NOT NULL, title TEXT NOT NULL, description TEXT, creator TEXT, timestamp TIMESTAMP)"))
+        conn.execute(text("CREATE TABLE recurring_reminder (id INTEGER PRIMARY KEY, title TEXT NOT NULL, description TEXT, creator TEXT, frequency TEXT, monthly_mode TEXT, time TEXT, category TEXT, color TEXT, start_date DATE, end_date DATE, last_generated_date DATE, effective_from DATE, timestamp TIMESTAMP)"))
+        conn.execute(text("CREATE TABLE chore (id INTEGER PRIMARY KEY, description TEXT NOT NULL, creator TEXT, timestamp TIMESTAMP)"))
+        conn.execute(text("INSERT INTO recurring_reminder(id, title, frequency, start_date) VALUES (1, 'Bins', 'weekly', '2025-01-01'), (2, 'Rent', 'monthly', '2025-01-01')"))
+    return engine
+
+
+def test_fresh_database_is_stamped_at_latest_version():
+    app = make_app()
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert migrations.current_version(conn) == migrations.LATEST_VERSION
+            assert migrations.pending_migrations(conn) == []
+
+
+def test_legacy_database_is_upgraded_and_backfilled(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    applied = migrations.run_migrations(engine)
+    assert applied == [m[0] for m in migrations.MIGRATIONS]
+    with engine.connect() as conn:
+        assert {'category', 'color', 'updated_at', 'time', 'recurring_id'} <= migrations._columns(conn, 'reminder')
+        assert {'done', 'due_date', 'recurring_id', 'tags'} <= migrations._columns(conn, 'chore')
+        units = dict(conn.execute(text("SELECT id, unit FROM recurring_reminder")).fetchall())
+        assert units == {1: 'week', 2: 'month'}
+        assert migrations._table_exists(conn, 'app_setting')
+        indexes = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type='index'"))}
+        assert {'ix_reminder_date', 'ix_chore_recurring_id', 'ix_chore_done_due_date', 'ux_expense_entry_recurring_date'} <= indexes
+
+
+def test_duplicate_generated_expense_entries_are_dropped(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    migrations.run_migrations(engine)
+    # A database from before the unique index, where two generators raced
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_expense_entry_recurring_date"))
+        conn.execute(text("DELETE FROM schema_version WHERE version=9"))
+        conn.execute(text(
+            "INSERT INTO expense_entry(id, date, title, amount, recurring_id) VALUES "
+            "(1, '2025-01-01', 'Rent', 100, 1), (2, '2025-01-01', 'Rent', 100, 1), "
+            "(3, '2025-01-02', 'Rent', 100, 1), (4, '2025-01-01', 'Milk', 2, NULL), (5, '2025-01-01', 'Milk', 2, NULL)"
+        ))
+    assert migrations.run_migrations(engine) == [9]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT id FROM expense_entry ORDER BY id")).scalars().all() == [1, 3, 4, 5]
+        indexes = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type='index'"))}
+    assert 'ux_expense_entry_recurring_date' in indexes
+    assert 'ix_expense_entry_recurring_date' not in indexes
+
+
+def test_current_schema_fast_path_is_one_query(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    migrations.run_migrations(engine)
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    assert migrations.run_migrations(engine) == []
+    assert len(statements) == 1
+
+
+def test_failed_step_is_not_recorded(tmp_path, monkeypatch):
+    engine = _legacy_engine(tmp_path)
+
+    def broken(conn):
+        conn.execute(text("CREATE TABLE half_done (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("ALTER TABLE reminder ADD COLUMN half_done TEXT"))
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS + [(999, 'broken', broken)])
+    monkeypatch.setattr(migrations, 'LATEST_VERSION', 999)
+    with pytest.raises(migrations.MigrationError):
+        migrations.run_migrations(engine)
+    with engine.connect() as conn:
+        assert migrations.current_version(conn) == migrations.MIGRATIONS[-2][0]
+        # The step's DDL was rolled back with it
+        assert not migrations._table_exists(conn, 'half_done')
+        assert 'half_done' not in migrations._columns(conn, 'reminder')
+
+
+def test_concurrent_boots_apply_each_step_once(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    # Both processes pass the fast-path version check before either writes
+    engines = [create_engine('sqlite:///' + str(tmp_path / 'legacy.db'), connect_args={'timeout': 30})
+               for _ in range(2)]
+    barrier = threading.Barrier(2)
+    results, errors = [], []
+
+    def boot(e):
+        barrier.wait()
+        try:
+            results.append(migrations.run_migrations(e))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=boot, args=(e,)) for e in engines]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert sorted(v for r in results for v in r) == [m[0] for m in migrations.MIGRATIONS]
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT version FROM schema_version ORDER BY version")).scalars().all()
+    assert rows == [m[0] for m in migrations.MIGRATIONS]
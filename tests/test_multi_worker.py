@@ -0,0 +1,133 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import _load_or_create_secret, create_app, db
+from app import jobs
+from app.cache import cache_get, cache_set
+from app.config import get_config
+from app.models import Job, QRCode
+
+
+@pytest.fixture()
+def homehub_config():
+    # The QR page renders base.html, which needs the full config (theme etc.)
+    return dict(get_config(), admin_name='Administrator', family_members=['Alice', 'Bob'])
+
+
+def test_lease_has_a_single_owner_until_it_expires(app):
+    now = time.time()
+    assert jobs.acquire_lease('jobs', 'worker-a', ttl=30, now=now)
+    assert not jobs.acquire_lease('jobs', 'worker-b', ttl=30, now=now + 1)
+    # Renewal by the holder keeps it
+    assert jobs.acquire_lease('jobs', 'worker-a', ttl=30, now=now + 10)
+    # Holder went away: after expiry another worker takes over
+    assert jobs.acquire_lease('jobs', 'worker-b', ttl=30, now=now + 60)
+    assert not jobs.acquire_lease('jobs', 'worker-a', ttl=30, now=now + 61)
+
+
+def test_jobs_run_once_and_record_outcome(app, monkeypatch):
+    seen = []
+    monkeypatch.setitem(jobs._handlers, 'test_ok', lambda payload: seen.append(payload['n']))
+    monkeypatch.setitem(jobs._handlers, 'test_fail', lambda payload: 1 / 0)
+    ok = jobs.enqueue('test_ok', {'n': 1}).id
+    bad = jobs.enqueue('test_fail', {}).id
+    assert jobs.run_pending_jobs('worker-a') == 2
+    assert jobs.run_pending_jobs('worker-a') == 0
+    assert seen == [1]
+    assert db.session.get(Job, ok).status == 'done'
+    failed = db.session.get(Job, bad)
+    assert failed.status == 'error' and 'division' in failed.error
+
+
+def test_orphaned_running_jobs_are_requeued_by_new_owner(app):
+    job_id = jobs.enqueue('test_ok', {}).id
+    assert jobs.claim_next('dead-worker').id == job_id
+    assert jobs.claim_next('worker-b') is None
+    assert jobs.requeue_orphans('worker-b') == 1
+    assert jobs.claim_next('worker-b').id == job_id
+
+
+def test_prune_finished_keeps_recent_and_unfinished_jobs(app, monkeypatch):
+    monkeypatch.setitem(jobs._handlers, 'test_ok', lambda payload: None)
+    old = jobs.enqueue('test_ok', {}).id
+    recent = jobs.enqueue('test_ok', {}).id
+    jobs.run_pending_jobs('worker-a')
+    pending = jobs.enqueue('test_ok', {}).id
+    db.session.get(Job, old).finished_at = datetime.utcnow() - timedelta(days=8)
+    db.session.commit()
+    assert jobs.prune_finished(timedelta(days=7)) == 1
+    db.session.expire_all()
+    assert db.session.get(Job, old) is None
+    assert db.session.get(Job, recent).status == 'done'
+    assert db.session.get(Job, pending).status == 'pending'
+
+
+def test_shared_cache_round_trip_and_expiry(app):
+    cache_set('weather:test', {'current': {'time': 'x'}}, ttl=60)
+    assert cache_get('weather:test') == {'current': {'time': 'x'}}
+    cache_set('weather:old', {'a': 1}, ttl=-1)
+    assert cache_get('weather:old') is None
+
+
+def test_cache_writes_leave_the_callers_session_alone(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'cache.db'),
+        'HOMEHUB_CONFIG': {'admin_name': 'Administrator', 'family_members': ['Alice', 'Bob']},
+        'SECRET_KEY': 'test',
+    })
+    with app.app_context():
+        db.session.add(Job(kind='pending-work', status='pending'))
+        cache_set('weather:test', {'t': 1}, ttl=60)
+        db.session.rollback()
+        assert Job.query.filter_by(kind='pending-work').count() == 0
+        assert cache_get('weather:test') == {'t': 1}
+        db.session.remove()
+
+
+def test_qr_filename_is_stable_across_processes(app, tmp_path, monkeypatch):
+    import app.blueprints.qr as qr
+    monkeypatch.setattr(qr, 'STATIC_DIR', str(tmp_path))
+    client = app.test_client()
+    client.post('/qr', data={'qrtext': 'hello', 'creator': 'Alice'})
+    rec = QRCode.query.first()
+    assert rec.filename == 'qr_5_' + hashlib.sha256(b'hello').hexdigest()[:16] + '.png'
+    assert (tmp_path / rec.filename).exists()
+
+
+def test_secret_key_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'secret_key')
+    first = _load_or_create_secret(path)
+    assert len(first) == 64
+    assert _load_or_create_secret(path) == first
+
+
+def test_failing_lease_hook_keeps_the_lease(tmp_path, monkeypatch):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'lease.db'),
+        'HOMEHUB_CONFIG': {'admin_name': 'Administrator', 'family_members': ['Alice', 'Bob']},
+        'SECRET_KEY': 'test',
+    })
+    calls = []
+
+    def broken(became_owner):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(jobs, '_lease_hooks', [broken, calls.append])
+    monkeypatch.setattr(jobs, 'POLL_INTERVAL', 0.01)
+    runner = jobs.JobRunner(app)
+    runner.start()
+    try:
+        deadline = time.time() + 5
+        while len(calls) < 5 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        runner.stop()
+        runner.join(5)
+    # The lease was taken once; the broken hook did not make the runner drop it
+    assert len(calls) >= 5
+    assert calls[0] is True and not any(calls[1:])
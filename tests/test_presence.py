@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db, presence
+from app.models import HomeStatus
+
+CONFIG = {
+    'admin_name': 'Administrator',
+    'password_hash': 'x',
+    'family_members': ['Alice', 'Bob'],
+    'presence_token': 'phone-secret',
+    'presence': {'heartbeat_ttl_minutes': 15},
+}
+
+
+@pytest.fixture()
+def homehub_config():
+    return CONFIG
+
+
+def test_heartbeat_requires_session_or_token(app):
+    client = app.test_client()
+    url = '/api/presence/heartbeat'
+    assert client.post(url, json={'name': 'Alice'}).status_code == 302
+    bad = client.post(url, json={'name': 'Alice'}, headers={'Authorization': 'Bearer nope'})
+    assert bad.status_code == 302
+    headers = {'Authorization': 'Bearer phone-secret'}
+    assert client.post(url, json={'name': 'Mallory'}, headers=headers).status_code == 400
+    first = client.post(url, json={'name': 'Alice'}, headers=headers).get_json()
+    assert first == {'ok': True, 'status': 'Home', 'written': True, 'expires_in': 900}
+    # A fresh heartbeat is not written again
+    assert client.post(url, json={'name': 'Alice'}, headers=headers).get_json()['written'] is False
+    assert presence.statuses({'Alice', 'Bob'})[0] == {'Alice': 'Home'}
+
+
+def test_stale_heartbeat_reads_as_away_and_is_persisted(app):
+    old = datetime.utcnow() - timedelta(minutes=20)
+    presence.set_home_status('Alice', 'Home', heartbeat_at=old)
+    presence.set_home_status('Bob', 'Home')  # set by hand: never expires
+    assert presence.statuses({'Alice', 'Bob'})[0] == {'Alice': 'Away', 'Bob': 'Home'}
+    assert HomeStatus.query.filter_by(name='Alice').one().status == 'Home'
+
+    assert presence.expire_heartbeats() == 1
+    alice = HomeStatus.query.filter_by(name='Alice').one()
+    assert (alice.status, alice.heartbeat_at) == ('Away', None)
+    assert presence.statuses({'Alice', 'Bob'})[0] == {'Alice': 'Away', 'Bob': 'Home'}
+
+
+def test_snapshot_skips_scans_until_another_writer(app, count_statements):
+    presence.statuses({'Alice'})
+    presence.set_home_status('Alice', 'Home')
+    _, statements = count_statements(lambda: presence.statuses({'Alice'}))
+    assert not any('FROM home_status' in s for s in statements)
+
+    # A write that bypasses this module, like one from another worker
+    HomeStatus.query.filter_by(name='Alice').one().status = 'Out'
+    db.session.commit()
+    (who, _), statements = count_statements(lambda: presence.statuses({'Alice'}))
+    assert who == {'Alice': 'Out'}
+    assert sum('FROM home_status' in s for s in statements) == 1
+
+
+def test_household_status_etag_changes_when_a_heartbeat_lapses(client, homehub_config, monkeypatch):
+    presence.set_home_status('Alice', 'Home', heartbeat_at=datetime.utcnow() - timedelta(minutes=10))
+    first = client.get('/api/household_status')
+    assert first.get_json()['who_statuses'] == {'Alice': 'Home'}
+    etag = first.headers['ETag']
+    assert client.get('/api/household_status', headers={'If-None-Match': etag}).status_code == 304
+
+    # Time passes the heartbeat's expiry; nothing is written before the sweep runs
+    monkeypatch.setitem(homehub_config, 'presence', {'heartbeat_ttl_minutes': 5})
+    stale = client.get('/api/household_status', headers={'If-None-Match': etag})
+    assert stale.status_code == 200 and stale.headers['ETag'] != etag
+    assert stale.get_json()['who_statuses'] == {'Alice': 'Away'}
@@ -0,0 +1,137 @@
+import calendar
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.recurrence import Recurrence, compile_expense_rule, compile_rule
+
+
+# Step-by-step reference implementations (the pre-engine code in dashboard/chores/expenses)
+
+def _ref_add_months(dt, months):
+    y = dt.year + (dt.month - 1 + months) // 12
+    m = (dt.month - 1 + months) % 12 + 1
+    return date(y, m, min(dt.day, calendar.monthrange(y, m)[1]))
+
+
+def _ref_add_years(dt, years):
+    try:
+        return date(dt.year + years, dt.month, dt.day)
+    except ValueError:
+        return date(dt.year + years, 2, 28)
+
+
+def _ref_next(unit, interval, d):
+    if unit == 'week':
+        return d + timedelta(weeks=interval)
+    if unit == 'month':
+        return _ref_add_months(d, interval)
+    if unit == 'year':
+        return _ref_add_years(d, interval)
+    return d + timedelta(days=interval)
+
+
+def _ref_window(unit, interval, start, end, window_start, window_end):
+    d = start
+    while d < window_start:
+        d = _ref_next(unit, interval, d)
+    out = []
+    while d <= window_end and (not end or d <= end):
+        out.append(d)
+        d = _ref_next(unit, interval, d)
+    return out
+
+
+def _ref_expense(frequency, mode, start, until):
+    def next_date(d):
+        if frequency == 'daily':
+            return d + timedelta(days=1)
+        if frequency == 'weekly':
+            return d + timedelta(weeks=1)
+        ny, nm = (d.year + 1, 1) if d.month == 12 else (d.year, d.month + 1)
+        if mode == 'calendar':
+            return date(ny, nm, 1)
+        return date(ny, nm, min(start.day, calendar.monthrange(ny, nm)[1]))
+    d = start
+    if frequency == 'monthly' and mode == 'calendar' and start.day != 1:
+        d = next_date(start)
+    out = []
+    while d <= until:
+        out.append(d)
+        d = next_date(d)
+    return out
+
+
+def _random_date(rng, lo=date(2019, 1, 1), span=3000):
+    d = lo + timedelta(days=rng.randrange(span))
+    # Bias towards the interesting month ends
+    if rng.random() < 0.4:
+        d = d.replace(day=min(rng.choice([28, 29, 30, 31]), calendar.monthrange(d.year, d.month)[1]))
+    return d
+
+
+def test_windows_match_step_by_step_reference():
+    rng = random.Random(1234)
+    for _ in range(3000):
+        unit = rng.choice(['day', 'week', 'month', 'year'])
+        interval = rng.choice([1, 1, 2, 3, 5, 7, 12, 13, 48])
+        start = _random_date(rng)
+        end = start + timedelta(days=rng.randrange(4000)) if rng.random() < 0.3 else None
+        window_start = _random_date(rng, start - timedelta(days=400), 6000)
+        window_end = window_start + timedelta(days=rng.choice([0, 6, 30, 400]))
+        rule = Recurrence(start, interval, unit, end)
+        expected = _ref_window(unit, interval, start, end, window_start, window_end)
+        assert list(rule.between(window_start, window_end)) == expected, (unit, interval, start, window_start)
+        first = rule.first_on_or_after(window_start)
+        ref_first = start
+        while ref_first < window_start:
+            ref_first = _ref_next(unit, interval, ref_first)
+        assert first == (None if end and ref_first > end else ref_first)
+
+
+def test_month_end_drift_and_feb_29():
+    jan31 = Recurrence(date(2025, 1, 31), 1, 'month')
+    assert list(jan31.between(date(2025, 1, 1), date(2025, 4, 30))) == [
+        date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 28), date(2025, 4, 28)]
+    leap = Recurrence(date(2024, 2, 29), 1, 'year')
+    assert leap.first_on_or_after(date(2027, 1, 1)) == date(2027, 2, 28)
+    assert leap.first_on_or_after(date(2028, 1, 1)) == date(2028, 2, 28)
+    # Every four years only lands on leap Februaries until 2100
+    quad = Recurrence(date(2024, 2, 29), 4, 'year')
+    assert quad.first_on_or_after(date(2095, 1, 1)) == date(2096, 2, 29)
+    assert quad.first_on_or_after(date(2101, 1, 1)) == date(2104, 2, 28)
+
+
+def test_fast_forward_is_independent_of_rule_age():
+    rule = Recurrence(date(1900, 1, 1), 1, 'day')
+    assert rule.first_on_or_after(date(2025, 6, 1)) == date(2025, 6, 1)
+    assert rule.first_on_or_after(date.max) == date.max
+    assert Recurrence(date(2025, 1, 1), 1, 'month').first_on_or_after(date.max) is None
+
+
+def test_compile_rule_legacy_frequency_and_chore_defaults():
+    legacy = SimpleNamespace(interval=3, unit='', frequency='weekly', start_date=date(2025, 1, 1), end_date=None)
+    assert compile_rule(legacy).next_after(date(2025, 1, 1)) == date(2025, 1, 8)
+    # Reminder rules with neither unit nor frequency have always been monthly
+    bare = SimpleNamespace(interval=3, unit=None, frequency=None, start_date=date(2025, 1, 31), end_date=None)
+    assert compile_rule(bare).next_after(date(2025, 1, 31)) == date(2025, 2, 28)
+    chore = SimpleNamespace(interval=3, unit=None, start_date=None, end_date=None)
+    assert compile_rule(chore, date(2025, 1, 1)).next_after(date(2025, 1, 1)) == date(2025, 1, 4)
+
+
+def test_expense_modes_match_reference():
+    rng = random.Random(99)
+    for _ in range(500):
+        frequency = rng.choice(['daily', 'weekly', 'monthly'])
+        mode = rng.choice(['calendar', 'day_of_month'])
+        start = _random_date(rng)
+        until = start + timedelta(days=rng.randrange(900))
+        r = SimpleNamespace(frequency=frequency, monthly_mode=mode, start_date=start, end_date=None)
+        rule = compile_expense_rule(r)
+        got = []
+        d = rule.first_on_or_after(start)
+        while d <= until:
+            got.append(d)
+            d = rule.next_after(d)
+        assert got == _ref_expense(frequency, mode, start, until)
+        assert list(rule.between(start, until)) == got
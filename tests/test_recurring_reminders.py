@@ -131,3 +131,100 @@ def test_legacy_frequency_compat(client):
     data = list_month(client, 2025, 10)
     expected = ['2025-10-03','2025-10-10','2025-10-17','2025-10-24','2025-10-31']
     assert_dates_for_title(data, 'LegacyWeekly', expected)
+
+
+def test_stored_occurrence_replaces_virtual_one(client):
+    payload = {
+        'date': '2025-10-01',
+        'title': 'Standup',
+        'description': 'x',
+        'creator': 'Alice',
+        'recurring': {'interval': 1, 'unit': 'day'}
+    }
+    assert client.post('/api/reminders', json=payload).status_code == 200
+    from app.models import Reminder, RecurringReminder
+    with client.application.app_context():
+        rule = RecurringReminder.query.filter_by(title='Standup').first()
+        # An edited single occurrence keeps its link to the rule under a new title
+        db.session.add(Reminder(date=date(2025, 10, 10), title='Standup (moved)', creator='Alice',
+                                recurring_id=rule.id, category='bill'))
+        db.session.commit()
+    data = list_month(client, 2025, 10)
+    on_10th = [r for r in data['reminders'] if r['date'] == '2025-10-10']
+    assert [r['title'] for r in on_10th] == ['Standup (moved)']
+    assert data['counts']['2025-10-10'] == 1
+    assert data['categories_counts']['2025-10-10'] == {'bill': 1}
+    assert data['counts']['2025-10-11'] == 1
+
+
+def test_index_embeds_only_the_visible_month(client):
+    from app.blueprints.dashboard import _embedded_months
+    from app.models import Reminder
+    today = date.today()
+    start, end = _embedded_months(today)
+    assert (start.day, start.month, (end + timedelta(days=1)).day) == (1, today.month, 1)
+    with client.application.app_context():
+        db.session.add(Reminder(date=today, title='This month', creator='Alice'))
+        db.session.add(Reminder(date=start - timedelta(days=400), title='Old history', creator='Alice'))
+        db.session.commit()
+    with client.session_transaction() as sess:
+        sess['authed'] = True
+    page = client.get('/')
+    assert page.status_code == 200
+    assert b'This month' in page.data
+    assert b'Old history' not in page.data
+    wide = _embedded_months(date(2025, 1, 15), 1)
+    assert wide == (date(2024, 12, 1), date(2025, 2, 28))
+
+
+def test_counts_endpoint_matches_month_view(client):
+    for payload in (
+        {'date': '2025-09-20', 'title': 'Weekly', 'creator': 'Alice', 'category': 'bill',
+         'recurring': {'interval': 1, 'unit': 'week'}},
+        {'date': '2025-10-05', 'title': 'Once', 'creator': 'Bob'},
+        {'date': '2025-10-05', 'title': 'Twice', 'creator': 'Bob'},
+    ):
+        assert client.post('/api/reminders', json=payload).status_code == 200
+    month = list_month(client, 2025, 10)
+    resp = client.get('/api/reminders/counts?from=2025-10-01&to=2025-10-31')
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['counts'] == month['counts']
+    assert data['categories_counts'] == month['categories_counts']
+
+    year = client.get('/api/reminders/counts?from=2025-01-01&to=2025-12-31').get_json()
+    assert sum(v for k, v in year['counts'].items() if k.startswith('2025-12')) == 4  # Saturdays 6, 13, 20, 27
+    assert client.get('/api/reminders/counts?from=2025-01-01&to=2026-06-01').status_code == 400
+    assert client.get('/api/reminders/counts?from=2025-02-01').status_code == 400
+
+
+def test_rules_outside_the_window_are_left_out_and_cached(client):
+    from sqlalchemy import event
+    for payload in (
+        {'date': '2025-10-01', 'title': 'Weekly', 'creator': 'Alice', 'recurring': {'interval': 1, 'unit': 'week'}},
+        {'date': '2025-12-01', 'title': 'Later', 'creator': 'Alice', 'recurring': {'interval': 1, 'unit': 'day'}},
+        {'date': '2025-01-15', 'title': 'Over', 'creator': 'Alice',
+         'recurring': {'interval': 1, 'unit': 'day', 'end_date': '2025-01-20'}},
+    ):
+        assert client.post('/api/reminders', json=payload).status_code == 200
+    data = list_month(client, 2025, 10)
+    assert [rr['title'] for rr in data['recurring_rules']] == ['Weekly']
+    assert data['recurring_rules'][0]['dates'] == ['2025-10-01', '2025-10-08', '2025-10-15', '2025-10-22', '2025-10-29']
+
+    statements = []
+
+    def before(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+    with client.application.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before)
+    try:
+        assert list_month(client, 2025, 10) == data
+    finally:
+        event.remove(engine, 'before_cursor_execute', before)
+    assert not any('FROM recurring_reminder' in s for s in statements)
+
+    # A rule edit bumps the table version and recompiles
+    rid = data['recurring_rules'][0]['id']
+    assert client.patch(f'/api/recurring_rules/{rid}', json={'title': 'Renamed', 'creator': 'Alice'}).status_code == 200
+    assert [rr['title'] for rr in list_month(client, 2025, 10)['recurring_rules']] == ['Renamed']
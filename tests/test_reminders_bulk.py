@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import db
+from app.blueprints import dashboard
+from app.models import Reminder
+
+
+def _seed(n, creator, start=date(2025, 3, 1)):
+    rows = [Reminder(date=start + timedelta(days=i % 28), title=f'R{i}', creator=creator) for i in range(n)]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [r.id for r in rows]
+
+
+def test_bulk_delete_filters_by_creator_in_sql(app, client, count_statements, monkeypatch):
+    monkeypatch.setattr(dashboard, 'IN_CHUNK', 50)
+    alice = _seed(120, 'Alice')
+    bob = _seed(3, 'Bob')
+    resp, statements = count_statements(
+        lambda: client.delete('/api/reminders', json={'ids': alice + bob + [999999], 'creator': 'Alice'}))
+    data = resp.get_json()
+    assert data['ok'] and data['deleted'] == 120
+    assert data['skipped'] == bob + [999999]
+    assert data['dates'][0] == '2025-03-01' and len(data['dates']) == 28
+    # One SELECT and one DELETE per chunk of 50 ids, not one per id
+    selects = [s for s in statements if s.lstrip().upper().startswith('SELECT') and 'FROM reminder' in s]
+    deletes = [s for s in statements if s.lstrip().upper().startswith('DELETE') and 'reminder' in s]
+    assert len(selects) == 3 and len(deletes) == 3
+    assert Reminder.query.count() == 3
+
+    admin = client.delete('/api/reminders', json={'ids': bob, 'creator': 'Administrator'}).get_json()
+    assert admin['deleted'] == 3 and admin['skipped'] == []
+
+
+def test_bulk_delete_caps_id_list(client, monkeypatch):
+    monkeypatch.setattr(dashboard, 'BULK_DELETE_MAX_IDS', 10)
+    resp = client.delete('/api/reminders', json={'ids': list(range(1, 12)), 'creator': 'Alice'})
+    assert resp.status_code == 400
+
+
+def test_form_bulk_delete_redirects_to_first_deleted_date(app, client):
+    ids = _seed(3, 'Bob', start=date(2025, 5, 10))
+    resp = client.post('/calendar/delete_bulk', data={'ids': ','.join(map(str, ids)), 'user': 'Bob'})
+    assert resp.status_code == 302
+    assert 'date=2025-05-10' in resp.headers['Location']
+    assert Reminder.query.count() == 0
+
+
+def test_batch_creates_and_updates_in_one_commit(app, client):
+    existing = _seed(2, 'Alice')
+    commits = []
+
+    def count_commit(session):
+        commits.append(1)
+
+    event.listen(db.session, 'after_commit', count_commit)
+    try:
+        resp = client.post('/api/reminders/batch', json={'operations': [
+            {'op': 'create', 'date': '2025-09-01', 'title': 'Term starts', 'creator': 'Bob', 'time': '8:00'},
+            {'op': 'create', 'date': '2025-09-02', 'title': 'PE day', 'creator': 'Bob', 'time': '08:30',
+             'category': 'school'},
+            {'op': 'create', 'date': 'not-a-date', 'title': 'Broken', 'creator': 'Bob'},
+            {'op': 'create', 'date': '2025-09-05', 'title': 'Library', 'creator': 'Bob',
+             'recurring': {'interval': 1, 'unit': 'week'}},
+            {'op': 'update', 'id': existing[0], 'creator': 'Alice', 'title': 'Renamed', 'time': '25:00'},
+            {'op': 'update', 'id': existing[1], 'creator': 'Bob', 'title': 'Hijack'},
+            {'op': 'update', 'id': 999999, 'creator': 'Alice', 'title': 'Ghost'},
+            {'op': 'delete', 'id': existing[0]},
+        ]})
+    finally:
+        event.remove(db.session, 'after_commit', count_commit)
+    data = resp.get_json()
+    assert resp.status_code == 200
+    assert (data['applied'], data['failed']) == (4, 4)
+    results = data['results']
+    assert results[0]['reminder']['time'] is None  # same time rules as the single create
+    assert results[1]['reminder']['category'] == 'school'
+    assert results[2] == {'ok': False, 'error': 'Invalid date', 'status': 400}
+    assert isinstance(results[3]['recurring_id'], int)
+    assert results[4]['reminder']['title'] == 'Renamed'
+    assert [r['status'] for r in results[5:]] == [403, 404, 400]
+    assert len(commits) == 1
+    assert Reminder.query.filter_by(title='Hijack').count() == 0
+    assert Reminder.query.count() == 4
+
+
+def test_batch_rejects_empty_and_oversized(client, monkeypatch):
+    assert client.post('/api/reminders/batch', json={'operations': []}).status_code == 400
+    monkeypatch.setattr(dashboard, 'BATCH_MAX_OPERATIONS', 2)
+    ops = [{'op': 'create', 'date': '2025-01-01', 'title': 'x'}] * 3
+    assert client.post('/api/reminders/batch', json=ops).status_code == 400
@@ -0,0 +1,94 @@
+from datetime import date, datetime, timedelta
+
+from app import changes, db
+from app.models import DeletedRecord, Reminder, RecurringReminder
+
+
+def _age(model, seconds=60):
+    """Push every row's updated_at into the past, outside the cursor overlap."""
+    past = datetime.utcnow() - timedelta(seconds=seconds)
+    db.session.execute(db.update(model).values(updated_at=past))
+    db.session.commit()
+
+
+def test_changes_returns_upserts_and_tombstones(app, client):
+    day = date(2025, 5, 10)
+    keep = Reminder(date=day, title='Keep', creator='Alice')
+    edit = Reminder(date=day, title='Edit', creator='Alice')
+    gone = Reminder(date=day, title='Gone', creator='Alice')
+    bulk = Reminder(date=day + timedelta(days=1), title='Bulk', creator='Alice')
+    rule = RecurringReminder(title='Bins', creator='Bob', interval=1, unit='week', start_date=day)
+    db.session.add_all([keep, edit, gone, bulk, rule])
+    db.session.commit()
+    edit_id, gone_id, bulk_id, rule_id = edit.id, gone.id, bulk.id, rule.id
+    _age(Reminder)
+    _age(RecurringReminder)
+    cursor = client.get('/api/reminders/changes').get_json()
+    assert cursor['reset'] is True
+
+    since = (datetime.utcnow() - timedelta(seconds=30)).strftime(changes.CURSOR_FORMAT)
+    assert client.patch(f'/api/reminders/{edit_id}', json={'title': 'Edited', 'creator': 'Alice'}).get_json()['ok']
+    client.post(f'/calendar/delete/{gone_id}', data={'user': 'Alice'})
+    assert client.delete('/api/reminders', json={'ids': [bulk_id], 'creator': 'Alice'}).get_json()['deleted'] == 1
+    client.delete(f'/api/recurring_rules/{rule_id}', json={'creator': 'Bob'})
+
+    res = client.get('/api/reminders/changes', query_string={'since': since}).get_json()
+    assert res['ok'] and not res['reset']
+    assert [r['title'] for r in res['reminders']] == ['Edited']
+    assert res['deleted']['reminders'] == [
+        {'id': gone_id, 'date': '2025-05-10'},
+        {'id': bulk_id, 'date': '2025-05-11'},
+    ]
+    assert res['deleted']['recurring_rules'] == [rule_id]
+    assert changes.parse_cursor(res['cursor']) > changes.parse_cursor(since)
+
+
+def test_changes_cursor_validation_and_expiry(app, client):
+    assert client.get('/api/reminders/changes?since=yesterday').status_code == 400
+    old = (datetime.utcnow() - timedelta(days=changes.TOMBSTONE_DAYS + 1)).strftime(changes.CURSOR_FORMAT)
+    assert client.get('/api/reminders/changes', query_string={'since': old}).get_json()['reset'] is True
+
+
+def test_changes_are_paged_without_gaps_or_repeats(app, client):
+    day = date(2025, 5, 10)
+    stamp = datetime.utcnow() - timedelta(seconds=30)
+    rows = [Reminder(date=day, title=f'R{i}', creator='Alice') for i in range(7)]
+    db.session.add_all(rows)
+    db.session.commit()
+    ids = [r.id for r in rows]
+    # Several rows share one timestamp: the page cursor still splits them exactly
+    db.session.execute(db.update(Reminder).values(updated_at=stamp))
+    db.session.commit()
+    db.session.delete(db.session.get(Reminder, ids[0]))
+    db.session.commit()
+
+    since = (stamp - timedelta(seconds=60)).strftime(changes.CURSOR_FORMAT)
+    seen, deleted, pages = [], [], 0
+    while True:
+        res = client.get('/api/reminders/changes', query_string={'since': since, 'limit': 3}).get_json()
+        assert res['ok'] and not res['reset']
+        assert len(res['reminders']) + len(res['deleted']['reminders']) <= 3
+        seen += [r['id'] for r in res['reminders']]
+        deleted += [d['id'] for d in res['deleted']['reminders']]
+        since = res['cursor']
+        pages += 1
+        if not res['has_more']:
+            break
+    assert pages == 3
+    assert seen == ids[1:]
+    assert deleted == [ids[0]]
+    assert changes.parse_position(since)[1] == changes.STREAMS
+    assert client.get('/api/reminders/changes', query_string={'since': 'x~1~2'}).status_code == 400
+    assert client.get('/api/reminders/changes', query_string={'limit': 'many'}).status_code == 400
+
+
+def test_expired_tombstones_are_pruned(app):
+    db.session.add(DeletedRecord(table_name='reminder', row_id=1,
+                                 deleted_at=datetime.utcnow() - timedelta(days=changes.TOMBSTONE_DAYS + 1)))
+    db.session.commit()
+    r = Reminder(date=date(2025, 1, 1), title='x')
+    db.session.add(r)
+    db.session.commit()
+    db.session.delete(r)
+    db.session.commit()
+    assert [t.row_id for t in DeletedRecord.query.all()] == [r.id]
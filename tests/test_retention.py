@@ -0,0 +1,77 @@
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app import db, retention
+from app.models import Chore, DeletedRecord, ItemTag, QRCode, RecurringChore, Reminder, ShoppingItem
+
+CONFIG = {
+    'admin_name': 'Administrator',
+    'family_members': ['Alice', 'Bob'],
+    'retention': {
+        'reminders': {'days': 365},
+        'chores': {'days': 30},
+        'shopping': {'days': 7},
+        'qr_codes': {'rows': 2},
+    },
+}
+
+
+@pytest.fixture()
+def homehub_config():
+    return CONFIG
+
+
+def test_policies_archive_only_stale_eligible_rows(app):
+    old = datetime.utcnow() - timedelta(days=60)
+    rule = RecurringChore(description='Bins', interval=1, unit='week', start_date=date(2025, 1, 1))
+    db.session.add(rule)
+    db.session.flush()
+    db.session.add_all([
+        Reminder(date=date.today() - timedelta(days=400), title='Ancient'),
+        Reminder(date=date.today() - timedelta(days=30), title='Recent'),
+        Chore(description='Done long ago', done=True, timestamp=old, tags='["home"]'),
+        Chore(description='Still open', done=False, timestamp=old),
+        Chore(description='Live rule', done=True, timestamp=old, recurring_id=rule.id),
+        ShoppingItem(item='Milk', checked=True, timestamp=old),
+        ShoppingItem(item='Eggs', checked=False, timestamp=old),
+    ] + [QRCode(text=f'qr{i}', filename=f'qr{i}.png', timestamp=old + timedelta(minutes=i)) for i in range(4)])
+    db.session.commit()
+
+    moved = retention.apply_retention(CONFIG)
+    assert moved == {'reminders': 1, 'chores': 1, 'shopping': 1, 'qr_codes': 2}
+    assert [r.title for r in Reminder.query] == ['Recent']
+    assert sorted(c.description for c in Chore.query) == ['Live rule', 'Still open']
+    assert [i.item for i in ShoppingItem.query] == ['Eggs']
+    assert [q.text for q in QRCode.query.order_by(QRCode.timestamp)] == ['qr2', 'qr3']
+    # Archived rows leave no tag index entries and tombstone reminders for delta sync
+    assert not ItemTag.query.filter_by(entity_type='chore').count()
+    assert DeletedRecord.query.filter_by(table_name='reminder').count() == 1
+    assert retention.apply_retention(CONFIG) == {}
+
+
+def test_include_archived_returns_flagged_rows(app, client):
+    old = datetime.utcnow() - timedelta(days=60)
+    db.session.add_all([
+        Reminder(date=date(2020, 3, 5), title='Old dentist', creator='Alice'),
+        Chore(description='Hoover', done=True, timestamp=old, tags='["home"]'),
+        ShoppingItem(item='Milk', checked=True, timestamp=old),
+    ])
+    db.session.commit()
+    retention.apply_retention(CONFIG)
+
+    month = client.get('/api/reminders?scope=month&date=2020-03-01').get_json()
+    assert month['reminders'] == []
+    month = client.get('/api/reminders?scope=month&date=2020-03-01&include_archived=1').get_json()
+    assert [(r['title'], r['archived']) for r in month['reminders']] == [('Old dentist', True)]
+    assert month['counts'] == {'2020-03-05': 1}
+
+    assert client.get('/api/chores').get_json() == []
+    chores = client.get('/api/chores?include_archived=1').get_json()
+    assert [(c['description'], c['archived']) for c in chores] == [('Hoover', True)]
+    tags = json.dumps(['garden'])
+    assert client.get(f'/api/chores?include_archived=1&tags={tags}').get_json() == []
+
+    shopping = client.get('/api/shopping?include_archived=1').get_json()
+    assert [(i['item'], i['archived']) for i in shopping] == [('Milk', True)]
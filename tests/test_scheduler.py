@@ -0,0 +1,174 @@
+import json
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from app import create_app, db
+from app import jobs, scheduler
+from app.models import Chore, ExpenseEntry, Job, RecurringChore, RecurringExpense
+
+
+def _pending_materialize_jobs():
+    return [json.loads(j.payload)['tasks'] for j in Job.query.filter_by(kind='materialize', status='pending')]
+
+
+def test_watermark_skips_work_until_rules_change(app, monkeypatch):
+    today = date.today()
+    db.session.add(RecurringExpense(title='Milk', unit_price=2.0, frequency='daily', start_date=today - timedelta(days=2)))
+    db.session.commit()
+    assert scheduler.watermark('expenses') == ''
+
+    assert scheduler.ensure_current('expenses', today) is True
+    assert ExpenseEntry.query.count() == 3
+    # The generator's own updates (last_generated_date) do not re-mark it stale
+    assert scheduler.watermark('expenses') == today.isoformat()
+
+    calls = []
+    monkeypatch.setitem(scheduler._tasks, 'expenses', lambda d: calls.append(d))
+    assert scheduler.ensure_current('expenses', today) is False
+    assert calls == []
+
+    # Editing a rule clears the watermark in the same commit and queues a refresh
+    Job.query.delete()
+    db.session.commit()
+    db.session.add(RecurringExpense(title='Paper', unit_price=1.0, frequency='weekly', start_date=today))
+    db.session.commit()
+    assert scheduler.watermark('expenses') == ''
+    assert _pending_materialize_jobs() == [['expenses']]
+    assert scheduler.ensure_current('expenses', today) is True
+    assert calls == [today]
+
+
+def test_rule_changes_share_one_pending_refresh(app):
+    Job.query.delete()
+    db.session.commit()
+    for title in ('Milk', 'Paper', 'Bread'):
+        db.session.add(RecurringExpense(title=title, unit_price=1.0, frequency='daily', start_date=date.today()))
+        db.session.commit()
+    assert _pending_materialize_jobs() == [['expenses']]
+    db.session.add(RecurringChore(description='Bins', interval=1, unit='week', start_date=date.today()))
+    db.session.commit()
+    assert _pending_materialize_jobs() == [['chores', 'expenses']]
+
+    # Once the refresh has been claimed, the next change queues a new one
+    jobs.claim_next('worker-a')
+    db.session.add(RecurringExpense(title='Tea', unit_price=1.0, frequency='daily', start_date=date.today()))
+    db.session.commit()
+    assert _pending_materialize_jobs() == [['expenses']]
+
+
+def test_recurring_chore_changes_mark_chores_stale(app):
+    db.session.add(RecurringChore(description='Bins', interval=1, unit='week', start_date=date.today()))
+    db.session.commit()
+    scheduler.ensure_current('chores')
+    chore = Chore.query.filter(Chore.recurring_id.isnot(None)).one()
+    assert scheduler.watermark('chores') == date.today().isoformat()
+
+    db.session.add(Chore(description='One-off'))
+    db.session.commit()
+    assert scheduler.watermark('chores') == date.today().isoformat()
+
+    chore.done = True
+    db.session.commit()
+    assert scheduler.watermark('chores') == ''
+
+
+def test_lease_holder_queues_all_tasks_and_jobs_run_them(app):
+    db.session.add(RecurringExpense(title='Rent', unit_price=100.0, frequency='monthly', start_date=date.today()))
+    db.session.commit()
+    Job.query.delete()
+    db.session.commit()
+    scheduler._last_scheduled_day[0] = None
+    scheduler._schedule(became_owner=True)
+    assert sorted(_pending_materialize_jobs()[0]) == ['chores', 'expenses']
+    # Same day, not a new owner: nothing more is queued
+    scheduler._schedule(became_owner=False)
+    assert len(_pending_materialize_jobs()) == 1
+
+    jobs.run_pending_jobs('worker-a')
+    assert scheduler.watermark('expenses') == date.today().isoformat()
+    assert scheduler.watermark('chores') == date.today().isoformat()
+    assert ExpenseEntry.query.count() == 1
+
+
+class _ProcessLocks(dict):
+    """A fresh lock per lookup, as if every materializer ran in its own process."""
+    def __getitem__(self, name):
+        return threading.Lock()
+
+
+@pytest.mark.parametrize('separate_processes', [False, True])
+def test_job_and_inline_catch_up_materialize_once(tmp_path, monkeypatch, separate_processes):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'scheduler.db'),
+        'HOMEHUB_CONFIG': {'admin_name': 'Administrator', 'family_members': ['Alice', 'Bob']},
+        'SECRET_KEY': 'test',
+    })
+    today = date.today()
+    with app.app_context():
+        db.session.add(RecurringExpense(title='Milk', unit_price=2.0, frequency='daily', start_date=today - timedelta(days=9)))
+        db.session.add(RecurringChore(description='Bins', interval=1, unit='week', start_date=today))
+        db.session.commit()
+        db.session.remove()
+    if separate_processes:
+        # Only the worker_lease row keeps them apart
+        monkeypatch.setattr(scheduler, '_task_locks', _ProcessLocks())
+    runs = []
+    generators = dict(scheduler._tasks)
+
+    def slow(name):
+        def run(day):
+            runs.append(name)
+            time.sleep(0.2)  # hold the task long enough for the other side to arrive
+            generators[name](day)
+        return run
+    for name in generators:
+        monkeypatch.setitem(scheduler._tasks, name, slow(name))
+
+    barrier = threading.Barrier(2)
+    errors = []
+
+    def worker(fn):
+        with app.app_context():
+            barrier.wait()
+            try:
+                fn()
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                db.session.remove()
+
+    def inline_catch_up():
+        scheduler.ensure_current('expenses')
+        scheduler.ensure_current('chores')
+
+    threads = [
+        threading.Thread(target=worker, args=(lambda: scheduler._materialize_job({}),)),
+        threading.Thread(target=worker, args=(inline_catch_up,)),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert sorted(runs) == ['chores', 'expenses']
+    with app.app_context():
+        assert ExpenseEntry.query.count() == 10
+        assert Chore.query.filter(Chore.recurring_id.isnot(None)).count() == 1
+        db.session.remove()
+
+
+def test_generator_skips_entries_that_already_exist(app):
+    today = date.today()
+    rule = RecurringExpense(title='Milk', unit_price=2.0, frequency='daily', start_date=today - timedelta(days=2))
+    db.session.add(rule)
+    db.session.commit()
+    scheduler.run_task('expenses', today)
+    # A stale last_generated_date (e.g. another worker's run) re-walks dates that have entries
+    rule.last_generated_date = None
+    db.session.commit()
+    scheduler.run_task('expenses', today)
+    assert ExpenseEntry.query.count() == 3
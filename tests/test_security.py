@@ -170,3 +170,14 @@ def test_upload_preview_endpoint_security(client):
     download_res = client.get('/uploads/test.jpg')
     download_disposition = download_res.headers.get('Content-Disposition', '')
     assert 'attachment' in download_disposition.lower(), "Download endpoint should force attachment"
+
+
+def test_token_helpers():
+    from app.security import bearer_token, token_matches
+    assert bearer_token('Bearer  abc ') == 'abc'
+    assert bearer_token('Basic abc') == '' and bearer_token('') == ''
+    assert token_matches('s3cret', 's3cret')
+    assert not token_matches('s3cret', 'nope') and not token_matches('s3cret', None)
+    # An unset token disables token access instead of matching an empty one
+    assert not token_matches('', '') and not token_matches(None, '')
+    assert not token_matches('s3cret', 'sécret')
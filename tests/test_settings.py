@@ -0,0 +1,39 @@
+from app import db
+from app import settings
+
+
+def test_settings_loaded_once_per_request(app, count_statements):
+    settings.set_settings({'currency': '$', 'categories': 'Food,Rent'})
+    settings.get_settings()  # first read after startup loads the table
+    with app.app_context(), app.test_request_context('/'):
+        _, statements = count_statements(lambda: [settings.get_setting('currency') for _ in range(5)])
+        assert len(statements) == 1  # version check only; values served from the cache
+        assert settings.get_setting('currency') == '$'
+    with app.app_context(), app.test_request_context('/'):
+        assert len(count_statements(lambda: settings.get_setting('categories'))[1]) == 1
+
+
+def test_write_through_updates_local_cache(app):
+    with app.app_context(), app.test_request_context('/'):
+        assert settings.get_bool_setting('show_chores_on_homepage', False) is False
+        settings.set_setting('show_chores_on_homepage', '1')
+        assert settings.get_bool_setting('show_chores_on_homepage', False) is True
+
+
+def test_external_write_is_picked_up_via_version_row(app):
+    settings.set_setting('currency', '$')
+    assert settings.get_setting('currency') == '$'
+    # Simulate another worker: change the row and bump the counter with raw SQL
+    db.session.execute(db.text("UPDATE app_setting SET value='EUR' WHERE key='currency'"))
+    db.session.execute(db.text("UPDATE app_setting SET value=CAST(value AS INTEGER)+1 WHERE key=:k"), {'k': settings.VERSION_KEY})
+    db.session.commit()
+    assert settings.get_setting('currency') == 'EUR'
+    assert settings.VERSION_KEY not in settings.get_settings()
+
+
+def test_chores_toggle_round_trip(app):
+    settings.set_setting('show_chores_on_homepage', '0')
+    with app.app_context(), app.test_request_context('/'):
+        from app.blueprints.chores import _get_show_chores_on_homepage, _set_show_chores_on_homepage
+        _set_show_chores_on_homepage(True)
+        assert _get_show_chores_on_homepage() is True
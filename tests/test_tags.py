@@ -0,0 +1,76 @@
+import json
+
+from sqlalchemy import text
+
+from app import db
+from app.models import Chore, ItemTag, Recipe, ShoppingItem
+from app.tags import rebuild_tag_index
+
+
+def _index_rows(entity_type):
+    return sorted(
+        (r.entity_id, r.tag) for r in ItemTag.query.filter_by(entity_type=entity_type).all()
+    )
+
+
+def test_tag_index_follows_orm_writes(app):
+    item = ShoppingItem(item='Milk', creator='Alice', tags=json.dumps(['Costco', 'Dairy', 'Costco']))
+    db.session.add(item)
+    db.session.commit()
+    assert _index_rows('shopping_item') == [(item.id, 'Costco'), (item.id, 'Dairy')]
+
+    item.tags = json.dumps(['Dairy'])
+    db.session.commit()
+    assert _index_rows('shopping_item') == [(item.id, 'Dairy')]
+
+    db.session.delete(item)
+    db.session.commit()
+    assert _index_rows('shopping_item') == []
+
+
+def test_api_filters_and_tag_cloud(app):
+    db.session.add_all([
+        Recipe(title='Brownies', tags=json.dumps(['Dessert', 'Quick'])),
+        Recipe(title='Salad', tags=json.dumps(['Quick', 'Vegetarian'])),
+        Recipe(title='Stew', tags='not json'),
+    ])
+    db.session.commit()
+    client = app.test_client()
+
+    titles = {r['title'] for r in client.get('/api/recipes?tags=' + json.dumps(['Dessert'])).get_json()}
+    assert titles == {'Brownies'}
+    titles = {r['title'] for r in client.get('/api/recipes?tags=' + json.dumps(['Dessert', 'Vegetarian'])).get_json()}
+    assert titles == {'Brownies', 'Salad'}
+    # Malformed filter means no filter, as before
+    assert len(client.get('/api/recipes?tags=oops').get_json()) == 3
+
+    cloud = client.get('/api/tags?entity=recipes').get_json()
+    assert cloud['tags'][0] == {'tag': 'Quick', 'count': 2}
+    assert {t['tag'] for t in cloud['tags']} == {'Quick', 'Dessert', 'Vegetarian'}
+    assert client.get('/api/tags?entity=nope').status_code == 400
+
+
+def test_bulk_deleted_rows_drop_out_of_counts(app):
+    db.session.add_all([Chore(description='a', tags='["Weekend"]'), Chore(description='b', tags='["Weekend"]')])
+    db.session.commit()
+    Chore.query.filter_by(description='a').delete()
+    db.session.commit()
+    assert app.test_client().get('/api/tags?entity=chores').get_json()['tags'] == [{'tag': 'Weekend', 'count': 1}]
+
+
+def test_rebuild_backfills_from_json_columns(app):
+    db.session.add(Chore(description='Laundry', tags='["Bob"]'))
+    db.session.commit()
+    db.session.execute(text('DELETE FROM item_tag'))
+    db.session.commit()
+    rebuild_tag_index(db.session.connection())
+    assert [r[1] for r in _index_rows('chore')] == ['Bob']
+
+
+def test_tag_filter_uses_index(app):
+    sql = (
+        "EXPLAIN QUERY PLAN SELECT entity_id FROM item_tag "
+        "WHERE entity_type = 'recipe' AND tag IN ('Quick', 'Dessert')"
+    )
+    plan = ' '.join(row[-1] for row in db.session.execute(text(sql)))
+    assert 'ix_item_tag_entity_tag' in plan